@@ -0,0 +1,204 @@
+"""Benchmarks for the Blue Current integration."""
+from __future__ import annotations
+
+import asyncio
+import os
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+
+def create_evse_ids(evse_count: int) -> list[str]:
+    """Return a list of fake evse ids."""
+    return [f"BCU{number:05}" for number in range(evse_count)]
+
+
+def create_status(evse_id: str) -> dict[str, Any]:
+    """Return a CH_STATUS data object like the one bluecurrent_api produces."""
+    now = datetime.now(timezone.utc)
+    return {
+        "evse_id": evse_id,
+        "actual_v1": 230,
+        "actual_v2": 231,
+        "actual_v3": 229,
+        "actual_p1": 16,
+        "actual_p2": 16,
+        "actual_p3": 16,
+        "avg_voltage": 230,
+        "avg_current": 16,
+        "total_kw": 11.04,
+        "actual_kwh": 10,
+        "activity": "available",
+        "vehicle_status": "standby",
+        "start_datetime": now,
+        "stop_datetime": now,
+        "offline_since": now,
+        "total_cost": 1.5,
+        "max_usage": 32,
+        "smartcharging_max_usage": 16,
+        "max_offline": 6,
+        "current_left": 16,
+    }
+
+
+def create_settings(evse_id: str) -> dict[str, Any]:
+    """Return a CH_SETTINGS data object like the one bluecurrent_api produces."""
+    return {
+        "evse_id": evse_id,
+        "plug_and_charge": False,
+        "linked_charge_cards_only": False,
+    }
+
+
+class FakeClient:
+    """Stand-in for bluecurrent_api.Client that answers requests from memory.
+
+    Every request costs `send_delay` seconds to send and is answered after
+    `response_delay` seconds, the receive loop hands the answers to the
+    receiver one at a time like the real websocket does.
+    """
+
+    def __init__(
+        self,
+        evse_ids: list[str],
+        send_delay: float = 0.001,
+        response_delay: float = 0.01,
+    ) -> None:
+        """Initialize the fake client."""
+        self.evse_ids = evse_ids
+        self.send_delay = send_delay
+        self.response_delay = response_delay
+        self.requests = 0
+        self.queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+        self.receive_event = asyncio.Event()
+
+    def __call__(self) -> FakeClient:
+        """Return itself so the class can replace `Client()`."""
+        return self
+
+    async def connect(self, api_token: str) -> None:
+        """Connect to nothing."""
+
+    async def disconnect(self) -> None:
+        """Stop the receive loop."""
+        self.queue.put_nowait(None)
+
+    async def wait_for_response(self) -> None:
+        """Wait for the next message."""
+        self.receive_event.clear()
+        await self.receive_event.wait()
+
+    async def start_loop(self, receiver: Callable) -> None:
+        """Hand the queued messages to the receiver."""
+        while (message := await self.queue.get()) is not None:
+            self.receive_event.set()
+            await receiver(message)
+
+    def push(self, message: dict[str, Any]) -> None:
+        """Queue a message as if it was pushed by the server."""
+        self.queue.put_nowait(message)
+
+    async def _request(self, message: dict[str, Any]) -> None:
+        """Send a request and queue its response."""
+        self.requests += 1
+        await asyncio.sleep(self.send_delay)
+        asyncio.get_running_loop().call_later(
+            self.response_delay, self.queue.put_nowait, message
+        )
+
+    async def get_charge_points(self) -> None:
+        """Request the charge points."""
+        await self._request(
+            {
+                "object": "CHARGE_POINTS",
+                "data": [
+                    {"evse_id": evse_id, "model_type": "hidden", "name": ""}
+                    for evse_id in self.evse_ids
+                ],
+            }
+        )
+
+    async def get_status(self, evse_id: str) -> None:
+        """Request the status of a charge point."""
+        await self._request({"object": "CH_STATUS", "data": create_status(evse_id)})
+
+    async def get_settings(self, evse_id: str) -> None:
+        """Request the settings of a charge point."""
+        await self._request({"object": "CH_SETTINGS", "data": create_settings(evse_id)})
+
+    async def get_grid_status(self, evse_id: str) -> None:
+        """Request the grid status."""
+        await self._request(
+            {
+                "object": "GRID_STATUS",
+                "data": {
+                    "grid_actual_p1": 10,
+                    "grid_actual_p2": 11,
+                    "grid_actual_p3": 12,
+                    "grid_avg_current": 11,
+                    "grid_max_current": 12,
+                },
+            }
+        )
+
+
+class LoopLagProbe:
+    """Measure how late the event loop runs a task that sleeps an interval."""
+
+    def __init__(self, interval: float = 0.01) -> None:
+        """Initialize the probe."""
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(loop.time() - start - self.interval)
+
+    def start(self) -> None:
+        """Start measuring."""
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop measuring."""
+        if self._task is not None:
+            self._task.cancel()
+
+    @property
+    def max_lag(self) -> float:
+        """Return the largest measured lag."""
+        return max(self.lags, default=0.0)
+
+    @property
+    def mean_lag(self) -> float:
+        """Return the mean measured lag."""
+        return sum(self.lags) / len(self.lags) if self.lags else 0.0
+
+
+def resident_memory() -> int | None:
+    """Return the resident memory of the process in bytes, None if unknown."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            pages = int(statm.read().split()[1])
+    except OSError:
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def entities_available(hass: HomeAssistant, config_entry_id: str) -> bool:
+    """Return True when all enabled entities of the config entry are available."""
+    registry = er.async_get(hass)
+    for entry in er.async_entries_for_config_entry(registry, config_entry_id):
+        if entry.disabled:
+            continue
+        state = hass.states.get(entry.entity_id)
+        if state is None or state.state == STATE_UNAVAILABLE:
+            return False
+    return True
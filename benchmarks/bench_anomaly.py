@@ -0,0 +1,83 @@
+"""Benchmark the anomaly detector with the frames of a large fleet."""
+import random
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.blue_current.anomaly import AnomalyDetector
+
+from . import create_evse_ids
+
+EVSE_COUNT = 500
+ROUNDS = 40
+
+
+class SimulatedConnector:
+    """Stand-in for the Connector with the attributes the detector uses."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the connector."""
+        self.hass = hass
+        self.grid_capacity = 100
+        self.dispatches = 0
+
+    def dispatch_value_update_signal(self, evse_id: str, keys: Any = None) -> None:
+        """Count the dispatches."""
+        self.dispatches += 1
+
+    def dispatch_grid_update_signal(self, keys: Any = None) -> None:
+        """Count the dispatches."""
+        self.dispatches += 1
+
+
+async def test_anomaly_detector(hass: HomeAssistant, benchmark_report):
+    """Feed CH_STATUS and GRID_STATUS frames with noise and a few sags."""
+    rng = random.Random(EVSE_COUNT)
+    connector = SimulatedConnector(hass)
+    detector = AnomalyDetector(connector)
+    evse_ids = create_evse_ids(EVSE_COUNT)
+
+    frames = []
+    for round_number in range(ROUNDS):
+        for evse_id in evse_ids:
+            # every 50th charge point has a sag in the last rounds
+            sag = round_number >= ROUNDS - 5 and not int(evse_id[3:]) % 50
+            voltage = 180 if sag else 230
+            frames.append(
+                (
+                    evse_id,
+                    {
+                        f"actual_v{phase}": voltage + rng.uniform(-3, 3)
+                        for phase in (1, 2, 3)
+                    },
+                )
+            )
+    grid_frames = [
+        {
+            "grid_actual_p1": rng.uniform(20, 40),
+            "grid_actual_p2": rng.uniform(20, 40),
+            "grid_actual_p3": rng.uniform(20, 40),
+            "grid_max_current": 40,
+        }
+        for _ in range(ROUNDS)
+    ]
+
+    start = time.perf_counter()
+    for evse_id, data in frames:
+        detector.update_charge_point(evse_id, data)
+    evse_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for data in grid_frames:
+        detector.update_grid(data)
+    grid_duration = time.perf_counter() - start
+
+    benchmark_report(
+        evse_count=EVSE_COUNT,
+        us_per_ch_status=evse_duration / len(frames) * 1e6,
+        ch_status_per_second=len(frames) / evse_duration,
+        us_per_grid_status=grid_duration / len(grid_frames) * 1e6,
+        voltage_sags=len(detector.voltage_sags),
+        dispatches=connector.dispatches,
+    )
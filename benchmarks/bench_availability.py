@@ -0,0 +1,61 @@
+"""Benchmark the event loop lag of marking a fleet unavailable and available."""
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.blue_current import DOMAIN, Connector
+
+from . import FakeClient, LoopLagProbe, create_evse_ids, entities_available
+
+
+@pytest.mark.parametrize("evse_count", [100, 500])
+async def test_availability_flip(
+    hass: HomeAssistant, benchmark_report, evse_count: int
+):
+    """Flip the connection availability and measure the longest loop stall."""
+    evse_ids = create_evse_ids(evse_count)
+    client = FakeClient(evse_ids, send_delay=0, response_delay=0)
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": "BCU_APP"},
+        options={"bootstrap_concurrency": 50},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("custom_components.blue_current.Client", client):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        while not entities_available(hass, config_entry.entry_id):
+            await asyncio.sleep(0.01)
+
+        connector: Connector = hass.data[DOMAIN][config_entry.entry_id]
+        state_writes = connector.metrics.state_writes
+
+        probe = LoopLagProbe(interval=0.001)
+        probe.start()
+        start = time.perf_counter()
+        await connector.async_set_available(False)
+        unavailable_time = time.perf_counter() - start
+        start = time.perf_counter()
+        await connector.async_set_available(True)
+        available_time = time.perf_counter() - start
+        await asyncio.sleep(0.01)
+        probe.stop()
+
+        benchmark_report(
+            evse_count=evse_count,
+            entities=len(connector.entities),
+            state_writes=connector.metrics.state_writes - state_writes,
+            unavailable_time=unavailable_time,
+            available_time=available_time,
+            max_loop_lag=probe.max_lag,
+        )
+
+        await hass.config_entries.async_unload(config_entry.entry_id)
+        await hass.async_block_till_done()
@@ -0,0 +1,86 @@
+"""Benchmark the load balancer on a simulated site with many charge points."""
+import random
+import time
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.blue_current.balancer import PHASES, LoadBalancer
+from custom_components.blue_current.charge_point import ChargePointState
+
+from . import create_evse_ids
+
+STEPS = 200
+# the site is sized for 10 A per charge point on top of the base load
+CURRENT_PER_EVSE = 10
+MAX_BASE_LOAD = 100
+
+
+class SimulatedConnector:
+    """Stand-in for the Connector with the attributes the balancer uses."""
+
+    def __init__(self, hass: HomeAssistant, evse_ids: list[str]) -> None:
+        """Create charging charge points with a limit of 16 or 32 A."""
+        self.hass = hass
+        self.grid_capacity = MAX_BASE_LOAD + CURRENT_PER_EVSE * len(evse_ids)
+        self.grid: dict[str, Any] = {}
+        self.charge_points = {
+            evse_id: ChargePointState.from_dict(
+                {
+                    "activity": "charging",
+                    "max_usage": 16 if index % 2 else 32,
+                    **{f"actual_{phase}": 0 for phase in PHASES},
+                }
+            )
+            for index, evse_id in enumerate(evse_ids)
+        }
+        self.dispatches = 0
+
+    def dispatch_value_update_signal(self, evse_id: str, keys: Any = None) -> None:
+        """Count the dispatches."""
+        self.dispatches += 1
+
+    def measure(self, base_load: float, allocations: dict[str, float]) -> float:
+        """Let the cars follow their allocation and return the grid current."""
+        total = base_load
+        for evse_id, charge_point in self.charge_points.items():
+            current = allocations.get(evse_id, 0)
+            charge_point.update({f"actual_{phase}": current for phase in PHASES})
+            total += current
+        self.grid = {f"grid_actual_{phase}": total for phase in PHASES}
+        return total
+
+
+@pytest.mark.parametrize("evse_count", [100, 1000, 5000])
+async def test_balancer(hass: HomeAssistant, benchmark_report, evse_count: int):
+    """Run the balancer against a fluctuating base load and measure overloads."""
+    rng = random.Random(evse_count)
+    connector = SimulatedConnector(hass, create_evse_ids(evse_count))
+    balancer = LoadBalancer(connector)
+
+    base_load = MAX_BASE_LOAD / 2
+    overloads = 0
+    max_overload = 0.0
+    duration = 0.0
+    for _ in range(STEPS):
+        # the cars follow the published allocations, then the base load changes
+        connector.measure(base_load, balancer.allocations)
+        start = time.perf_counter()
+        balancer.async_run()
+        duration += time.perf_counter() - start
+
+        base_load = min(max(base_load + rng.uniform(-10, 10), 0), MAX_BASE_LOAD)
+        overload = base_load + sum(balancer.allocations.values())
+        overload -= connector.grid_capacity
+        if overload > 0:
+            overloads += 1
+            max_overload = max(max_overload, overload)
+
+    benchmark_report(
+        evse_count=evse_count,
+        ms_per_run=duration / STEPS * 1000,
+        dispatches_per_run=connector.dispatches / STEPS,
+        overloaded_steps=overloads,
+        max_overload_amps=max_overload,
+    )
@@ -0,0 +1,50 @@
+"""Benchmark the time until all entities are available after setup."""
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.blue_current import DOMAIN
+
+from . import FakeClient, create_evse_ids, entities_available
+
+
+@pytest.mark.parametrize("concurrency", [1, 10])
+@pytest.mark.parametrize("evse_count", [1, 50, 500])
+async def test_time_to_entities_available(
+    hass: HomeAssistant, benchmark_report, evse_count: int, concurrency: int
+):
+    """Measure how long it takes until every enabled entity is available."""
+    client = FakeClient(create_evse_ids(evse_count))
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": "BCU_APP"},
+        options={"bootstrap_concurrency": concurrency},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("custom_components.blue_current.Client", client):
+        start = time.perf_counter()
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        setup_done = time.perf_counter()
+
+        while not entities_available(hass, config_entry.entry_id):
+            await asyncio.sleep(0.01)
+        available = time.perf_counter()
+
+        benchmark_report(
+            evse_count=evse_count,
+            concurrency=concurrency,
+            setup=setup_done - start,
+            available=available - start,
+            requests=client.requests,
+        )
+
+        await hass.config_entries.async_unload(config_entry.entry_id)
+        await hass.async_block_till_done()
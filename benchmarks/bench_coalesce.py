@@ -0,0 +1,85 @@
+"""Benchmark the dispatches and event loop lag of a high frequency CH_STATUS stream."""
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.blue_current import DOMAIN, Connector
+
+from . import FakeClient, LoopLagProbe, create_evse_ids, entities_available
+
+EVSE_COUNT = 100
+DURATION = 5
+FRAME_INTERVAL = 0.1
+
+
+@pytest.mark.parametrize("coalesce_window", [0, 250, 1000])
+async def test_charging_stream(
+    hass: HomeAssistant, benchmark_report, coalesce_window: int
+):
+    """Push CH_STATUS frames of charging EVSEs and count the dispatches."""
+    evse_ids = create_evse_ids(EVSE_COUNT)
+    client = FakeClient(evse_ids, send_delay=0, response_delay=0)
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": "BCU_APP"},
+        options={"bootstrap_concurrency": 50, "coalesce_window": coalesce_window},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("custom_components.blue_current.Client", client):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        while not entities_available(hass, config_entry.entry_id):
+            await asyncio.sleep(0.01)
+
+        connector: Connector = hass.data[DOMAIN][config_entry.entry_id]
+        dispatches = 0
+        dispatch_value_update_signal = connector.dispatch_value_update_signal
+
+        def count_dispatches(evse_id, keys=None):
+            nonlocal dispatches
+            keys = list(keys or ())
+            dispatches += len(keys)
+            dispatch_value_update_signal(evse_id, keys)
+
+        connector.dispatch_value_update_signal = count_dispatches
+
+        probe = LoopLagProbe()
+        probe.start()
+        frames = 0
+        start = time.perf_counter()
+        while (elapsed := time.perf_counter() - start) < DURATION:
+            for evse_id in evse_ids:
+                client.push(
+                    {
+                        "object": "CH_STATUS",
+                        "data": {
+                            "evse_id": evse_id,
+                            "activity": "charging",
+                            "actual_kwh": round(elapsed, 2),
+                            "actual_p1": 16 + frames % 3,
+                            "total_kw": 11 + frames % 2,
+                        },
+                    }
+                )
+                frames += 1
+            await asyncio.sleep(FRAME_INTERVAL)
+        await hass.async_block_till_done()
+        probe.stop()
+
+        benchmark_report(
+            coalesce_window=coalesce_window,
+            frames_per_second=frames / DURATION,
+            dispatches_per_second=dispatches / DURATION,
+            mean_loop_lag=probe.mean_lag,
+            max_loop_lag=probe.max_lag,
+        )
+
+        await hass.config_entries.async_unload(config_entry.entry_id)
+        await hass.async_block_till_done()
@@ -0,0 +1,123 @@
+"""Benchmark the cost of dispatching the changed keys of a frame to the entities."""
+import time
+from collections.abc import Callable
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.blue_current import DOMAIN, Connector
+from custom_components.blue_current.binary_sensor import CHARGE_POINT_BINARY_SENSORS
+from custom_components.blue_current.button import CHARGE_POINT_BUTTONS
+from custom_components.blue_current.charge_point import ChargePointState
+from custom_components.blue_current.hub import ChargePointHub
+from custom_components.blue_current.sensor import CHARGE_POINT_SENSORS
+from custom_components.blue_current.switch import CHARGE_POINT_SWITCHES
+
+from . import create_evse_ids
+
+EVSE_COUNT = 200
+ROUNDS = 50
+# the keys that change in a CH_STATUS frame of a charging charge point
+CHANGED_KEYS = (
+    "actual_p1",
+    "actual_p2",
+    "actual_p3",
+    "avg_current",
+    "total_kw",
+    "actual_kwh",
+    "total_cost",
+)
+
+
+class CountingEntity:
+    """Stand-in for an entity that counts its updates instead of writing a state."""
+
+    def __init__(self, entity_id: str, update_keys: tuple[str, ...]) -> None:
+        """Initialize the entity."""
+        self.entity_id = entity_id
+        self.update_keys = update_keys
+        self.updates = 0
+
+    @callback
+    def async_handle_value_update(self) -> None:
+        """Count the update."""
+        self.updates += 1
+
+
+def get_update_keys(hass: HomeAssistant) -> list[tuple[str, ...]]:
+    """Return the update keys of the entities of a charge point."""
+    config_entry = MockConfigEntry(domain=DOMAIN, entry_id="uuid", unique_id="uuid")
+    connector = Connector(hass, config_entry, MagicMock())
+    connector.charge_points["101"] = ChargePointState("hidden", "")
+    return [
+        factory(connector, "101", description).update_keys
+        for table in (
+            CHARGE_POINT_SENSORS,
+            CHARGE_POINT_SWITCHES,
+            CHARGE_POINT_BUTTONS,
+            CHARGE_POINT_BINARY_SENSORS,
+        )
+        for factory, description in table
+    ]
+
+
+def subscribe_dispatcher(
+    hass: HomeAssistant, evse_id: str, entity: CountingEntity
+) -> Callable[[tuple[str, ...]], None]:
+    """Subscribe an entity per key and return the dispatch of a frame.
+
+    This is how every entity subscribed before the hub.
+    """
+    signal = f"{DOMAIN}_value_update_{evse_id}"
+    update = entity.async_handle_value_update
+    async_dispatcher_connect(hass, signal, update)
+    for key in entity.update_keys:
+        async_dispatcher_connect(hass, f"{signal}_{key}", update)
+
+    def dispatch(keys: tuple[str, ...]) -> None:
+        for key in keys:
+            async_dispatcher_send(hass, f"{DOMAIN}_value_update_{evse_id}_{key}")
+
+    return dispatch
+
+
+@pytest.mark.parametrize("hub", [False, True])
+async def test_dispatch(hass: HomeAssistant, benchmark_report, hub: bool):
+    """Dispatch the changed keys of CH_STATUS frames to the entities of a fleet."""
+    update_keys = get_update_keys(hass)
+    dispatches: dict[str, Callable[[tuple[str, ...]], None]] = {}
+    entities: list[CountingEntity] = []
+    for evse_id in create_evse_ids(EVSE_COUNT):
+        evse_entities = [
+            CountingEntity(f"sensor.{evse_id}_{index}", keys)
+            for index, keys in enumerate(update_keys)
+        ]
+        entities.extend(evse_entities)
+        if hub:
+            charge_point_hub = ChargePointHub(hass, evse_id)
+            for entity in evse_entities:
+                charge_point_hub.async_add_entity(entity)
+            dispatches[evse_id] = charge_point_hub.async_update
+        else:
+            for entity in evse_entities:
+                dispatches[evse_id] = subscribe_dispatcher(hass, evse_id, entity)
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for dispatch in dispatches.values():
+            dispatch(CHANGED_KEYS)
+    duration = time.perf_counter() - start
+    frames = ROUNDS * EVSE_COUNT
+
+    benchmark_report(
+        hub=hub,
+        entities_per_evse=len(update_keys),
+        us_per_frame=duration / frames * 1e6,
+        entity_updates_per_frame=sum(entity.updates for entity in entities) / frames,
+    )
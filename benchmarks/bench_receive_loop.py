@@ -0,0 +1,80 @@
+"""Benchmark the real receive loop against the local fake websocket server."""
+import asyncio
+from datetime import timedelta
+import time
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.blue_current import DOMAIN, Connector
+from custom_components.blue_current.const import ConnectionState
+from tests.fake_server import FakeServer, Scenario
+
+from . import LoopLagProbe, create_evse_ids
+
+FRAME_COUNT = 5000
+
+
+@pytest.mark.parametrize(
+    ("evse_count", "message_rate"), [(100, 0), (1000, 0), (100, 1000)]
+)
+async def test_receive_loop(
+    hass: HomeAssistant,
+    socket_enabled,
+    benchmark_report,
+    evse_count: int,
+    message_rate: float,
+):
+    """Push status frames through the websocket and measure the handling."""
+    server = FakeServer(create_evse_ids(evse_count))
+    await server.start()
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": "BCU_APP"},
+        options={"bootstrap_concurrency": 50},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("bluecurrent_api.websocket.URL", server.url), patch(
+        "bluecurrent_api.Client.get_next_reset_delta", return_value=timedelta(hours=1)
+    ):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+        connector: Connector = hass.data[DOMAIN][config_entry.entry_id]
+        while connector.state != ConnectionState.LIVE:
+            await asyncio.sleep(0.01)
+        await hass.async_block_till_done()
+
+        frames = connector.frames_received["CH_STATUS"]
+        state_writes = connector.metrics.state_writes
+        server.scenario = Scenario(message_count=FRAME_COUNT, message_rate=message_rate)
+        probe = LoopLagProbe(interval=0.001)
+        probe.start()
+        start = time.perf_counter()
+        # HELLO starts the stream of the scenario
+        await connector.client.websocket.send_request({"command": "HELLO"})
+        while connector.frames_received["CH_STATUS"] - frames < FRAME_COUNT:
+            await asyncio.sleep(0.001)
+        duration = time.perf_counter() - start
+        await hass.async_block_till_done()
+        probe.stop()
+
+        benchmark_report(
+            evse_count=evse_count,
+            message_rate=message_rate,
+            frames_per_second=FRAME_COUNT / duration,
+            state_writes_per_frame=(connector.metrics.state_writes - state_writes)
+            / FRAME_COUNT,
+            max_loop_lag=probe.max_lag,
+            mean_loop_lag=probe.mean_lag,
+        )
+
+        await hass.config_entries.async_unload(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    await server.stop()
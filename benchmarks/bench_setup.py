@@ -0,0 +1,120 @@
+"""Benchmark the setup time and memory of the entities of a large fleet."""
+import asyncio
+import gc
+import time
+import tracemalloc
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.blue_current import DOMAIN, Connector
+from custom_components.blue_current.charge_point import ChargePointState
+from custom_components.blue_current.entity import async_create_charge_point_entities
+from custom_components.blue_current.sensor import CHARGE_POINT_SENSORS
+
+from . import FakeClient, create_evse_ids, entities_available, resident_memory
+
+EVSE_COUNT = 1000
+
+
+async def test_setup_entities(hass: HomeAssistant, benchmark_report):
+    """Measure a first setup, which registers every entity, and a reload.
+
+    At the reload the entities that are disabled in the registry are not
+    created anymore.
+    """
+    client = FakeClient(create_evse_ids(EVSE_COUNT), send_delay=0, response_delay=0)
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": "BCU_APP"},
+        options={"bootstrap_concurrency": 50},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("custom_components.blue_current.Client", client):
+        for run in ("first_setup", "reload"):
+            gc.collect()
+            memory_before = resident_memory()
+            start = time.perf_counter()
+            await hass.config_entries.async_setup(config_entry.entry_id)
+            while not entities_available(hass, config_entry.entry_id):
+                await asyncio.sleep(0.1)
+            duration = time.perf_counter() - start
+            gc.collect()
+            memory_after = resident_memory()
+
+            connector: Connector = hass.data[DOMAIN][config_entry.entry_id]
+            entries = er.async_entries_for_config_entry(
+                er.async_get(hass), config_entry.entry_id
+            )
+            benchmark_report(
+                run=run,
+                evse_count=EVSE_COUNT,
+                setup_seconds=duration,
+                resident_memory_mb=(
+                    (memory_after - memory_before) / 2**20
+                    if memory_before is not None and memory_after is not None
+                    else None
+                ),
+                registered_entities=len(entries),
+                added_entities=len(connector.entities),
+            )
+
+            await hass.config_entries.async_unload(config_entry.entry_id)
+            await hass.async_block_till_done()
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+async def test_create_sensors(hass: HomeAssistant, benchmark_report, lazy: bool):
+    """Measure creating the sensors of the charge points with a filled registry."""
+    config_entry = MockConfigEntry(domain=DOMAIN, entry_id="uuid", unique_id="uuid")
+    config_entry.add_to_hass(hass)
+    connector = Connector(hass, config_entry, MagicMock())
+    evse_ids = create_evse_ids(EVSE_COUNT)
+    connector.charge_points = {
+        evse_id: ChargePointState("hidden", "") for evse_id in evse_ids
+    }
+
+    registry = er.async_get(hass)
+    for evse_id in evse_ids:
+        for _, description in CHARGE_POINT_SENSORS:
+            registry.async_get_or_create(
+                Platform.SENSOR,
+                DOMAIN,
+                f"{description.key}_{evse_id}",
+                config_entry=config_entry,
+                disabled_by=None
+                if description.entity_registry_enabled_default
+                else er.RegistryEntryDisabler.INTEGRATION,
+            )
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    if lazy:
+        entities = async_create_charge_point_entities(
+            connector, Platform.SENSOR, evse_ids, CHARGE_POINT_SENSORS
+        )
+    else:
+        entities = [
+            factory(connector, evse_id, description)
+            for evse_id in evse_ids
+            for factory, description in CHARGE_POINT_SENSORS
+        ]
+    duration = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    benchmark_report(
+        lazy=lazy,
+        evse_count=EVSE_COUNT,
+        created_entities=len(entities),
+        seconds=duration,
+        memory_mb=memory / 2**20,
+    )
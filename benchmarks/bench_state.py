@@ -0,0 +1,64 @@
+"""Benchmark the memory use and throughput of the charge point state store."""
+import time
+import tracemalloc
+from typing import Any
+
+import pytest
+
+from custom_components.blue_current.charge_point import ChargePointState
+
+from . import create_evse_ids, create_settings, create_status
+
+EVSE_COUNT = 1000
+ROUNDS = 20
+KEYS = ("actual_kwh", "avg_voltage", "activity", "plug_and_charge", "block")
+
+
+def create_dict(evse_id: str) -> dict[str, Any]:
+    """Create a charge point like the Connector did before ChargePointState."""
+    return {"model_type": "hidden", "name": ""}
+
+
+def create_state(evse_id: str) -> ChargePointState:
+    """Create a charge point state."""
+    return ChargePointState("hidden", "")
+
+
+@pytest.mark.parametrize("factory", [create_dict, create_state])
+def test_state_store(benchmark_report, factory):
+    """Measure the memory of 1,000 charge points and the update/read throughput."""
+    evse_ids = create_evse_ids(EVSE_COUNT)
+    frames = [
+        ({**create_status(evse_id), **create_settings(evse_id)}, evse_id)
+        for evse_id in evse_ids
+    ]
+    for data, _ in frames:
+        data.pop("evse_id")
+
+    tracemalloc.start()
+    charge_points = {evse_id: factory(evse_id) for evse_id in evse_ids}
+    for data, evse_id in frames:
+        charge_points[evse_id].update(data)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if factory is create_state:
+        getters = [ChargePointState.getter(key) for key in KEYS]
+        read = lambda charge_point: [getter(charge_point) for getter in getters]
+    else:
+        read = lambda charge_point: [charge_point.get(key) for key in KEYS]
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for data, evse_id in frames:
+            charge_point = charge_points[evse_id]
+            charge_point.update(data)
+            read(charge_point)
+    duration = time.perf_counter() - start
+
+    benchmark_report(
+        representation=factory.__name__,
+        memory_bytes=memory,
+        bytes_per_evse=memory // EVSE_COUNT,
+        frames_per_second=EVSE_COUNT * ROUNDS / duration,
+    )
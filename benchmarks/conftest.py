@@ -0,0 +1,37 @@
+"""Fixtures for the benchmarks."""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+RESULTS: list[tuple[str, dict[str, Any]]] = []
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Automatically enable loading custom integrations in all benchmarks."""
+    yield
+
+
+@pytest.fixture
+def benchmark_report(request: pytest.FixtureRequest):
+    """Return a function that records a result row for the summary."""
+
+    def report(**values: Any) -> None:
+        RESULTS.append((request.node.name, values))
+
+    return report
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config) -> None:
+    """Write the recorded results after the run."""
+    if not RESULTS:
+        return
+    terminalreporter.section("benchmark results")
+    for name, values in RESULTS:
+        row = ", ".join(
+            f"{key}={value:.4f}" if isinstance(value, float) else f"{key}={value}"
+            for key, value in values.items()
+        )
+        terminalreporter.write_line(f"{name}: {row}")
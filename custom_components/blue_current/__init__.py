@@ -1,9 +1,15 @@
 """The Blue Current integration."""
 from __future__ import annotations
 
+import asyncio
+import random
+from collections import Counter
+from collections.abc import Awaitable, Callable, Collection, Iterable
 from contextlib import suppress
-from datetime import datetime
-from typing import Any
+from datetime import datetime, timedelta
+from functools import partial
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Any
 
 from bluecurrent_api import Client
 from bluecurrent_api.exceptions import (
@@ -19,55 +25,167 @@ from homeassistant.const import (
     Platform,
     ATTR_NAME,
 )
-from homeassistant.core import Event, HomeAssistant, ServiceCall
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    callback,
+)
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
-from homeassistant.helpers import entity_registry
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry,
+    entity_registry,
+)
 from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.helpers.event import async_call_later
-
-from .const import ACTIVITY, CARD, DOMAIN, EVSE_ID, LOGGER, MODEL_TYPE
-
-PLATFORMS = [Platform.SENSOR, Platform.SWITCH, Platform.BUTTON]
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.typing import ConfigType
+
+from .anomaly import AnomalyDetector
+from .balancer import LoadBalancer
+from .charge_point import ChargePointState
+from .const import (
+    ACTIVITY,
+    CARD,
+    CHARGING,
+    CONF_BOOTSTRAP_CONCURRENCY,
+    CONF_COALESCE_WINDOW,
+    CONF_GRID_CAPACITY,
+    CONF_READY_TIMEOUT,
+    DEFAULT_BOOTSTRAP_CONCURRENCY,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_GRID_CAPACITY,
+    DEFAULT_READY_TIMEOUT,
+    DOMAIN,
+    EVSE_ID,
+    GRID_PREFIX,
+    LOGGER,
+    MODEL_TYPE,
+    REBOOT,
+    RESET,
+    START_SESSION,
+    STOP_SESSION,
+    ConnectionState,
+)
+from .hub import ChargePointHub
+from .metrics import ConnectorMetrics
+from .pending import ERROR, SUCCESS, PendingRequests
+from .rolling import RollingStatistics
+from .sessions import LAST_SESSION, SessionTracker
+from .snapshot import Snapshot, create_snapshot_data
+from .supervisor import Supervisor, async_get_supervisor
+
+if TYPE_CHECKING:
+    from .entity import ChangeTrackingEntity
+
+PLATFORMS = [
+    Platform.SENSOR,
+    Platform.SWITCH,
+    Platform.BUTTON,
+    Platform.BINARY_SENSOR,
+]
 CHARGE_POINTS = "CHARGE_POINTS"
 DATA = "data"
 SMALL_DELAY = 1
-LARGE_DELAY = 20
-
-GRID = "GRID"
+MAX_DELAY = 300
+RATE_LIMIT_JITTER = 300
+METRICS_INTERVAL = timedelta(seconds=10)
+DISCOVERY_INTERVAL = timedelta(hours=1)
+SNAPSHOT_INTERVAL = timedelta(minutes=5)
+STATISTICS_INTERVAL = timedelta(seconds=10)
+# number of entities that are written before yielding to the event loop
+AVAILABILITY_CHUNK_SIZE = 100
+# after a shorter outage only the settings of the charge points that are likely to have
+# changed are refreshed, the status of every charge point is always refreshed
+STALE_AFTER = 30
+# after a longer outage the charge points are enumerated again because the set may have changed
+FULL_RESYNC_AFTER = 900
+
+GRID_TYPES = ("GRID_STATUS", "GRID_CURRENT")
 OBJECT = "object"
-VALUE_TYPES = ("CH_STATUS", "CH_SETTINGS")
+CH_STATUS = "CH_STATUS"
+VALUE_TYPES = (CH_STATUS, "CH_SETTINGS")
+# changes of these keys are dispatched immediately so device triggers are not delayed
+IMMEDIATE_KEYS = (ACTIVITY, "vehicle_status")
 SETTINGS = ("LINKED_CHARGE_CARDS_ONLY", "PLUG_AND_CHARGE")
 RESULT = "result"
 UNAVAILABLE = "unavailable"
 BLOCK = "block"
 SERVICES = ("SOFT_RESET", "REBOOT", "START_SESSION", "STOP_SESSION")
-SUCCESS = "success"
-RESET = "reset"
-REBOOT = "reboot"
-START_SESSION = "start_session"
-STOP_SESSION = "stop_session"
+SERVICE_OBJECTS = dict(zip((RESET, REBOOT, START_SESSION, STOP_SESSION), SERVICES))
+# seconds to wait for the result of a service
+SERVICE_TIMEOUT = 30
+# seconds to wait for the result of a setting change
+SETTING_TIMEOUT = 10
+
+MessageHandler = Callable[[dict[str, Any]], Awaitable[bool]]
+
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Blue Current services for all config entries."""
+    async_get_supervisor(hass).async_register_services()
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up Blue Current as a config entry."""
-    hass.data.setdefault(DOMAIN, {})
+    supervisor = async_get_supervisor(hass)
     client = Client()
     api_token = config_entry.data[CONF_API_TOKEN]
     connector = Connector(hass, config_entry, client)
-    try:
-        await connector.connect(api_token)
-    except InvalidApiToken as err:
-        raise ConfigEntryAuthFailed("Invalid API token.") from err
-    except BlueCurrentException as err:
-        raise ConfigEntryNotReady from err
-
-    hass.loop.create_task(connector.start_loop())
-    await client.get_charge_points()
-
-    await client.wait_for_response()
-    hass.data[DOMAIN][config_entry.entry_id] = connector
+    await connector.sessions.async_load()
+    await async_migrate_grid_unique_ids(hass, config_entry)
+
+    # with a snapshot the platforms are set up before the websocket is connected
+    restored = await connector.async_restore_snapshot()
+    if not restored:
+        try:
+            await connector.connect(api_token)
+        except InvalidApiToken as err:
+            raise ConfigEntryAuthFailed("Invalid API token.") from err
+        except BlueCurrentException as err:
+            raise ConfigEntryNotReady from err
+
+        supervisor.async_start_loop(connector)
+
+    config_entry.async_on_unload(
+        async_track_time_interval(hass, connector.publish_metrics, METRICS_INTERVAL)
+    )
+    config_entry.async_on_unload(
+        async_track_time_interval(
+            hass, connector.discover_charge_points, DISCOVERY_INTERVAL
+        )
+    )
+    config_entry.async_on_unload(
+        async_track_time_interval(hass, connector.save_snapshot, SNAPSHOT_INTERVAL)
+    )
+    config_entry.async_on_unload(
+        async_track_time_interval(
+            hass, connector.publish_statistics, STATISTICS_INTERVAL
+        )
+    )
+
+    # the entities of the charge points are added when CHARGE_POINTS is received
+    supervisor.async_add_connector(connector)
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
+    if restored:
+        connector.async_set_ready()
+        start = hass.async_create_background_task(
+            connector.start(api_token), f"{DOMAIN} start {config_entry.entry_id}"
+        )
+        config_entry.async_on_unload(start.cancel)
+    else:
+        try:
+            await client.get_charge_points()
+        except BlueCurrentException as err:
+            LOGGER.debug("Requesting the charge points failed: %s", err)
+        await connector.async_wait_ready()
+
     async def _async_disconnect_websocket(_: Event) -> None:
         await connector.disconnect()
 
@@ -77,45 +195,65 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
         )
     )
 
-    async def handle_reset(call: ServiceCall) -> None:
-        evse_id = call.data.get(EVSE_ID)
-        await client.reset(evse_id)
-
-    async def handle_reboot(call: ServiceCall) -> None:
-        evse_id = call.data.get(EVSE_ID)
-        await client.reboot(evse_id)
-
-    async def handle_start_session(call: ServiceCall) -> None:
-        evse_id = call.data.get(EVSE_ID)
-        await client.start_session(evse_id, config_entry.data[CARD])
-
-    async def handle_stop_session(call: ServiceCall) -> None:
-        evse_id = call.data.get(EVSE_ID)
-        await client.stop_session(evse_id)
-
-    hass.services.async_register(DOMAIN, "reset", handle_reset)
-    hass.services.async_register(DOMAIN, "reboot", handle_reboot)
-    hass.services.async_register(DOMAIN, "start_session", handle_start_session)
-    hass.services.async_register(DOMAIN, "stop_session", handle_stop_session)
-
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Unload the Blue Current config entry."""
-    connector: Connector = hass.data[DOMAIN].pop(config_entry.entry_id)
+    connector = async_get_supervisor(hass).async_remove_connector(config_entry.entry_id)
     hass.async_create_task(connector.disconnect())
+    await connector.snapshot.async_save(connector.snapshot_data())
 
     return await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
 
 
-def set_entities_unavalible(hass: HomeAssistant, config_id: str) -> None:
-    """Set all Blue Current entities to unavailable."""
-    registry = entity_registry.async_get(hass)
-    entries = entity_registry.async_entries_for_config_entry(registry, config_id)
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the stored snapshot and sessions of a removed config entry."""
+    await Snapshot(hass, get_snapshot_key(config_entry.entry_id)).store.async_remove()
+    await SessionTracker(hass, config_entry.entry_id).store.async_remove()
+
+
+def get_snapshot_key(entry_id: str) -> str:
+    """Return the storage key of the snapshot of a config entry."""
+    return f"{DOMAIN}.{entry_id}.snapshot"
+
+
+async def async_migrate_grid_unique_ids(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> None:
+    """Add the entry id to the unique ids of the grid sensors.
+
+    The grid sensors used their key as unique id, which collided when there
+    was more than one account.
+    """
+    suffix = f"_{config_entry.entry_id}"
+
+    @callback
+    def migrate(entry: entity_registry.RegistryEntry) -> dict[str, Any] | None:
+        if entry.unique_id.startswith(GRID_PREFIX) and not entry.unique_id.endswith(
+            suffix
+        ):
+            return {"new_unique_id": f"{entry.unique_id}{suffix}"}
+        return None
+
+    await entity_registry.async_migrate_entries(hass, config_entry.entry_id, migrate)
 
-    for entry in entries:
-        entry.write_unavailable_state(hass)
+
+def get_backoff_delay(attempt: int) -> float:
+    """Return the delay before a reconnect attempt.
+
+    The delay doubles with every attempt up to MAX_DELAY, half of it is random
+    so instances that lost their connection at the same time spread out.
+    """
+    delay = min(MAX_DELAY, SMALL_DELAY * 2**attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def get_changed_keys(
+    current: ChargePointState | dict[str, Any], new_data: dict[str, Any]
+) -> list[str]:
+    """Return the keys of new_data with a value that differs from current."""
+    return [key for key, value in new_data.items() if current.get(key) != value]
 
 
 class Connector:
@@ -128,72 +266,475 @@ class Connector:
         self.config: ConfigEntry = config
         self.hass: HomeAssistant = hass
         self.client: Client = client
-        self.charge_points: dict[str, dict] = {}
+        self.charge_points: dict[str, ChargePointState] = {}
+        self.device_infos: dict[str, DeviceInfo] = {}
+        self.hubs: dict[str, ChargePointHub] = {}
         self.grid: dict[str, Any] = {}
+        self.grid_request_pending = False
+        self.bootstrap_pending: dict[str, set[str]] = {}
+        self.pending_keys: dict[str, set[str]] = {}
+        self.pending_flushes: dict[str, CALLBACK_TYPE] = {}
+        self.handlers: dict[str, MessageHandler] = {}
+        self.frames_handled: Counter[str] = Counter()
+        self.frames_dropped: Counter[str] = Counter()
+        self.frames_unknown: Counter[str] = Counter()
+        self.metrics = ConnectorMetrics()
+        self.state = ConnectionState.CONNECTING
+        self.reconnect_attempts = 0
+        self.cancel_reconnect: CALLBACK_TYPE | None = None
+        self.disconnected_at: float | None = None
+        self.pending_requests = PendingRequests(SERVICE_TIMEOUT)
+        self.available = True
+        self.entities: set[ChangeTrackingEntity] = set()
+        self.sessions = SessionTracker(hass, config.entry_id)
+        self.statistics = RollingStatistics()
+        self.snapshot = Snapshot(hass, get_snapshot_key(config.entry_id))
+        # charge points whose data comes from the snapshot
+        self.stale: set[str] = set()
+        self.setup_started = monotonic()
+        self.ready = asyncio.Event()
+        self.balancer = LoadBalancer(self)
+        self.anomalies = AnomalyDetector(self)
+
+        self.register_handler(CHARGE_POINTS, self.handle_charge_points)
+        for object_name in VALUE_TYPES:
+            self.register_handler(object_name, self.handle_value_data)
+        for object_name in GRID_TYPES:
+            self.register_handler(object_name, self.handle_grid)
+        for object_name in SETTINGS:
+            self.register_handler(object_name, self.handle_setting_result)
+        for object_name in SERVICES:
+            self.register_handler(object_name, self.handle_service_result)
+
+    @property
+    def supervisor(self) -> Supervisor:
+        """Return the supervisor of the connectors of all accounts."""
+        return async_get_supervisor(self.hass)
+
+    @property
+    def bootstrap_concurrency(self) -> int:
+        """Return the max number of charge points that are requested in parallel."""
+        return int(
+            self.config.options.get(
+                CONF_BOOTSTRAP_CONCURRENCY, DEFAULT_BOOTSTRAP_CONCURRENCY
+            )
+        )
+
+    @property
+    def coalesce_window(self) -> float:
+        """Return the time in seconds in which CH_STATUS updates are merged."""
+        return (
+            int(self.config.options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW))
+            / 1000
+        )
+
+    @property
+    def grid_signal(self) -> str:
+        """Return the signal of the grid of the account."""
+        return f"{DOMAIN}_grid_update_{self.config.entry_id}"
+
+    @property
+    def grid_capacity(self) -> int:
+        """Return the max current in A per phase of the grid connection, 0 if not set."""
+        return int(self.config.options.get(CONF_GRID_CAPACITY, DEFAULT_GRID_CAPACITY))
+
+    @property
+    def ready_timeout(self) -> int:
+        """Return the max number of seconds the setup waits for the charge points."""
+        return int(self.config.options.get(CONF_READY_TIMEOUT, DEFAULT_READY_TIMEOUT))
+
+    @callback
+    def async_set_ready(self) -> None:
+        """Mark the charge points as known and record how long the setup took."""
+        if self.ready.is_set():
+            return
+        self.metrics.setup_duration = round(monotonic() - self.setup_started, 3)
+        LOGGER.debug("Setup took %s seconds", self.metrics.setup_duration)
+        self.ready.set()
+
+    async def async_wait_ready(self) -> None:
+        """Wait until the charge points are known or the ready timeout passed.
+
+        The setup continues after the timeout, the entities are added when
+        the charge points are received. A timeout of 0 doesn't wait.
+        """
+        if not self.ready_timeout:
+            return
+        try:
+            async with asyncio.timeout(self.ready_timeout):
+                await self.ready.wait()
+        except TimeoutError:
+            LOGGER.warning(
+                "The charge points were not received within %s seconds, "
+                "their entities are added when they are received",
+                self.ready_timeout,
+            )
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the charge points and the grid from the snapshot.
+
+        The restored charge points are stale until their data is received.
+        Return False if there is no snapshot.
+        """
+        if (snapshot := await self.snapshot.async_load()) is None:
+            return False
+        self.charge_points, self.grid = snapshot
+        self.stale = set(self.charge_points)
+        LOGGER.debug("Restored %s charge points from the snapshot", len(self.stale))
+        return bool(self.charge_points)
+
+    @callback
+    def snapshot_data(self) -> dict[str, Any]:
+        """Return the data of the snapshot."""
+        return create_snapshot_data(self.charge_points, self.grid)
+
+    @callback
+    def save_snapshot(self, _event_time: datetime | None = None) -> None:
+        """Write the snapshot when all charge points received their data."""
+        if self.state == ConnectionState.LIVE and self.charge_points:
+            self.snapshot.async_schedule_save(self.snapshot_data)
+
+    async def start(self, token: str) -> None:
+        """Connect and get the charge points of a connector set up from the snapshot.
+
+        A failed connection or request is retried in the background.
+        """
+        try:
+            await self.connect(token)
+            self.supervisor.async_start_loop(self)
+            await self.client.get_charge_points()
+        except InvalidApiToken:
+            LOGGER.error("The Blue Current API token is invalid")
+            self.config.async_start_reauth(self.hass)
+        except RequestLimitReached:
+            self.schedule_rate_limited_reconnect()
+            await self.async_set_available(False)
+        except BlueCurrentException as err:
+            LOGGER.warning("Connecting to the Blue Current websocket failed: %s", err)
+            self.schedule_reconnect()
+            await self.async_set_available(False)
 
     async def connect(self, token: str) -> None:
         """Register on_data and connect to the websocket."""
+        self.set_state(ConnectionState.CONNECTING)
         await self.client.connect(token)
+        self.set_state(ConnectionState.SYNCING)
+
+    @callback
+    def set_state(self, state: ConnectionState) -> None:
+        """Set the connection state and update the diagnostic sensors."""
+        if state == self.state:
+            return
+        LOGGER.debug("Connection state changed from %s to %s", self.state, state)
+        self.state = state
+        async_dispatcher_send(
+            self.hass, f"{DOMAIN}_metrics_update_{self.config.entry_id}"
+        )
+
+    def register_handler(self, object_name: str, handler: MessageHandler) -> None:
+        """Register a handler for the messages of an object type.
+
+        The handler returns False if the message was dropped.
+        """
+        self.handlers[object_name] = handler
+
+    @property
+    def frames_received(self) -> Counter[str]:
+        """Return the number of received frames per object name."""
+        return self.frames_handled + self.frames_dropped + self.frames_unknown
 
     async def on_data(self, message: dict) -> None:
         """Handle received data."""
+        start = perf_counter()
+        object_name: str = message[OBJECT]
 
-        async def handle_charge_points(data: list) -> None:
-            """Loop over the charge points and get their data."""
-            for entry in data:
-                evse_id = entry[EVSE_ID]
-                model = entry[MODEL_TYPE]
-                name = entry[ATTR_NAME]
+        handler = self.handlers.get(object_name)
+        if handler is None:
+            self.frames_unknown[object_name] += 1
+            LOGGER.debug("Received unknown object %s", object_name)
+        elif await handler(message):
+            self.frames_handled[object_name] += 1
+        else:
+            self.frames_dropped[object_name] += 1
+
+        self.metrics.record_frame(start, perf_counter())
+
+    async def handle_charge_points(self, message: dict) -> bool:
+        """Add and remove charge points and get their data in the background.
+
+        While the connection is live only the data of new charge points is
+        requested, otherwise the data of all charge points is requested.
+        """
+        evse_ids = []
+        added = []
+        for entry in message[DATA]:
+            evse_id = entry[EVSE_ID]
+            model = entry[MODEL_TYPE]
+            name = entry[ATTR_NAME]
+            if (charge_point := self.charge_points.get(evse_id)) is not None:
+                device = {MODEL_TYPE: model, ATTR_NAME: name}
+                if get_changed_keys(charge_point, device):
+                    self.device_infos.pop(evse_id, None)
+                charge_point.update(device)
+            else:
                 self.add_charge_point(evse_id, model, name)
-                await self.get_charge_point_data(evse_id)
-            await self.client.get_grid_status(data[0][EVSE_ID])
+                added.append(evse_id)
+            evse_ids.append(evse_id)
+
+        removed = set(self.charge_points).difference(evse_ids)
+        for evse_id in removed:
+            self.remove_charge_point(evse_id)
+
+        if added:
+            LOGGER.debug("Found new charge points %s", added)
+            async_dispatcher_send(
+                self.hass, f"{DOMAIN}_evse_added_{self.config.entry_id}", added
+            )
+
+        if self.state == ConnectionState.LIVE:
+            evse_ids = added
+
+        self.async_set_ready()
+
+        if evse_ids:
+            self.hass.async_create_task(self.bootstrap_charge_points(evse_ids))
+        else:
+            self.set_state(ConnectionState.LIVE)
+        return True
 
+    async def handle_value_data(self, message: dict) -> bool:
+        """Update a charge point with the received key / values."""
         object_name: str = message[OBJECT]
+        value_data: dict = message[DATA]
+        evse_id = value_data.pop(EVSE_ID)
+        if evse_id not in self.charge_points:
+            return False
+
+        self.update_charge_point(evse_id, value_data, coalesce=object_name == CH_STATUS)
+        self.handle_bootstrap_response(evse_id, object_name)
+        return True
+
+    async def handle_grid(self, message: dict) -> bool:
+        """Update the grid of the account with the received key / values.
+
+        GRID_CURRENT only has the phase currents, so the values are merged
+        into the grid instead of replacing it.
+        """
+        data: dict = message[DATA]
+        self.grid_request_pending = False
+        changed_keys = get_changed_keys(self.grid, data)
+        self.grid.update(data)
+        self.dispatch_grid_update_signal(changed_keys)
+        self.anomalies.update_grid(data)
+        self.balancer.async_schedule()
+        return True
+
+    async def handle_setting_result(self, message: dict) -> bool:
+        """Update a charge point with the result of a setting change."""
+        evse_id = message.pop(EVSE_ID)
+        if evse_id not in self.charge_points:
+            return False
+
+        key = message[OBJECT].lower()
+        self.update_charge_point(evse_id, {key: message[RESULT]})
+        self.pending_requests.resolve(
+            (message[OBJECT], evse_id),
+            {SUCCESS: True, ERROR: None, RESULT: message[RESULT]},
+        )
+        return True
+
+    async def handle_service_result(self, message: dict) -> bool:
+        """Log the result of a service and pass it to the caller that waits for it."""
+        state = "successful"
+        success: bool = message[SUCCESS]
+        if not success:
+            state = "un" + state
+        LOGGER.debug("%s was %s ", message[OBJECT], state)
+
+        self.pending_requests.resolve(
+            (message[OBJECT], message.get(EVSE_ID)),
+            {SUCCESS: success, ERROR: message.get(ERROR)},
+        )
+        return True
+
+    async def send_service_request(self, service: str, evse_id: str) -> None:
+        """Send the request of a service for a charge point."""
+        if service == START_SESSION:
+            await self.client.start_session(evse_id, self.config.data[CARD])
+            return
+
+        requests = {
+            RESET: self.client.reset,
+            REBOOT: self.client.reboot,
+            STOP_SESSION: self.client.stop_session,
+        }
+        await requests[service](evse_id)
+
+    async def async_call_service(self, service: str, evse_id: str) -> dict[str, Any]:
+        """Send the request of a service and wait for its result.
+
+        Callers that request the same service for the same charge point at the
+        same time share the request.
+        """
+        if self.state == ConnectionState.RATE_LIMITED:
+            return {SUCCESS: False, ERROR: "request limit reached"}
+        if self.state in (ConnectionState.CONNECTING, ConnectionState.BACKOFF):
+            return {SUCCESS: False, ERROR: "not connected"}
+
+        async def send() -> None:
+            async with self.supervisor.request_semaphore:
+                await self.send_service_request(service, evse_id)
+
+        return await self.pending_requests.async_request(
+            (SERVICE_OBJECTS[service], evse_id), send
+        )
+
+    async def async_change_setting(
+        self, setting: str, evse_id: str, value: bool, send: Callable[[], Awaitable]
+    ) -> dict[str, Any]:
+        """Send a setting change and wait until the new value is acknowledged.
+
+        A pending change of the same setting is replaced.
+        """
+        result = await self.pending_requests.async_request(
+            (setting.upper(), evse_id), send, SETTING_TIMEOUT, replace=True
+        )
+        if result[SUCCESS] and result[RESULT] != value:
+            return {SUCCESS: False, ERROR: f"{setting} was not changed"}
+        return result
+
+    async def bootstrap_charge_points(
+        self, evse_ids: list[str], status_only: Collection[str] = ()
+    ) -> None:
+        """Get the data of all charge points with a bounded number of parallel requests.
+
+        Only the status is requested of the charge points in status_only.
+        """
+        semaphore = asyncio.Semaphore(self.bootstrap_concurrency)
+
+        async def bootstrap_charge_point(evse_id: str) -> None:
+            async with semaphore, self.supervisor.request_semaphore:
+                if evse_id in status_only:
+                    await self.client.get_status(evse_id)
+                else:
+                    await self.get_charge_point_data(evse_id)
+
+        for evse_id in evse_ids:
+            self.bootstrap_pending[evse_id] = (
+                {CH_STATUS} if evse_id in status_only else set(VALUE_TYPES)
+            )
 
-        # gets charge point ids
-        if object_name == CHARGE_POINTS:
-            charge_points_data: list = message[DATA]
-            await handle_charge_points(charge_points_data)
-
-        # gets charge point key / values
-        elif object_name in VALUE_TYPES:
-            value_data: dict = message[DATA]
-            evse_id = value_data.pop(EVSE_ID)
-            self.update_charge_point(evse_id, value_data)
-
-        # gets grid key / values
-        elif GRID in object_name:
-            data: dict = message[DATA]
-            self.grid = data
-            self.dispatch_grid_update_signal()
-
-        # setting change responses
-        elif object_name in SETTINGS:
-            evse_id = message.pop(EVSE_ID)
-            key = object_name.lower()
-            result = message[RESULT]
-            new_data = {key: result}
-            self.update_charge_point(evse_id, new_data)
-
-        # service responses
-        elif object_name in SERVICES:
-            state = "successful"
-            success: bool = message[SUCCESS]
-            if not success:
-                state = "un" + state
-            LOGGER.debug("%s was %s ", object_name, state)
+        try:
+            await asyncio.gather(
+                *(bootstrap_charge_point(evse_id) for evse_id in evse_ids)
+            )
+            await self.request_grid_status()
+        except BlueCurrentException as err:
+            LOGGER.debug("Getting the charge point data failed: %s", err)
+
+    async def request_grid_status(self) -> None:
+        """Request the grid status, unless a request is already pending.
+
+        The API reports one grid per account for any of its charge points, so
+        one request is enough however many charge points are bootstrapped.
+        """
+        if self.grid_request_pending or not self.charge_points:
+            return
+        self.grid_request_pending = True
+        try:
+            await self.client.get_grid_status(next(iter(self.charge_points)))
+        except BlueCurrentException:
+            self.grid_request_pending = False
+            raise
+
+    def handle_bootstrap_response(self, evse_id: str, object_name: str) -> None:
+        """Report when all requested data of a charge point is received."""
+        pending = self.bootstrap_pending.get(evse_id)
+        if pending is None:
+            return
+
+        pending.discard(object_name)
+        if not pending:
+            del self.bootstrap_pending[evse_id]
+            if evse_id in self.stale:
+                self.stale.discard(evse_id)
+                self.dispatch_value_update_signal(evse_id)
+            LOGGER.debug(
+                "Received all data of charge point %s, %s remaining",
+                evse_id,
+                len(self.bootstrap_pending),
+            )
+            if not self.bootstrap_pending:
+                self.set_state(ConnectionState.LIVE)
 
     async def get_charge_point_data(self, evse_id: str) -> None:
         """Get all the data of a charge point."""
         await self.client.get_status(evse_id)
         await self.client.get_settings(evse_id)
 
+    def get_device_info(self, evse_id: str) -> DeviceInfo:
+        """Return the device info of a charge point, shared by its entities."""
+        if (device_info := self.device_infos.get(evse_id)) is None:
+            charge_point = self.charge_points[evse_id]
+            device_info = self.device_infos[evse_id] = DeviceInfo(
+                identifiers={(DOMAIN, evse_id)},
+                name=charge_point.name or evse_id,
+                manufacturer="Blue Current",
+                model=charge_point.model_type,
+            )
+        return device_info
+
+    def get_hub(self, evse_id: str) -> ChargePointHub:
+        """Return the hub that updates the entities of a charge point."""
+        if (hub := self.hubs.get(evse_id)) is None:
+            hub = self.hubs[evse_id] = ChargePointHub(self.hass, evse_id)
+        return hub
+
     def add_charge_point(self, evse_id: str, model: str, name: str) -> None:
         """Add a charge point to charge_points."""
-        self.charge_points[evse_id] = {MODEL_TYPE: model, ATTR_NAME: name}
+        self.charge_points[evse_id] = ChargePointState(model, name)
+
+    def remove_charge_point(self, evse_id: str) -> None:
+        """Remove a charge point, its entities and its device."""
+        LOGGER.debug("Charge point %s was removed", evse_id)
+        del self.charge_points[evse_id]
+        self.device_infos.pop(evse_id, None)
+        self.bootstrap_pending.pop(evse_id, None)
+        self.pending_keys.pop(evse_id, None)
+        self.sessions.remove(evse_id)
+        self.statistics.remove(evse_id)
+        self.anomalies.remove(evse_id)
+        self.stale.discard(evse_id)
+        if (cancel := self.pending_flushes.pop(evse_id, None)) is not None:
+            cancel()
+
+        if (hub := self.hubs.pop(evse_id, None)) is not None:
+            hub.async_remove_charge_point()
+
+        registry = device_registry.async_get(self.hass)
+        device = registry.async_get_device(identifiers={(DOMAIN, evse_id)})
+        if device is not None:
+            registry.async_update_device(
+                device.id, remove_config_entry_id=self.config.entry_id
+            )
+
+    async def discover_charge_points(self, _event_time: datetime | None = None) -> None:
+        """Enumerate the charge points to find new and removed charge points."""
+        if self.state != ConnectionState.LIVE:
+            return
+        try:
+            await self.client.get_charge_points()
+        except BlueCurrentException as err:
+            LOGGER.debug("Discovering charge points failed: %s", err)
 
-    def update_charge_point(self, evse_id: str, data: dict) -> None:
-        """Update the charge point data."""
+    def update_charge_point(
+        self, evse_id: str, data: dict, coalesce: bool = False
+    ) -> None:
+        """Update the charge point data.
+
+        If coalesce is True and a coalesce window is set, the changed keys are
+        dispatched together at the end of the window.
+        """
 
         def handle_activity(data: dict) -> None:
             activity = data.get(ACTIVITY)
@@ -205,16 +746,83 @@ class Connector:
         if ACTIVITY in data:
             handle_activity(data)
 
-        self.charge_points[evse_id].update(data)
-        self.dispatch_value_update_signal(evse_id)
+        charge_point = self.charge_points[evse_id]
+        changed_keys = get_changed_keys(charge_point, data)
+        charge_point.update(data)
+        self.statistics.update(evse_id, data)
+        self.anomalies.update_charge_point(evse_id, data)
+        if self.sessions.update(evse_id, charge_point, changed_keys) is not None:
+            changed_keys.append(LAST_SESSION)
+        if ACTIVITY in changed_keys:
+            self.balancer.async_schedule()
+
+        window = self.coalesce_window
+        if not coalesce or not window or not changed_keys:
+            self.dispatch_value_update_signal(evse_id, changed_keys)
+            return
+
+        pending_keys = self.pending_keys.setdefault(evse_id, set())
+        pending_keys.update(changed_keys)
+
+        if any(key in IMMEDIATE_KEYS for key in changed_keys):
+            self.flush_charge_point(evse_id)
+        elif evse_id not in self.pending_flushes:
+            self.pending_flushes[evse_id] = async_call_later(
+                self.hass, window, partial(self.flush_charge_point, evse_id)
+            )
 
-    def dispatch_value_update_signal(self, evse_id: str) -> None:
-        """Dispatch a value signal."""
-        async_dispatcher_send(self.hass, f"{DOMAIN}_value_update_{evse_id}")
+    @callback
+    def flush_charge_point(
+        self, evse_id: str, _event_time: datetime | None = None
+    ) -> None:
+        """Dispatch the keys that changed during the coalesce window."""
+        if (cancel := self.pending_flushes.pop(evse_id, None)) is not None:
+            cancel()
+        if keys := self.pending_keys.pop(evse_id, None):
+            self.dispatch_value_update_signal(evse_id, keys)
+
+    def dispatch_value_update_signal(
+        self, evse_id: str, keys: Iterable[str] | None = None
+    ) -> None:
+        """Update the entities of the given keys, or all entities if None.
+
+        The entities are updated by the hub of the charge point, which counts
+        as one dispatch per key.
+        """
+        if keys is None:
+            self.metrics.dispatches += 1
+        else:
+            keys = tuple(keys)
+            if not keys:
+                return
+            self.metrics.dispatches += len(keys)
+        self.get_hub(evse_id).async_update(keys)
+
+    def dispatch_grid_update_signal(self, keys: Iterable[str] | None = None) -> None:
+        """Dispatch a grid signal for the given keys, or for all keys if None."""
+        if keys is None:
+            self.metrics.dispatches += 1
+            async_dispatcher_send(self.hass, self.grid_signal)
+            return
+
+        for key in keys:
+            self.metrics.dispatches += 1
+            async_dispatcher_send(self.hass, f"{self.grid_signal}_{key}")
+
+    @callback
+    def publish_metrics(self, _event_time: datetime | None = None) -> None:
+        """Update the rates and dispatch a metrics signal."""
+        self.metrics.update_rates()
+        async_dispatcher_send(
+            self.hass, f"{DOMAIN}_metrics_update_{self.config.entry_id}"
+        )
 
-    def dispatch_grid_update_signal(self) -> None:
-        """Dispatch a grid signal."""
-        async_dispatcher_send(self.hass, f"{DOMAIN}_grid_update")
+    @callback
+    def publish_statistics(self, _event_time: datetime | None = None) -> None:
+        """Dispatch a signal to update the rolling statistics sensors."""
+        async_dispatcher_send(
+            self.hass, f"{DOMAIN}_statistics_update_{self.config.entry_id}"
+        )
 
     async def start_loop(self) -> None:
         """Start the receive loop."""
@@ -225,26 +833,132 @@ class Connector:
                 "Disconnected from the Blue Current websocket. Retrying to connect in background. %s",
                 err,
             )
+            if self.disconnected_at is None:
+                self.disconnected_at = monotonic()
+            # the answer to a pending grid request is lost with the connection
+            self.grid_request_pending = False
 
-            async_call_later(self.hass, SMALL_DELAY, self.reconnect)
+            if isinstance(err, RequestLimitReached):
+                self.schedule_rate_limited_reconnect()
+            else:
+                self.schedule_reconnect()
+
+    @callback
+    def schedule_reconnect(self) -> None:
+        """Schedule a reconnect with exponential backoff."""
+        self.set_state(ConnectionState.BACKOFF)
+        delay = get_backoff_delay(self.reconnect_attempts)
+        self.reconnect_attempts += 1
+        self._schedule_reconnect(delay)
+
+    @callback
+    def schedule_rate_limited_reconnect(self) -> None:
+        """Schedule a reconnect after the request limit is reset."""
+        self.set_state(ConnectionState.RATE_LIMITED)
+        delay = self.client.get_next_reset_delta().total_seconds()
+        self._schedule_reconnect(delay + random.uniform(0, RATE_LIMIT_JITTER))
+
+    @callback
+    def _schedule_reconnect(self, delay: float) -> None:
+        if self.cancel_reconnect is not None:
+            self.cancel_reconnect()
+        LOGGER.debug("Reconnecting in %.1f seconds", delay)
+        self.cancel_reconnect = self.supervisor.schedule_reconnect(
+            self.config.entry_id, self.reconnect, delay
+        )
 
     async def reconnect(self, _event_time: datetime | None = None) -> None:
         """Keep trying to reconnect to the websocket."""
+        self.cancel_reconnect = None
         try:
             await self.connect(self.config.data[CONF_API_TOKEN])
             LOGGER.info("Reconnected to the Blue Current websocket")
-            self.hass.loop.create_task(self.start_loop())
-            await self.client.get_charge_points()
+            self.metrics.reconnects += 1
+            self.reconnect_attempts = 0
+            await self.async_set_available(True)
+            self.supervisor.async_start_loop(self)
+            await self.resync()
         except RequestLimitReached:
-            set_entities_unavalible(self.hass, self.config.entry_id)
-            async_call_later(
-                self.hass, self.client.get_next_reset_delta(), self.reconnect
-            )
+            self.schedule_rate_limited_reconnect()
+            await self.async_set_available(False)
         except WebsocketError:
-            set_entities_unavalible(self.hass, self.config.entry_id)
-            async_call_later(self.hass, LARGE_DELAY, self.reconnect)
+            self.schedule_reconnect()
+            await self.async_set_available(False)
+
+    async def async_set_available(self, available: bool) -> None:
+        """Set the availability of the connection.
+
+        The entities that consult it are written in chunks, so a large fleet
+        doesn't block the event loop. Entities whose availability doesn't
+        change are skipped.
+        """
+        if available == self.available:
+            return
+        self.available = available
+
+        entities = list(self.entities)
+        for index in range(0, len(entities), AVAILABILITY_CHUNK_SIZE):
+            for entity in entities[index : index + AVAILABILITY_CHUNK_SIZE]:
+                if entity in self.entities:
+                    entity.async_write_ha_state_if_changed()
+            await asyncio.sleep(0)
+
+    async def resync(self) -> None:
+        """Get the data that may have changed while the connection was lost.
+
+        The charge points are only enumerated again when there are none yet or
+        when the outage was so long that the set of charge points may have changed.
+        """
+        outage = (
+            monotonic() - self.disconnected_at
+            if self.disconnected_at is not None
+            else None
+        )
+        self.disconnected_at = None
+
+        if not self.charge_points or outage is None or outage > FULL_RESYNC_AFTER:
+            self.bootstrap_pending.clear()
+            await self.client.get_charge_points()
+            return
+
+        evse_ids = list(self.charge_points)
+        status_only = set(evse_ids).difference(self.get_stale_charge_points(outage))
+        self.bootstrap_pending.clear()
+        LOGGER.debug(
+            "Refreshing %s charge points, %s of them without settings, after an outage of %.1f seconds",
+            len(evse_ids),
+            len(status_only),
+            outage,
+        )
+        self.hass.async_create_task(self.bootstrap_charge_points(evse_ids, status_only))
+
+    def get_stale_charge_points(self, outage: float) -> list[str]:
+        """Return the charge points whose settings may have changed during an outage.
+
+        After a short outage these are the charge points that are charging or
+        that did not receive all their data yet. The status of the other charge
+        points is refreshed as well, because their activity may have changed.
+        """
+        if outage > STALE_AFTER:
+            return list(self.charge_points)
+
+        return [
+            evse_id
+            for evse_id, charge_point in self.charge_points.items()
+            if charge_point.activity in (None, CHARGING)
+            or evse_id in self.bootstrap_pending
+        ]
 
     async def disconnect(self) -> None:
         """Disconnect from the websocket."""
+        if self.cancel_reconnect is not None:
+            self.cancel_reconnect()
+            self.cancel_reconnect = None
+        for cancel in self.pending_flushes.values():
+            cancel()
+        self.pending_flushes.clear()
+        self.pending_keys.clear()
+        self.balancer.async_cancel()
+        self.pending_requests.fail_all("disconnected")
         with suppress(WebsocketError):
             await self.client.disconnect()
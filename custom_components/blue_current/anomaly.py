@@ -0,0 +1,197 @@
+"""Online detection of anomalies in the grid and charge point measurements."""
+from __future__ import annotations
+
+from math import exp
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+
+from .const import DOMAIN, EVSE_ID, LOGGER
+
+if TYPE_CHECKING:
+    from . import Connector
+
+PHASE_IMBALANCE = "phase_imbalance"
+GRID_OVERCURRENT = "grid_overcurrent"
+VOLTAGE_SAG = "voltage_sag"
+EVENT_ANOMALY = f"{DOMAIN}_anomaly"
+
+GRID_PHASES = ("grid_actual_p1", "grid_actual_p2", "grid_actual_p3")
+GRID_MAX_CURRENT = "grid_max_current"
+VOLTAGE_PHASES = ("actual_v1", "actual_v2", "actual_v3")
+
+# time constants in seconds of the moving averages
+IMBALANCE_TAU = 60
+OVERCURRENT_TAU = 30
+VOLTAGE_TAU = 600
+# the imbalance is the max deviation from the average phase current divided
+# by the average, below this average current in A there is no imbalance
+MIN_IMBALANCE_CURRENT = 5
+IMBALANCE_ON = 0.2
+IMBALANCE_OFF = 0.15
+# the overcurrent is cleared below this part of the grid capacity
+OVERCURRENT_OFF = 0.95
+# a voltage below this part of its average is a sag (EN 50160 uses 90 %)
+SAG_ON = 0.9
+SAG_OFF = 0.95
+# lower voltages are treated as a phase that is not measured
+MIN_VOLTAGE = 50
+# the number of samples before a voltage average is trusted
+MIN_VOLTAGE_SAMPLES = 10
+
+
+class Ewma:
+    """Define an exponentially weighted moving average with a time constant.
+
+    The weight of a sample depends on the time since the previous sample, so
+    the average does not depend on the frame rate. It keeps no history.
+    """
+
+    __slots__ = ("tau", "value", "samples", "last")
+
+    def __init__(self, tau: float) -> None:
+        """Initialize the average."""
+        self.tau = tau
+        self.value: float | None = None
+        self.samples = 0
+        self.last = 0.0
+
+    def update(self, value: float, now: float) -> float:
+        """Add a sample and return the new average."""
+        if self.value is None:
+            self.value = value
+        else:
+            alpha = 1 - exp(-max(now - self.last, 0) / self.tau)
+            self.value += alpha * (value - self.value)
+        self.samples += 1
+        self.last = now
+        return self.value
+
+
+def get_imbalance(currents: tuple[float, ...]) -> float:
+    """Return the max deviation from the average current divided by the average.
+
+    A low load is not imbalanced, so an imbalance clears when the load drops.
+    """
+    average = sum(currents) / len(currents)
+    if average < MIN_IMBALANCE_CURRENT:
+        return 0
+    return max(abs(current - average) for current in currents) / average
+
+
+class AnomalyDetector:
+    """Define a detector of phase imbalance, grid overcurrent and voltage sags.
+
+    Phase imbalance and overcurrent are flagged when their moving averages
+    stay above a threshold, so short peaks are ignored. A voltage sag is
+    flagged when a phase voltage of a charge point drops below its moving
+    average, which is not updated during the sag. Changes of an anomaly are
+    fired as an event and dispatched to the binary sensors.
+    """
+
+    def __init__(self, connector: Connector) -> None:
+        """Initialize the detector."""
+        self.connector = connector
+        self.imbalance = Ewma(IMBALANCE_TAU)
+        self.max_current = Ewma(OVERCURRENT_TAU)
+        self.voltages: dict[str, tuple[Ewma, ...]] = {}
+        self.grid_anomalies: set[str] = set()
+        self.voltage_sags: set[str] = set()
+
+    @callback
+    def update_grid(self, data: dict[str, Any]) -> None:
+        """Check the phase imbalance and overcurrent of the grid."""
+        now = monotonic()
+        currents = tuple(data.get(key) for key in GRID_PHASES)
+        if all(isinstance(current, int | float) for current in currents):
+            imbalance = get_imbalance(currents)  # type: ignore[arg-type]
+            average = self.imbalance.update(imbalance, now)
+            self.set_grid_anomaly(
+                PHASE_IMBALANCE,
+                average,
+                average >= IMBALANCE_ON
+                or (PHASE_IMBALANCE in self.grid_anomalies and average > IMBALANCE_OFF),
+            )
+
+        capacity = self.connector.grid_capacity
+        if capacity > 0 and isinstance(
+            max_current := data.get(GRID_MAX_CURRENT), int | float
+        ):
+            average = self.max_current.update(max_current, now)
+            self.set_grid_anomaly(
+                GRID_OVERCURRENT,
+                average,
+                average > capacity
+                or (
+                    GRID_OVERCURRENT in self.grid_anomalies
+                    and average > capacity * OVERCURRENT_OFF
+                ),
+            )
+
+    @callback
+    def update_charge_point(self, evse_id: str, data: dict[str, Any]) -> None:
+        """Check the phase voltages of a charge point for a sag."""
+        if not any(key in data for key in VOLTAGE_PHASES):
+            return
+        now = monotonic()
+        if (averages := self.voltages.get(evse_id)) is None:
+            averages = self.voltages[evse_id] = tuple(
+                Ewma(VOLTAGE_TAU) for _ in VOLTAGE_PHASES
+            )
+
+        sagging = evse_id in self.voltage_sags
+        lowest: float | None = None
+        for key, average in zip(VOLTAGE_PHASES, averages):
+            voltage = data.get(key)
+            if not isinstance(voltage, int | float) or voltage < MIN_VOLTAGE:
+                continue
+            if average.value is None or average.samples < MIN_VOLTAGE_SAMPLES:
+                average.update(voltage, now)
+                continue
+            ratio = voltage / average.value
+            if lowest is None or ratio < lowest:
+                lowest = ratio
+            # the average follows the normal voltage only
+            if ratio >= SAG_OFF:
+                average.update(voltage, now)
+
+        if lowest is None:
+            return
+        sag = lowest < SAG_ON or (sagging and lowest < SAG_OFF)
+        if sag != sagging:
+            if sag:
+                self.voltage_sags.add(evse_id)
+            else:
+                self.voltage_sags.discard(evse_id)
+            self.publish(VOLTAGE_SAG, sag, round(lowest, 3), evse_id)
+
+    @callback
+    def set_grid_anomaly(self, anomaly: str, value: float, active: bool) -> None:
+        """Publish a grid anomaly if it changed."""
+        if active == (anomaly in self.grid_anomalies):
+            return
+        if active:
+            self.grid_anomalies.add(anomaly)
+        else:
+            self.grid_anomalies.discard(anomaly)
+        self.publish(anomaly, active, round(value, 3))
+
+    @callback
+    def publish(
+        self, anomaly: str, active: bool, value: float, evse_id: str | None = None
+    ) -> None:
+        """Fire an event and dispatch the change of an anomaly."""
+        LOGGER.debug("%s of %s: %s (%s)", anomaly, evse_id or "grid", active, value)
+        event_data: dict[str, Any] = {"type": anomaly, "active": active, "value": value}
+        if evse_id is None:
+            self.connector.dispatch_grid_update_signal((anomaly,))
+        else:
+            event_data[EVSE_ID] = evse_id
+            self.connector.dispatch_value_update_signal(evse_id, (anomaly,))
+        self.connector.hass.bus.async_fire(EVENT_ANOMALY, event_data)
+
+    def remove(self, evse_id: str) -> None:
+        """Remove the averages of a removed charge point."""
+        self.voltages.pop(evse_id, None)
+        self.voltage_sags.discard(evse_id)
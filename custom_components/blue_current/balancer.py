@@ -0,0 +1,160 @@
+"""Load balancing of the charge points behind one grid connection."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+from math import floor
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import CHARGING, DOMAIN, EVSE_ID, LOGGER
+
+if TYPE_CHECKING:
+    from . import Connector
+
+# the lowest current in A at which a car charges
+MIN_CURRENT = 6
+# increases of an allocation smaller than this in A are not published
+HYSTERESIS = 1
+# the min number of seconds between two runs of the balancer
+MIN_INTERVAL = 10
+PHASES = ("p1", "p2", "p3")
+ALLOCATED_CURRENT = "allocated_current"
+EVENT_ALLOCATION = f"{DOMAIN}_allocation"
+
+
+def allocate_currents(
+    budget: float, limits: Iterable[tuple[str, float]], min_current: float = MIN_CURRENT
+) -> dict[str, float]:
+    """Divide a budget in A over charge points with a max current each.
+
+    Every charge point gets the same share, except the ones whose limit is
+    lower, which get their limit. When the budget is too small to give every
+    charge point min_current, the charge points with the lowest limits are
+    served first and the others get 0. The charge points are sorted once, so
+    this is O(n log n).
+    """
+    limits = list(limits)
+    allocations = {evse_id: 0.0 for evse_id, _ in limits}
+    ordered = sorted(
+        (limit, evse_id) for evse_id, limit in limits if limit >= min_current
+    )
+
+    served = min(len(ordered), int(max(budget, 0) // min_current))
+    remaining = budget
+    for index, (limit, evse_id) in enumerate(ordered[:served]):
+        share = remaining / (served - index)
+        allocation = min(limit, share)
+        # rounded down so the sum stays within the budget
+        allocations[evse_id] = floor(allocation * 10) / 10
+        remaining -= allocation
+    return allocations
+
+
+class LoadBalancer:
+    """Define a balancer of the current of the charging charge points.
+
+    The budget is the grid capacity minus the load of the other devices on
+    the most loaded phase. The API has no command to set the current of a
+    charge point, so changed allocations are published as an event and as
+    the allocated_current of the charge points.
+    """
+
+    def __init__(self, connector: Connector) -> None:
+        """Initialize the balancer."""
+        self.connector = connector
+        self.allocations: dict[str, float] = {}
+        self.last_run: float | None = None
+        self.cancel_run: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_schedule(self) -> None:
+        """Run the balancer, at most once per MIN_INTERVAL seconds."""
+        if self.connector.grid_capacity <= 0 or self.cancel_run is not None:
+            return
+        now = self.connector.hass.loop.time()
+        if self.last_run is None or now - self.last_run >= MIN_INTERVAL:
+            self.async_run()
+            return
+        self.cancel_run = async_call_later(
+            self.connector.hass, MIN_INTERVAL - (now - self.last_run), self.async_run
+        )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel a scheduled run."""
+        if self.cancel_run is not None:
+            self.cancel_run()
+            self.cancel_run = None
+
+    def get_budget(self, charging: list[str]) -> float | None:
+        """Return the current that the charging charge points can use together."""
+        grid = self.connector.grid
+        charge_points = self.connector.charge_points
+        base_loads = []
+        for phase in PHASES:
+            if (grid_current := grid.get(f"grid_actual_{phase}")) is None:
+                return None
+            charging_current = sum(
+                charge_points[evse_id].get(f"actual_{phase}", 0) for evse_id in charging
+            )
+            base_loads.append(grid_current - charging_current)
+        return self.connector.grid_capacity - max(base_loads)
+
+    @callback
+    def async_run(self, _event_time: datetime | None = None) -> None:
+        """Allocate the budget and publish the decreases and large increases."""
+        self.cancel_run = None
+        self.last_run = self.connector.hass.loop.time()
+        charge_points = self.connector.charge_points
+        charging = [
+            evse_id
+            for evse_id, charge_point in charge_points.items()
+            if charge_point.activity == CHARGING
+        ]
+        if (budget := self.get_budget(charging)) is None:
+            return
+
+        allocations = allocate_currents(
+            budget,
+            (
+                (evse_id, charge_points[evse_id].get("max_usage", 0))
+                for evse_id in charging
+            ),
+        )
+        # charge points that stopped charging get 0
+        for evse_id, published in list(self.allocations.items()):
+            if evse_id not in charge_points:
+                del self.allocations[evse_id]
+            elif evse_id not in allocations and published:
+                allocations[evse_id] = 0.0
+
+        # every decrease is published, so the sum of the published allocations
+        # never exceeds the budget
+        changed = [
+            evse_id
+            for evse_id, allocation in allocations.items()
+            if (published := self.allocations.get(evse_id)) is None
+            or allocation < published
+            or allocation - published >= HYSTERESIS
+        ]
+
+        LOGGER.debug(
+            "Allocated %.1f A over %s charge points, %s changed",
+            budget,
+            len(charging),
+            len(changed),
+        )
+        for evse_id in changed:
+            self.publish(evse_id, allocations[evse_id])
+
+    @callback
+    def publish(self, evse_id: str, allocation: float) -> None:
+        """Publish the allocation of a charge point."""
+        self.allocations[evse_id] = allocation
+        self.connector.hass.bus.async_fire(
+            EVENT_ALLOCATION, {EVSE_ID: evse_id, ALLOCATED_CURRENT: allocation}
+        )
+        self.connector.dispatch_value_update_signal(evse_id, (ALLOCATED_CURRENT,))
@@ -0,0 +1,136 @@
+"""Support for Blue Current binary sensors."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from . import Connector
+from .anomaly import GRID_OVERCURRENT, PHASE_IMBALANCE, VOLTAGE_SAG
+from .const import DOMAIN
+from .entity import (
+    BlueCurrentEntity,
+    ChargePointEntityFactory,
+    GridEntity,
+    async_create_charge_point_entities,
+)
+
+VOLTAGE_SAG_SENSOR = BinarySensorEntityDescription(
+    key=VOLTAGE_SAG,
+    name="Voltage sag",
+    icon="mdi:flash-triangle-outline",
+    device_class=BinarySensorDeviceClass.PROBLEM,
+    has_entity_name=True,
+)
+
+GRID_BINARY_SENSORS = (
+    BinarySensorEntityDescription(
+        key=PHASE_IMBALANCE,
+        name="Phase imbalance",
+        icon="mdi:scale-unbalanced",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        has_entity_name=True,
+    ),
+    BinarySensorEntityDescription(
+        key=GRID_OVERCURRENT,
+        name="Overcurrent",
+        icon="mdi:current-ac",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        has_entity_name=True,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up Blue Current binary sensors."""
+    connector: Connector = hass.data[DOMAIN][entry.entry_id]
+
+    @callback
+    def add_charge_points(evse_ids: list[str]) -> None:
+        """Add the binary sensors of new charge points."""
+        async_add_entities(
+            async_create_charge_point_entities(
+                connector, Platform.BINARY_SENSOR, evse_ids, CHARGE_POINT_BINARY_SENSORS
+            )
+        )
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{DOMAIN}_evse_added_{entry.entry_id}", add_charge_points
+        )
+    )
+
+    binary_sensors: list[BinarySensorEntity] = list(
+        async_create_charge_point_entities(
+            connector,
+            Platform.BINARY_SENSOR,
+            connector.charge_points,
+            CHARGE_POINT_BINARY_SENSORS,
+        )
+    )
+    for sensor in GRID_BINARY_SENSORS:
+        binary_sensors.append(GridAnomalySensor(connector, sensor))
+
+    async_add_entities(binary_sensors)
+
+
+class VoltageSagSensor(BlueCurrentEntity, BinarySensorEntity):
+    """Define a binary sensor that is on during a voltage sag of a charge point."""
+
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        connector: Connector,
+        evse_id: str,
+        sensor: BinarySensorEntityDescription,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(connector, evse_id)
+
+        self.update_keys = (VOLTAGE_SAG,)
+        self.entity_description = sensor
+        self._attr_unique_id = f"{sensor.key}_{evse_id}"
+
+    @callback
+    def update_from_latest_data(self) -> None:
+        """Update the binary sensor from the detector."""
+        self._attr_is_on = self.evse_id in self.connector.anomalies.voltage_sags
+
+    @property
+    def published_value(self) -> Any:
+        """Return the value that is compared to detect a state change."""
+        return self._attr_is_on
+
+
+class GridAnomalySensor(GridEntity, BinarySensorEntity):
+    """Define a binary sensor that is on during an anomaly of the grid."""
+
+    _attr_should_poll = False
+
+    @callback
+    def update_from_latest_data(self) -> None:
+        """Update the binary sensor from the detector."""
+        self._attr_is_on = self.key in self.connector.anomalies.grid_anomalies
+
+    @property
+    def published_value(self) -> Any:
+        """Return the value that is compared to detect a state change."""
+        return self._attr_is_on
+
+
+# the classes and descriptions of the binary sensors of a charge point
+CHARGE_POINT_BINARY_SENSORS: tuple[
+    tuple[ChargePointEntityFactory, BinarySensorEntityDescription], ...
+] = ((VoltageSagSensor, VOLTAGE_SAG_SENSOR),)
@@ -7,12 +7,18 @@ from homeassistant.components.button import (
     ButtonDeviceClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import Connector
 from .const import DOMAIN, EVSE_ID
-from .entity import BlueCurrentEntity
+from .entity import (
+    BlueCurrentEntity,
+    ChargePointEntityFactory,
+    async_create_charge_point_entities,
+)
 
 BUTTONS = (
     ButtonEntityDescription(
@@ -43,18 +49,27 @@ async def async_setup_entry(
 ) -> None:
     """Set up Blue Current buttons."""
     connector: Connector = hass.data[DOMAIN][entry.entry_id]
-    button_list = []
-    for evse_id in connector.charge_points:
-        for button in BUTTONS:
-            button_list.append(
-                ChargePointButton(
-                    connector,
-                    evse_id,
-                    button,
-                )
+
+    @callback
+    def add_charge_points(evse_ids: list[str]) -> None:
+        """Add the buttons of new charge points."""
+        async_add_entities(
+            async_create_charge_point_entities(
+                connector, Platform.BUTTON, evse_ids, CHARGE_POINT_BUTTONS
             )
+        )
 
-    async_add_entities(button_list)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{DOMAIN}_evse_added_{entry.entry_id}", add_charge_points
+        )
+    )
+
+    async_add_entities(
+        async_create_charge_point_entities(
+            connector, Platform.BUTTON, connector.charge_points, CHARGE_POINT_BUTTONS
+        )
+    )
 
 
 class ChargePointButton(BlueCurrentEntity, ButtonEntity):
@@ -82,3 +97,9 @@ class ChargePointButton(BlueCurrentEntity, ButtonEntity):
     @callback
     def update_from_latest_data(self) -> None:
         """Fetch new state data for the button."""
+
+
+# the classes and descriptions of the buttons of a charge point
+CHARGE_POINT_BUTTONS: tuple[
+    tuple[ChargePointEntityFactory, ButtonEntityDescription], ...
+] = tuple((ChargePointButton, description) for description in BUTTONS)
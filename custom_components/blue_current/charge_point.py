@@ -0,0 +1,105 @@
+"""State of a Blue Current charge point."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from operator import attrgetter
+from typing import Any
+
+from homeassistant.const import ATTR_NAME
+
+from .const import MODEL_TYPE
+
+FIELDS = (
+    MODEL_TYPE,
+    ATTR_NAME,
+    "actual_v1",
+    "actual_v2",
+    "actual_v3",
+    "avg_voltage",
+    "actual_p1",
+    "actual_p2",
+    "actual_p3",
+    "avg_current",
+    "total_kw",
+    "actual_kwh",
+    "start_datetime",
+    "stop_datetime",
+    "offline_since",
+    "total_cost",
+    "vehicle_status",
+    "activity",
+    "max_usage",
+    "smartcharging_max_usage",
+    "max_offline",
+    "current_left",
+    "plug_and_charge",
+    "linked_charge_cards_only",
+    "block",
+)
+FIELD_SET = frozenset(FIELDS)
+
+
+class ChargePointState:
+    """Define the latest data of a charge point.
+
+    The known keys are stored in slots, other keys are stored in extra.
+    A key with the value None is treated as missing.
+    """
+
+    __slots__ = (*FIELDS, "extra")
+
+    def __init__(self, model_type: str | None = None, name: str | None = None) -> None:
+        """Initialize the state."""
+        for field in FIELDS:
+            setattr(self, field, None)
+        setattr(self, MODEL_TYPE, model_type)
+        setattr(self, ATTR_NAME, name)
+        self.extra: dict[str, Any] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ChargePointState:
+        """Create a state from a dict."""
+        state = cls()
+        state.update(data)
+        return state
+
+    @staticmethod
+    def getter(key: str) -> Callable[[ChargePointState], Any]:
+        """Return a function that gets the value of a key from a state."""
+        if key in FIELD_SET:
+            return attrgetter(key)
+
+        def get_extra(state: ChargePointState) -> Any:
+            return state.extra.get(key) if state.extra else None
+
+        return get_extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value of a key."""
+        if key in FIELD_SET:
+            value = getattr(self, key)
+        elif self.extra:
+            value = self.extra.get(key)
+        else:
+            value = None
+        return default if value is None else value
+
+    def update(self, data: dict[str, Any]) -> None:
+        """Update the state with the data."""
+        for key, value in data.items():
+            if key in FIELD_SET:
+                setattr(self, key, value)
+            else:
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[key] = value
+
+    def keys(self) -> Iterable[str]:
+        """Return the keys that have a value."""
+        yield from (field for field in FIELDS if getattr(self, field) is not None)
+        if self.extra:
+            yield from (key for key, value in self.extra.items() if value is not None)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the keys that have a value as a dict."""
+        return {key: self.get(key) for key in self.keys()}
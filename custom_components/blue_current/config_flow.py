@@ -15,9 +15,26 @@ from bluecurrent_api.exceptions import (
 )
 from homeassistant import config_entries
 from homeassistant.const import CONF_API_TOKEN, CONF_ID
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import CARD, DOMAIN, LOGGER
+from .const import (
+    CARD,
+    CONF_BOOTSTRAP_CONCURRENCY,
+    CONF_COALESCE_WINDOW,
+    CONF_GRID_CAPACITY,
+    CONF_READY_TIMEOUT,
+    DEFAULT_BOOTSTRAP_CONCURRENCY,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_GRID_CAPACITY,
+    DEFAULT_READY_TIMEOUT,
+    DOMAIN,
+    LOGGER,
+    MAX_BOOTSTRAP_CONCURRENCY,
+    MAX_COALESCE_WINDOW,
+    MAX_GRID_CAPACITY,
+    MAX_READY_TIMEOUT,
+)
 
 DATA_SCHEMA = vol.Schema(
     {vol.Required(CONF_API_TOKEN): str, vol.Optional("add_card"): bool}
@@ -34,6 +51,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     client: Client
     entry: config_entries.ConfigEntry | None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -131,3 +156,49 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self.entry, data=self.input, title=self.input[CONF_API_TOKEN][:5]
         )
         await self.hass.config_entries.async_reload(self.entry.entry_id)
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle the options flow for Blue Current."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow.
+
+        The entry is not assigned to config_entry, which newer Home Assistant
+        versions provide as a property and no longer allow to be set.
+        """
+        self.entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.entry.options
+        options_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_BOOTSTRAP_CONCURRENCY,
+                    default=options.get(
+                        CONF_BOOTSTRAP_CONCURRENCY, DEFAULT_BOOTSTRAP_CONCURRENCY
+                    ),
+                ): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_BOOTSTRAP_CONCURRENCY)
+                ),
+                vol.Optional(
+                    CONF_COALESCE_WINDOW,
+                    default=options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_COALESCE_WINDOW)),
+                vol.Optional(
+                    CONF_READY_TIMEOUT,
+                    default=options.get(CONF_READY_TIMEOUT, DEFAULT_READY_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_READY_TIMEOUT)),
+                vol.Optional(
+                    CONF_GRID_CAPACITY,
+                    default=options.get(CONF_GRID_CAPACITY, DEFAULT_GRID_CAPACITY),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_GRID_CAPACITY)),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=options_schema)
@@ -1,6 +1,7 @@
 """Constants for the Blue Current integration."""
 
 import logging
+from enum import StrEnum
 
 DOMAIN = "blue_current"
 
@@ -10,3 +11,37 @@ ACTIVITY = "activity"
 EVSE_ID = "evse_id"
 CARD = "card"
 MODEL_TYPE = "model_type"
+CHARGING = "charging"
+# the prefix of the grid device identifier and of the unique ids of its entities
+GRID_PREFIX = "grid_"
+
+RESET = "reset"
+REBOOT = "reboot"
+START_SESSION = "start_session"
+STOP_SESSION = "stop_session"
+
+CONF_BOOTSTRAP_CONCURRENCY = "bootstrap_concurrency"
+DEFAULT_BOOTSTRAP_CONCURRENCY = 10
+MAX_BOOTSTRAP_CONCURRENCY = 50
+
+CONF_COALESCE_WINDOW = "coalesce_window"
+DEFAULT_COALESCE_WINDOW = 0
+MAX_COALESCE_WINDOW = 10000
+
+CONF_READY_TIMEOUT = "ready_timeout"
+DEFAULT_READY_TIMEOUT = 10
+MAX_READY_TIMEOUT = 60
+
+CONF_GRID_CAPACITY = "grid_capacity"
+DEFAULT_GRID_CAPACITY = 0
+MAX_GRID_CAPACITY = 1000
+
+
+class ConnectionState(StrEnum):
+    """State of the connection with the Blue Current websocket."""
+
+    CONNECTING = "connecting"
+    SYNCING = "syncing"
+    LIVE = "live"
+    BACKOFF = "backoff"
+    RATE_LIMITED = "rate_limited"
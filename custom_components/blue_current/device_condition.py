@@ -17,7 +17,7 @@ from homeassistant.helpers import device_registry
 from homeassistant.helpers.config_validation import DEVICE_CONDITION_BASE_SCHEMA
 from homeassistant.helpers.typing import ConfigType, TemplateVarsType
 
-from . import DOMAIN
+from . import DOMAIN, GRID_PREFIX
 
 ACTIVITY_TYPES = {
     "available",
@@ -60,7 +60,12 @@ async def async_get_conditions(
     device = registry.async_get(device_id)
 
     assert device is not None
+    # the connection metrics and grid devices have no charge point conditions
+    if device.entry_type is device_registry.DeviceEntryType.SERVICE:
+        return []
     evse_id = list(device.identifiers)[0][1]
+    if evse_id.startswith(GRID_PREFIX):
+        return []
 
     base_condition = {
         CONF_CONDITION: "device",
@@ -19,7 +19,7 @@ from homeassistant.helpers import device_registry
 from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .const import DOMAIN, GRID_PREFIX
 
 ACTIVITY_TYPES = {
     "available",
@@ -62,7 +62,12 @@ async def async_get_triggers(
     device = registry.async_get(device_id)
 
     assert device is not None
+    # the connection metrics and grid devices have no charge point triggers
+    if device.entry_type is device_registry.DeviceEntryType.SERVICE:
+        return []
     evse_id = list(device.identifiers)[0][1]
+    if evse_id.startswith(GRID_PREFIX):
+        return []
 
     base_trigger = {
         CONF_PLATFORM: "device",
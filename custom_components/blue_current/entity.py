@@ -1,46 +1,193 @@
 """Entity representing a Blue Current charge point."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from functools import partial
+from typing import Any, Protocol
+
+from homeassistant.const import Platform
 from homeassistant.core import callback
-from homeassistant.const import ATTR_NAME
+from homeassistant.helpers import entity_registry
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
-from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity import DeviceInfo, Entity, EntityDescription
 
 from . import Connector
-from .const import DOMAIN, MODEL_TYPE
+from .const import DOMAIN, GRID_PREFIX
+
+STALE = "stale"
+
+
+class ChargePointEntityFactory(Protocol):
+    """Define the constructor of a charge point entity."""
+
+    def __call__(
+        self, connector: Connector, evse_id: str, description: Any, /
+    ) -> BlueCurrentEntity:
+        """Create the entity."""
+
+
+@callback
+def async_create_charge_point_entities(
+    connector: Connector,
+    platform: Platform,
+    evse_ids: Iterable[str],
+    entity_table: Iterable[tuple[ChargePointEntityFactory, EntityDescription]],
+) -> list[BlueCurrentEntity]:
+    """Create the entities of charge points, except the ones that are disabled.
+
+    The unique id of a charge point entity is its key and the evse id. An
+    entity that is registered as disabled is not created, enabling it reloads
+    the config entry. Entities without a registry entry are created, so
+    entities that are disabled by default are registered once.
+    """
+    registry = entity_registry.async_get(connector.hass)
+    table = tuple(entity_table)
+    entities: list[BlueCurrentEntity] = []
+    for evse_id in evse_ids:
+        for factory, description in table:
+            entity_id = registry.async_get_entity_id(
+                platform, DOMAIN, f"{description.key}_{evse_id}"
+            )
+            if entity_id is not None and registry.entities[entity_id].disabled:
+                continue
+            entities.append(factory(connector, evse_id, description))
+    return entities
+
+
+class ChangeTrackingEntity(Entity):
+    """Define an entity that only writes its state when it has changed."""
 
+    connector: Connector
+    _last_written_state: tuple[bool, bool, Any] | None = None
 
-class BlueCurrentEntity(Entity):
+    @property
+    def available(self) -> bool:
+        """Return if the entity and the connection are available."""
+        return self.connector.available and super().available
+
+    @property
+    def stale(self) -> bool:
+        """Return if the value comes from the snapshot."""
+        return False
+
+    @property
+    def published_value(self) -> Any:
+        """Return the value that is compared to detect a state change."""
+        return None
+
+    @callback
+    def async_mark_state_written(self) -> None:
+        """Remember the current availability, staleness and value as written."""
+        self._last_written_state = (self.available, self.stale, self.published_value)
+
+    @callback
+    def async_write_ha_state_if_changed(self) -> None:
+        """Write the state if the availability, staleness or value changed since the last write."""
+        if self._last_written_state == (
+            self.available,
+            self.stale,
+            self.published_value,
+        ):
+            return
+        self.async_mark_state_written()
+        self.async_write_ha_state()
+        self.connector.metrics.state_writes += 1
+
+    async def async_added_to_hass(self) -> None:
+        """Register the entity at the connector."""
+        self.connector.entities.add(self)
+        self.async_on_remove(partial(self.connector.entities.discard, self))
+
+
+class BlueCurrentEntity(ChangeTrackingEntity):
     """Define a base charge point entity."""
 
     def __init__(self, connector: Connector, evse_id: str) -> None:
         """Initialize the entity."""
         self.connector: Connector = connector
-
-        name = connector.charge_points[evse_id][ATTR_NAME]
+        self.update_keys: tuple[str, ...] = ()
 
         self.evse_id = evse_id
+        self._attr_device_info = connector.get_device_info(evse_id)
+
+    @property
+    def stale(self) -> bool:
+        """Return if the data of the charge point comes from the snapshot."""
+        return self.evse_id in self.connector.stale
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the attributes, marked stale while the data comes from the snapshot."""
+        attributes = super().extra_state_attributes
+        if not self.stale:
+            return attributes
+        return {**(attributes or {}), STALE: True}
+
+    async def async_added_to_hass(self) -> None:
+        """Register the entity at the hub of its charge point."""
+        await super().async_added_to_hass()
+
+        hub = self.connector.get_hub(self.evse_id)
+        self.async_on_remove(hub.async_add_entity(self))
+
+        self.update_from_latest_data()
+        self.async_mark_state_written()
+
+    @callback
+    def async_handle_value_update(self) -> None:
+        """Update the state after a value of the charge point changed."""
+        self.update_from_latest_data()
+        self.async_write_ha_state_if_changed()
+
+    @callback
+    def async_remove_charge_point(self) -> None:
+        """Remove the entity of a removed charge point."""
+        if self.registry_entry is not None:
+            entity_registry.async_get(self.hass).async_remove(self.entity_id)
+        else:
+            self.hass.async_create_task(self.async_remove(force_remove=True))
+
+    @callback
+    def update_from_latest_data(self) -> None:
+        """Update the entity from the latest data."""
+        raise NotImplementedError
+
+
+class GridEntity(ChangeTrackingEntity):
+    """Define a base entity of the grid of an account."""
+
+    def __init__(self, connector: Connector, description: EntityDescription) -> None:
+        """Initialize the entity."""
+        self.connector = connector
+        self.key = description.key
+        self.entity_description = description
+
+        entry = connector.config
+        self._attr_unique_id = f"{description.key}_{entry.entry_id}"
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, evse_id)},
-            name=name if name != "" else evse_id,
+            identifiers={(DOMAIN, f"{GRID_PREFIX}{entry.entry_id}")},
+            name=f"Blue Current grid {entry.title}",
             manufacturer="Blue Current",
-            model=connector.charge_points[evse_id][MODEL_TYPE],
         )
 
     async def async_added_to_hass(self) -> None:
         """Register callbacks."""
+        await super().async_added_to_hass()
 
         @callback
         def update() -> None:
             """Update the state."""
             self.update_from_latest_data()
-            self.async_write_ha_state()
+            self.async_write_ha_state_if_changed()
 
+        signal = self.connector.grid_signal
+        self.async_on_remove(async_dispatcher_connect(self.hass, signal, update))
         self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass, f"{DOMAIN}_value_update_{self.evse_id}", update
-            )
+            async_dispatcher_connect(self.hass, f"{signal}_{self.key}", update)
         )
 
         self.update_from_latest_data()
+        self.async_mark_state_written()
 
     @callback
     def update_from_latest_data(self) -> None:
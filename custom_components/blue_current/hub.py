@@ -0,0 +1,93 @@
+"""Fan-out of the value updates of a charge point to its entities."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import partial
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from .entity import BlueCurrentEntity
+
+
+class ChargePointHub:
+    """Define the entities of a charge point, grouped by the keys they show.
+
+    The connector passes the changed keys of a charge point to its hub, which
+    calls the entities of those keys directly instead of sending a dispatcher
+    signal per key. While the hub has entities it subscribes to the value
+    update signal of the charge point, so all its entities can still be
+    refreshed with a dispatcher signal.
+    """
+
+    __slots__ = (
+        "hass",
+        "evse_id",
+        "signal",
+        "entities",
+        "entities_by_key",
+        "_unsubscribe",
+    )
+
+    def __init__(self, hass: HomeAssistant, evse_id: str) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.evse_id = evse_id
+        self.signal = f"{DOMAIN}_value_update_{evse_id}"
+        self.entities: list[BlueCurrentEntity] = []
+        self.entities_by_key: dict[str, list[BlueCurrentEntity]] = {}
+        self._unsubscribe: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_entity(self, entity: BlueCurrentEntity) -> CALLBACK_TYPE:
+        """Add an entity and return a callback that removes it."""
+        if self._unsubscribe is None:
+            self._unsubscribe = async_dispatcher_connect(
+                self.hass, self.signal, self.async_update
+            )
+        self.entities.append(entity)
+        for key in entity.update_keys:
+            self.entities_by_key.setdefault(key, []).append(entity)
+        return partial(self.async_remove_entity, entity)
+
+    @callback
+    def async_remove_entity(self, entity: BlueCurrentEntity) -> None:
+        """Remove an entity, and the subscription after the last entity."""
+        self.entities.remove(entity)
+        for key in entity.update_keys:
+            entities = self.entities_by_key[key]
+            entities.remove(entity)
+            if not entities:
+                del self.entities_by_key[key]
+        if not self.entities and self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    @callback
+    def async_update(self, keys: Iterable[str] | None = None) -> None:
+        """Update the entities of the given keys, or all entities if None.
+
+        An entity of several changed keys is updated once.
+        """
+        if keys is None:
+            entities: Iterable[BlueCurrentEntity] = self.entities
+        else:
+            entities_by_key = self.entities_by_key
+            entities = dict.fromkeys(
+                entity for key in keys for entity in entities_by_key.get(key, ())
+            )
+        for entity in entities:
+            try:
+                entity.async_handle_value_update()
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Error updating %s", entity.entity_id)
+
+    @callback
+    def async_remove_charge_point(self) -> None:
+        """Remove the entities of the removed charge point."""
+        for entity in list(self.entities):
+            entity.async_remove_charge_point()
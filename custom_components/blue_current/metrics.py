@@ -0,0 +1,66 @@
+"""Runtime metrics of the Blue Current websocket pipeline."""
+from __future__ import annotations
+
+from collections import deque
+from time import monotonic
+
+HANDLING_TIME_SAMPLES = 1000
+
+
+class ConnectorMetrics:
+    """Define the runtime metrics of a connector.
+
+    The metrics are only changed from the event loop, so the counters are
+    plain ints and the derived values are calculated when they are published.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.handling_times: deque[float] = deque(maxlen=HANDLING_TIME_SAMPLES)
+        self.dispatches = 0
+        self.state_writes = 0
+        self.reconnects = 0
+        self.last_frame: float | None = None
+        self.state_writes_per_second = 0.0
+        self.setup_duration: float | None = None
+        self._last_published = monotonic()
+        self._last_published_state_writes = 0
+
+    def record_frame(self, start: float, end: float) -> None:
+        """Record the time it took to handle a frame."""
+        self.last_frame = end
+        self.handling_times.append(end - start)
+
+    @property
+    def average_handling_time(self) -> float | None:
+        """Return the average handling time of the recent frames in ms."""
+        if not self.handling_times:
+            return None
+        return round(sum(self.handling_times) / len(self.handling_times) * 1000, 3)
+
+    @property
+    def p95_handling_time(self) -> float | None:
+        """Return the 95th percentile handling time of the recent frames in ms."""
+        if not self.handling_times:
+            return None
+        handling_times = sorted(self.handling_times)
+        index = min(len(handling_times) - 1, int(len(handling_times) * 0.95))
+        return round(handling_times[index] * 1000, 3)
+
+    @property
+    def time_since_last_frame(self) -> float | None:
+        """Return the seconds since the last frame was handled."""
+        if self.last_frame is None:
+            return None
+        return round(monotonic() - self.last_frame, 1)
+
+    def update_rates(self) -> None:
+        """Calculate the rates since the previous call."""
+        now = monotonic()
+        elapsed = now - self._last_published
+        if elapsed > 0:
+            self.state_writes_per_second = round(
+                (self.state_writes - self._last_published_state_writes) / elapsed, 2
+            )
+        self._last_published = now
+        self._last_published_state_writes = self.state_writes
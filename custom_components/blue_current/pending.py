@@ -0,0 +1,99 @@
+"""Requests that wait for their acknowledgement by the Blue Current websocket."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from time import monotonic
+from typing import Any
+
+from bluecurrent_api.exceptions import BlueCurrentException
+
+MAX_PENDING_REQUESTS = 1000
+SUCCESS = "success"
+ERROR = "error"
+
+RequestKey = tuple[str, str]
+
+
+class PendingRequests:
+    """Define a table of requests keyed by (object, evse_id).
+
+    A request for a key that is already pending shares the pending request,
+    unless it replaces it. Entries are evicted when their timeout passed or
+    when the table is full, so unanswered requests can't grow the table.
+    """
+
+    def __init__(self, timeout: float, max_size: int = MAX_PENDING_REQUESTS) -> None:
+        """Initialize the table."""
+        self.timeout = timeout
+        self.max_size = max_size
+        # ordered by deadline because every entry gets the same timeout
+        self.requests: dict[RequestKey, tuple[float, asyncio.Future[dict]]] = {}
+
+    def __contains__(self, key: RequestKey) -> bool:
+        """Return if a request for the key is pending."""
+        return key in self.requests
+
+    def __len__(self) -> int:
+        """Return the number of pending requests."""
+        return len(self.requests)
+
+    async def async_request(
+        self,
+        key: RequestKey,
+        send: Callable[[], Awaitable[None]],
+        timeout: float | None = None,
+        replace: bool = False,
+    ) -> dict[str, Any]:
+        """Send a request and wait for its acknowledgement.
+
+        If replace is True a pending request for the key is failed and the
+        request is sent again.
+        """
+        if replace:
+            self.resolve(key, {SUCCESS: False, ERROR: "replaced"})
+
+        if (entry := self.requests.get(key)) is not None:
+            future = entry[1]
+        else:
+            self.evict()
+            future = asyncio.get_running_loop().create_future()
+            self.requests[key] = (monotonic() + self.timeout, future)
+            try:
+                await send()
+            except BlueCurrentException as err:
+                self.resolve(key, {SUCCESS: False, ERROR: str(err)})
+
+        try:
+            async with asyncio.timeout(self.timeout if timeout is None else timeout):
+                return await asyncio.shield(future)
+        except TimeoutError:
+            if (entry := self.requests.get(key)) is not None and entry[1] is future:
+                del self.requests[key]
+            return {SUCCESS: False, ERROR: "timeout"}
+
+    def resolve(self, key: RequestKey, result: dict[str, Any]) -> bool:
+        """Pass the result to the waiting callers, return False if nobody waits for it."""
+        entry = self.requests.pop(key, None)
+        if entry is None or entry[1].done():
+            return False
+        entry[1].set_result(result)
+        return True
+
+    def evict(self) -> None:
+        """Evict the requests whose timeout passed and make room for a new one."""
+        now = monotonic()
+        while self.requests:
+            key, (deadline, future) = next(iter(self.requests.items()))
+            if deadline > now and len(self.requests) < self.max_size:
+                return
+            del self.requests[key]
+            if not future.done():
+                future.set_result({SUCCESS: False, ERROR: "evicted"})
+
+    def fail_all(self, error: str) -> None:
+        """Fail all pending requests."""
+        for _, future in self.requests.values():
+            if not future.done():
+                future.set_result({SUCCESS: False, ERROR: error})
+        self.requests.clear()
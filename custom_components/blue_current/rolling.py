@@ -0,0 +1,174 @@
+"""Rolling-window statistics of the Blue Current charge point measurements."""
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from time import monotonic
+from typing import Any
+
+# the measurements with rolling statistics
+STATISTIC_KEYS = (
+    "actual_v1",
+    "actual_v2",
+    "actual_v3",
+    "avg_voltage",
+    "actual_p1",
+    "actual_p2",
+    "actual_p3",
+    "avg_current",
+    "total_kw",
+)
+# the window lengths in minutes
+WINDOWS = (1, 5, 15)
+# every window is divided in this many slots, a slot keeps the sum and count
+# of its samples, so the memory of a window does not depend on the frame rate
+SLOT_COUNT = 60
+
+
+class RollingWindow:
+    """Define the min, max and mean of the samples of the last duration seconds.
+
+    The sums and counts of the slots are kept in array-backed ring buffers.
+    The min and max are the fronts of monotonic deques with at most one
+    (slot, value) entry per slot, so adding a sample is O(1) and reading the
+    min or max is amortized O(1). The window moves per slot, so the oldest
+    samples expire up to one slot late.
+    """
+
+    __slots__ = (
+        "slot_duration",
+        "sums",
+        "counts",
+        "total",
+        "count",
+        "last_slot",
+        "minimums",
+        "maximums",
+    )
+
+    def __init__(self, duration: float, slot_count: int = SLOT_COUNT) -> None:
+        """Initialize the window."""
+        self.slot_duration = duration / slot_count
+        self.sums = array("d", bytes(8 * slot_count))
+        self.counts = array("I", bytes(4 * slot_count))
+        self.total = 0.0
+        self.count = 0
+        self.last_slot: int | None = None
+        self.minimums: deque[tuple[int, float]] = deque()
+        self.maximums: deque[tuple[int, float]] = deque()
+
+    def expire(self, now: float) -> int:
+        """Clear the slots that moved out of the window and return the current slot."""
+        slot = int(now // self.slot_duration)
+        last_slot = self.last_slot
+        self.last_slot = slot
+        if last_slot is None or slot <= last_slot:
+            return slot
+
+        slot_count = len(self.sums)
+        if slot - last_slot >= slot_count:
+            for index in range(slot_count):
+                self.sums[index] = 0
+                self.counts[index] = 0
+            self.total = 0.0
+            self.count = 0
+        else:
+            for cleared in range(last_slot + 1, slot + 1):
+                index = cleared % slot_count
+                self.total -= self.sums[index]
+                self.count -= self.counts[index]
+                self.sums[index] = 0
+                self.counts[index] = 0
+            if not self.count:
+                # avoids drift of the running sum
+                self.total = 0.0
+
+        oldest = slot - slot_count
+        for extremes in (self.minimums, self.maximums):
+            while extremes and extremes[0][0] <= oldest:
+                extremes.popleft()
+        return slot
+
+    def add(self, value: float, now: float) -> None:
+        """Add a sample."""
+        slot = self.expire(now)
+        index = slot % len(self.sums)
+        self.sums[index] += value
+        self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+        minimums = self.minimums
+        while minimums and minimums[-1][1] >= value:
+            minimums.pop()
+        if not minimums or minimums[-1][0] != slot:
+            minimums.append((slot, value))
+
+        maximums = self.maximums
+        while maximums and maximums[-1][1] <= value:
+            maximums.pop()
+        if not maximums or maximums[-1][0] != slot:
+            maximums.append((slot, value))
+
+    @property
+    def min(self) -> float | None:
+        """Return the lowest sample."""
+        return self.minimums[0][1] if self.minimums else None
+
+    @property
+    def max(self) -> float | None:
+        """Return the highest sample."""
+        return self.maximums[0][1] if self.maximums else None
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the samples."""
+        return self.total / self.count if self.count else None
+
+
+class RollingStatistics:
+    """Define the rolling windows of the measurements of the charge points.
+
+    The windows of a measurement are created when its first value is
+    received. Every received value is a sample, also when it did not change.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[str] = STATISTIC_KEYS,
+        windows: Iterable[int] = WINDOWS,
+    ) -> None:
+        """Initialize the statistics."""
+        self.keys = frozenset(keys)
+        self.windows = tuple(windows)
+        self.charge_points: dict[str, dict[str, dict[int, RollingWindow]]] = {}
+
+    def update(self, evse_id: str, data: dict[str, Any]) -> None:
+        """Add the measurements in the data of a charge point."""
+        now = monotonic()
+        charge_point = self.charge_points.get(evse_id)
+        for key in self.keys.intersection(data):
+            value = data[key]
+            if not isinstance(value, int | float) or isinstance(value, bool):
+                continue
+            if charge_point is None:
+                charge_point = self.charge_points[evse_id] = {}
+            if (windows := charge_point.get(key)) is None:
+                windows = charge_point[key] = {
+                    minutes: RollingWindow(minutes * 60) for minutes in self.windows
+                }
+            for window in windows.values():
+                window.add(value, now)
+
+    def get(self, evse_id: str, key: str, minutes: int) -> RollingWindow | None:
+        """Return the window of a measurement, None if no value was received."""
+        if (windows := self.charge_points.get(evse_id, {}).get(key)) is None:
+            return None
+        window = windows[minutes]
+        window.expire(monotonic())
+        return window
+
+    def remove(self, evse_id: str) -> None:
+        """Remove the windows of a removed charge point."""
+        self.charge_points.pop(evse_id, None)
@@ -1,6 +1,10 @@
 """Support for Blue Current sensors."""
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
@@ -9,23 +13,102 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    EntityCategory,
+    Platform,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
     UnitOfPower,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import Connector
-from .const import DOMAIN
-from .entity import BlueCurrentEntity
+from .balancer import ALLOCATED_CURRENT
+from .charge_point import ChargePointState
+from .const import DOMAIN, ConnectionState
+from .entity import (
+    BlueCurrentEntity,
+    ChargePointEntityFactory,
+    GridEntity,
+    async_create_charge_point_entities,
+)
+from .rolling import STATISTIC_KEYS, WINDOWS
+from .sessions import LAST_SESSION, ChargeSession
 
 TIMESTAMP_KEYS = ("start_datetime", "stop_datetime", "offline_since")
 
-SENSORS = (
-    SensorEntityDescription(
+
+@dataclass
+class BlueCurrentSensorEntityDescription(SensorEntityDescription):
+    """Describes Blue Current sensor entity."""
+
+    deadband: float | None = None
+
+
+@dataclass
+class BlueCurrentMetricSensorEntityDescriptionMixin:
+    """Mixin for the metric value functions."""
+
+    value_fn: Callable[[Connector], Any]
+
+
+@dataclass
+class BlueCurrentMetricSensorEntityDescription(
+    SensorEntityDescription, BlueCurrentMetricSensorEntityDescriptionMixin
+):
+    """Describes Blue Current metric sensor entity."""
+
+    attributes_fn: Callable[[Connector], dict[str, Any]] | None = None
+
+
+@dataclass
+class BlueCurrentSessionSensorEntityDescriptionMixin:
+    """Mixin for the session value functions."""
+
+    value_fn: Callable[[ChargeSession], Any]
+
+
+@dataclass
+class BlueCurrentSessionSensorEntityDescription(
+    SensorEntityDescription, BlueCurrentSessionSensorEntityDescriptionMixin
+):
+    """Describes Blue Current last session sensor entity."""
+
+
+@dataclass
+class BlueCurrentStatisticSensorEntityDescriptionMixin:
+    """Mixin for the measurement and window of a statistic."""
+
+    statistic_key: str
+    minutes: int
+
+
+@dataclass
+class BlueCurrentStatisticSensorEntityDescription(
+    SensorEntityDescription, BlueCurrentStatisticSensorEntityDescriptionMixin
+):
+    """Describes Blue Current rolling statistic sensor entity."""
+
+
+def is_within_deadband(
+    description: BlueCurrentSensorEntityDescription, old_value: Any, new_value: Any
+) -> bool:
+    """Return True if the new value differs less than the deadband from the old value."""
+    return (
+        description.deadband is not None
+        and isinstance(old_value, int | float)
+        and isinstance(new_value, int | float)
+        and abs(new_value - old_value) < description.deadband
+    )
+
+
+SENSORS: tuple[BlueCurrentSensorEntityDescription, ...] = (
+    BlueCurrentSensorEntityDescription(
         key="actual_v1",
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
@@ -33,8 +116,9 @@ SENSORS = (
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
+        deadband=0.5,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="actual_v2",
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
@@ -42,8 +126,9 @@ SENSORS = (
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
+        deadband=0.5,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="actual_v3",
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
@@ -51,16 +136,18 @@ SENSORS = (
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
+        deadband=0.5,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="avg_voltage",
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         name="Average Voltage",
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
+        deadband=0.5,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="actual_p1",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
@@ -68,8 +155,9 @@ SENSORS = (
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
+        deadband=0.1,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="actual_p2",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
@@ -77,8 +165,9 @@ SENSORS = (
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
+        deadband=0.1,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="actual_p3",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
@@ -86,16 +175,18 @@ SENSORS = (
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
+        deadband=0.1,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="avg_current",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
         name="Average Current",
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
+        deadband=0.1,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="total_kw",
         native_unit_of_measurement=UnitOfPower.KILO_WATT,
         device_class=SensorDeviceClass.POWER,
@@ -103,7 +194,7 @@ SENSORS = (
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="actual_kwh",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
@@ -111,32 +202,32 @@ SENSORS = (
         state_class=SensorStateClass.TOTAL_INCREASING,
         has_entity_name=True,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="start_datetime",
         device_class=SensorDeviceClass.TIMESTAMP,
         name="Started On",
         has_entity_name=True,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="stop_datetime",
         device_class=SensorDeviceClass.TIMESTAMP,
         name="Stopped On",
         has_entity_name=True,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="offline_since",
         device_class=SensorDeviceClass.TIMESTAMP,
         name="Offline Since",
         has_entity_name=True,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="total_cost",
         native_unit_of_measurement="EUR",
         device_class=SensorDeviceClass.MONETARY,
         name="Total Cost",
         has_entity_name=True,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="vehicle_status",
         name="Vehicle Status",
         icon="mdi:car",
@@ -145,7 +236,7 @@ SENSORS = (
         options=["standby", "vehicle_detected", "ready", "no_power", "vehicle_error"],
         translation_key="vehicle_status",
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="activity",
         name="Activity",
         icon="mdi:ev-station",
@@ -154,7 +245,7 @@ SENSORS = (
         options=["available", "charging", "unavailable", "error", "offline"],
         translation_key="activity",
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="max_usage",
         name="Max Usage",
         icon="mdi:gauge-full",
@@ -163,7 +254,7 @@ SENSORS = (
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="smartcharging_max_usage",
         name="Smart Charging Max Usage",
         icon="mdi:gauge-full",
@@ -173,7 +264,7 @@ SENSORS = (
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="max_offline",
         name="Offline Max Usage",
         icon="mdi:gauge-full",
@@ -183,7 +274,7 @@ SENSORS = (
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="current_left",
         name="Remaining current",
         icon="mdi:gauge",
@@ -195,52 +286,203 @@ SENSORS = (
     ),
 )
 
-GRID_SENSORS = (
-    SensorEntityDescription(
+GRID_SENSORS: tuple[BlueCurrentSensorEntityDescription, ...] = (
+    BlueCurrentSensorEntityDescription(
         key="grid_actual_p1",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
-        name="Grid Current Phase 1",
+        name="Current Phase 1",
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="grid_actual_p2",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
-        name="Grid Current Phase 2",
+        name="Current Phase 2",
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="grid_actual_p3",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
-        name="Grid Current Phase 3",
+        name="Current Phase 3",
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="grid_avg_current",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
-        name="Average Grid Current",
+        name="Average Current",
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
     ),
-    SensorEntityDescription(
+    BlueCurrentSensorEntityDescription(
         key="grid_max_current",
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
-        name="Max Grid Current",
+        name="Max Current",
         state_class=SensorStateClass.MEASUREMENT,
         has_entity_name=True,
     ),
 )
 
+SESSION_SENSORS: tuple[BlueCurrentSessionSensorEntityDescription, ...] = (
+    BlueCurrentSessionSensorEntityDescription(
+        key="last_session_energy",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        name="Last session energy",
+        icon="mdi:history",
+        has_entity_name=True,
+        value_fn=lambda session: session.energy,
+    ),
+    BlueCurrentSessionSensorEntityDescription(
+        key="last_session_duration",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        name="Last session duration",
+        has_entity_name=True,
+        value_fn=lambda session: session.duration,
+    ),
+    BlueCurrentSessionSensorEntityDescription(
+        key="last_session_cost",
+        native_unit_of_measurement="EUR",
+        device_class=SensorDeviceClass.MONETARY,
+        name="Last session cost",
+        has_entity_name=True,
+        value_fn=lambda session: session.cost,
+    ),
+    BlueCurrentSessionSensorEntityDescription(
+        key="last_session_peak_power",
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        device_class=SensorDeviceClass.POWER,
+        name="Last session peak power",
+        icon="mdi:flash-alert",
+        has_entity_name=True,
+        value_fn=lambda session: session.peak_kw,
+    ),
+)
+
+ALLOCATION_SENSOR = SensorEntityDescription(
+    key=ALLOCATED_CURRENT,
+    native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+    device_class=SensorDeviceClass.CURRENT,
+    name="Allocated current",
+    icon="mdi:scale-balance",
+    entity_registry_enabled_default=False,
+    has_entity_name=True,
+)
+
+STATISTIC_SENSORS: tuple[BlueCurrentStatisticSensorEntityDescription, ...] = tuple(
+    BlueCurrentStatisticSensorEntityDescription(
+        key=f"{sensor.key}_{minutes}m",
+        native_unit_of_measurement=sensor.native_unit_of_measurement,
+        device_class=sensor.device_class,
+        name=f"{sensor.name} {minutes} min",
+        icon="mdi:chart-bell-curve",
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        has_entity_name=True,
+        statistic_key=sensor.key,
+        minutes=minutes,
+    )
+    for sensor in SENSORS
+    if sensor.key in STATISTIC_KEYS
+    for minutes in WINDOWS
+)
+
+METRIC_SENSORS: tuple[BlueCurrentMetricSensorEntityDescription, ...] = (
+    BlueCurrentMetricSensorEntityDescription(
+        key="messages_received",
+        name="Messages received",
+        icon="mdi:message-arrow-left",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        has_entity_name=True,
+        value_fn=lambda connector: connector.frames_received.total(),
+        attributes_fn=lambda connector: dict(connector.frames_received),
+    ),
+    BlueCurrentMetricSensorEntityDescription(
+        key="average_handling_time",
+        name="Average handling time",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        has_entity_name=True,
+        value_fn=lambda connector: connector.metrics.average_handling_time,
+    ),
+    BlueCurrentMetricSensorEntityDescription(
+        key="p95_handling_time",
+        name="95th percentile handling time",
+        icon="mdi:timer-alert-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        has_entity_name=True,
+        value_fn=lambda connector: connector.metrics.p95_handling_time,
+    ),
+    BlueCurrentMetricSensorEntityDescription(
+        key="dispatches",
+        name="Dispatches",
+        icon="mdi:call-split",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        has_entity_name=True,
+        value_fn=lambda connector: connector.metrics.dispatches,
+    ),
+    BlueCurrentMetricSensorEntityDescription(
+        key="state_writes_per_second",
+        name="State writes per second",
+        icon="mdi:database-arrow-right",
+        native_unit_of_measurement="writes/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        has_entity_name=True,
+        value_fn=lambda connector: connector.metrics.state_writes_per_second,
+    ),
+    BlueCurrentMetricSensorEntityDescription(
+        key="reconnects",
+        name="Reconnects",
+        icon="mdi:connection",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        has_entity_name=True,
+        value_fn=lambda connector: connector.metrics.reconnects,
+    ),
+    BlueCurrentMetricSensorEntityDescription(
+        key="time_since_last_frame",
+        name="Time since last message",
+        icon="mdi:timer-sand",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        has_entity_name=True,
+        value_fn=lambda connector: connector.metrics.time_since_last_frame,
+    ),
+    BlueCurrentMetricSensorEntityDescription(
+        key="setup_duration",
+        name="Setup duration",
+        icon="mdi:timer-play-outline",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        has_entity_name=True,
+        value_fn=lambda connector: connector.metrics.setup_duration,
+    ),
+    BlueCurrentMetricSensorEntityDescription(
+        key="connection_state",
+        name="Connection state",
+        icon="mdi:lan-connect",
+        device_class=SensorDeviceClass.ENUM,
+        options=[state.value for state in ConnectionState],
+        has_entity_name=True,
+        translation_key="connection_state",
+        value_fn=lambda connector: connector.state.value,
+    ),
+)
+
 PARALLEL_UPDATES = 1
 
 
@@ -249,14 +491,34 @@ async def async_setup_entry(
 ) -> None:
     """Set up Blue Current sensors."""
     connector: Connector = hass.data[DOMAIN][entry.entry_id]
-    sensor_list: list[SensorEntity] = []
-    for evse_id in connector.charge_points:
-        for sensor in SENSORS:
-            sensor_list.append(ChargePointSensor(connector, sensor, evse_id))
+
+    @callback
+    def add_charge_points(evse_ids: list[str]) -> None:
+        """Add the sensors of new charge points."""
+        async_add_entities(
+            async_create_charge_point_entities(
+                connector, Platform.SENSOR, evse_ids, CHARGE_POINT_SENSORS
+            )
+        )
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{DOMAIN}_evse_added_{entry.entry_id}", add_charge_points
+        )
+    )
+
+    sensor_list: list[SensorEntity] = list(
+        async_create_charge_point_entities(
+            connector, Platform.SENSOR, connector.charge_points, CHARGE_POINT_SENSORS
+        )
+    )
 
     for grid_sensor in GRID_SENSORS:
         sensor_list.append(GridSensor(connector, grid_sensor))
 
+    for metric_sensor in METRIC_SENSORS:
+        sensor_list.append(MetricSensor(connector, metric_sensor, entry))
+
     async_add_entities(sensor_list)
 
 
@@ -265,16 +527,20 @@ class ChargePointSensor(BlueCurrentEntity, SensorEntity):
 
     _attr_should_poll = False
 
+    entity_description: BlueCurrentSensorEntityDescription
+
     def __init__(
         self,
         connector: Connector,
-        sensor: SensorEntityDescription,
         evse_id: str,
+        sensor: BlueCurrentSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(connector, evse_id)
 
         self.key = sensor.key
+        self.update_keys = (sensor.key,)
+        self.get_value = ChargePointState.getter(sensor.key)
         self.entity_description = sensor
         self._attr_unique_id = f"{sensor.key}_{evse_id}"
 
@@ -282,7 +548,7 @@ class ChargePointSensor(BlueCurrentEntity, SensorEntity):
     def update_from_latest_data(self) -> None:
         """Update the sensor from the latest data."""
 
-        new_value = self.connector.charge_points[self.evse_id].get(self.key)
+        new_value = self.get_value(self.connector.charge_points[self.evse_id])
 
         if new_value is not None:
             if self.key in TIMESTAMP_KEYS and not (
@@ -290,43 +556,158 @@ class ChargePointSensor(BlueCurrentEntity, SensorEntity):
             ):
                 return
             self._attr_available = True
-            self._attr_native_value = new_value
+            if not is_within_deadband(
+                self.entity_description, self._attr_native_value, new_value
+            ):
+                self._attr_native_value = new_value
 
         elif self.key not in TIMESTAMP_KEYS:
             self._attr_available = False
 
+    @property
+    def published_value(self) -> Any:
+        """Return the value that is compared to detect a state change."""
+        return self._attr_native_value
 
-class GridSensor(SensorEntity):
-    """Define a grid sensor."""
+
+class SessionSensor(BlueCurrentEntity, SensorEntity):
+    """Define a sensor with a value of the last charge session."""
 
     _attr_should_poll = False
 
+    entity_description: BlueCurrentSessionSensorEntityDescription
+
     def __init__(
         self,
         connector: Connector,
-        sensor: SensorEntityDescription,
+        evse_id: str,
+        sensor: BlueCurrentSessionSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
+        super().__init__(connector, evse_id)
 
-        self.key = sensor.key
+        self.update_keys = (LAST_SESSION,)
         self.entity_description = sensor
-        self._attr_unique_id = sensor.key
-        self.connector = connector
+        self._attr_unique_id = f"{sensor.key}_{evse_id}"
+        self._session: ChargeSession | None = None
+
+    @callback
+    def update_from_latest_data(self) -> None:
+        """Update the sensor from the last completed session."""
+        session = self.connector.sessions.last(self.evse_id)
+        self._session = session
+        if session is not None:
+            self._attr_native_value = self.entity_description.value_fn(session)
+            self._attr_extra_state_attributes = {
+                "start": session.start,
+                "stop": session.stop,
+            }
+
+    @property
+    def published_value(self) -> Any:
+        """Return the value that is compared to detect a state change."""
+        return self._session
+
+
+class AllocationSensor(BlueCurrentEntity, SensorEntity):
+    """Define a sensor with the current allocated by the load balancer."""
+
+    _attr_should_poll = False
+
+    def __init__(
+        self, connector: Connector, evse_id: str, sensor: SensorEntityDescription
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(connector, evse_id)
+
+        self.update_keys = (ALLOCATED_CURRENT,)
+        self.entity_description = sensor
+        self._attr_unique_id = f"{sensor.key}_{evse_id}"
+
+    @callback
+    def update_from_latest_data(self) -> None:
+        """Update the sensor from the latest allocation."""
+        self._attr_native_value = self.connector.balancer.allocations.get(self.evse_id)
+
+    @property
+    def published_value(self) -> Any:
+        """Return the value that is compared to detect a state change."""
+        return self._attr_native_value
+
+
+class StatisticSensor(BlueCurrentEntity, SensorEntity):
+    """Define a sensor with the mean of a measurement over a rolling window.
+
+    The min, max and number of samples are attributes. The sensor is updated
+    every 10 seconds instead of with every measurement.
+    """
+
+    _attr_should_poll = False
+
+    entity_description: BlueCurrentStatisticSensorEntityDescription
+
+    def __init__(
+        self,
+        connector: Connector,
+        evse_id: str,
+        sensor: BlueCurrentStatisticSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(connector, evse_id)
+
+        self.entity_description = sensor
+        self._attr_unique_id = f"{sensor.key}_{evse_id}"
+        self._attr_extra_state_attributes = {}
 
     async def async_added_to_hass(self) -> None:
         """Register callbacks."""
+        await super().async_added_to_hass()
 
         @callback
         def update() -> None:
             """Update the state."""
             self.update_from_latest_data()
-            self.async_write_ha_state()
+            self.async_write_ha_state_if_changed()
 
         self.async_on_remove(
-            async_dispatcher_connect(self.hass, f"{DOMAIN}_grid_update", update)
+            async_dispatcher_connect(
+                self.hass,
+                f"{DOMAIN}_statistics_update_{self.connector.config.entry_id}",
+                update,
+            )
         )
 
-        self.update_from_latest_data()
+    @callback
+    def update_from_latest_data(self) -> None:
+        """Update the sensor from the rolling window."""
+        window = self.connector.statistics.get(
+            self.evse_id,
+            self.entity_description.statistic_key,
+            self.entity_description.minutes,
+        )
+        if window is None or window.mean is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+        self._attr_native_value = round(window.mean, 2)
+        self._attr_extra_state_attributes = {
+            "min": window.min,
+            "max": window.max,
+            "samples": window.count,
+        }
+
+    @property
+    def published_value(self) -> Any:
+        """Return the value that is compared to detect a state change."""
+        return (self._attr_native_value, *self._attr_extra_state_attributes.values())
+
+
+class GridSensor(GridEntity, SensorEntity):
+    """Define a grid sensor."""
+
+    _attr_should_poll = False
+
+    entity_description: BlueCurrentSensorEntityDescription
 
     @callback
     def update_from_latest_data(self) -> None:
@@ -336,7 +717,80 @@ class GridSensor(SensorEntity):
 
         if new_value is not None:
             self._attr_available = True
-            self._attr_native_value = new_value
+            if not is_within_deadband(
+                self.entity_description, self._attr_native_value, new_value
+            ):
+                self._attr_native_value = new_value
 
         else:
             self._attr_available = False
+
+    @property
+    def published_value(self) -> Any:
+        """Return the value that is compared to detect a state change."""
+        return self._attr_native_value
+
+
+class MetricSensor(SensorEntity):
+    """Define a sensor with a runtime metric of the connection."""
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    entity_description: BlueCurrentMetricSensorEntityDescription
+
+    def __init__(
+        self,
+        connector: Connector,
+        sensor: BlueCurrentMetricSensorEntityDescription,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the sensor."""
+        self.connector = connector
+        self.entity_description = sensor
+        self._attr_unique_id = f"{sensor.key}_{entry.entry_id}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=f"Blue Current {entry.title}",
+            manufacturer="Blue Current",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Register callbacks."""
+
+        @callback
+        def update() -> None:
+            """Update the state."""
+            self.update_from_latest_data()
+            self.async_write_ha_state()
+
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{DOMAIN}_metrics_update_{self.connector.config.entry_id}",
+                update,
+            )
+        )
+
+        self.update_from_latest_data()
+
+    @callback
+    def update_from_latest_data(self) -> None:
+        """Update the metric sensor from the latest metrics."""
+        self._attr_native_value = self.entity_description.value_fn(self.connector)
+        if self.entity_description.attributes_fn is not None:
+            self._attr_extra_state_attributes = self.entity_description.attributes_fn(
+                self.connector
+            )
+
+
+# the classes and descriptions of the sensors of a charge point
+CHARGE_POINT_SENSORS: tuple[
+    tuple[ChargePointEntityFactory, SensorEntityDescription], ...
+] = (
+    *((ChargePointSensor, sensor) for sensor in SENSORS),
+    *((SessionSensor, sensor) for sensor in SESSION_SENSORS),
+    (AllocationSensor, ALLOCATION_SENSOR),
+    *((StatisticSensor, sensor) for sensor in STATISTIC_SENSORS),
+)
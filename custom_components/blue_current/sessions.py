@@ -0,0 +1,192 @@
+"""History of the charge sessions of the Blue Current charge points."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Collection
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .charge_point import ChargePointState
+from .const import ACTIVITY, CHARGING, DOMAIN
+
+STORAGE_VERSION = 1
+# seconds to wait before the sessions are written to storage
+SAVE_DELAY = 10
+# the number of completed sessions that are kept per charge point
+MAX_SESSIONS = 100
+# the key that is dispatched when a session is completed
+LAST_SESSION = "last_session"
+AVAILABLE = "available"
+START_DATETIME = "start_datetime"
+STOP_DATETIME = "stop_datetime"
+SESSION_KEYS = frozenset(
+    (ACTIVITY, START_DATETIME, STOP_DATETIME, "total_kw", "actual_kwh", "total_cost")
+)
+
+
+@dataclass
+class ChargeSession:
+    """Define a completed charge session."""
+
+    start: datetime
+    stop: datetime
+    energy: float
+    cost: float | None
+    peak_kw: float
+
+    @property
+    def duration(self) -> float:
+        """Return the duration of the session in seconds."""
+        return (self.stop - self.start).total_seconds()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the session as a dict that can be stored as JSON."""
+        return {
+            **asdict(self),
+            "start": self.start.isoformat(),
+            "stop": self.stop.isoformat(),
+            "duration": self.duration,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ChargeSession:
+        """Create a session from a stored dict."""
+        start = dt_util.parse_datetime(data["start"])
+        stop = dt_util.parse_datetime(data["stop"])
+        assert start is not None and stop is not None
+        return cls(start, stop, data["energy"], data["cost"], data["peak_kw"])
+
+
+@dataclass
+class ActiveSession:
+    """Define the values of a session that is in progress."""
+
+    start: datetime
+    energy: float = 0
+    cost: float | None = None
+    peak_kw: float = 0
+
+    def update(self, charge_point: ChargePointState) -> None:
+        """Update the session with the latest data of the charge point.
+
+        The energy and cost of a session only grow, so the largest values are
+        kept in case the charge point resets them when the session ends.
+        """
+        if (start := charge_point.start_datetime) is not None and start > self.start:
+            self.start = start
+        if (energy := charge_point.actual_kwh) is not None:
+            self.energy = max(self.energy, energy)
+        if (cost := charge_point.total_cost) is not None:
+            self.cost = cost if self.cost is None else max(self.cost, cost)
+        if (total_kw := charge_point.total_kw) is not None:
+            self.peak_kw = max(self.peak_kw, total_kw)
+
+
+class SessionTracker:
+    """Define a tracker of the charge sessions of an account.
+
+    A session starts when a charge point starts charging and ends when its
+    stop_datetime changes to a time after the start of the session or when
+    it becomes available again. Completed sessions are kept in a ring buffer
+    per charge point, which is written to storage.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, max_sessions: int = MAX_SESSIONS
+    ) -> None:
+        """Initialize the tracker."""
+        self.max_sessions = max_sessions
+        self.sessions: dict[str, deque[ChargeSession]] = {}
+        self.active: dict[str, ActiveSession] = {}
+        self.store: Store[dict[str, list[dict[str, Any]]]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.sessions"
+        )
+
+    async def async_load(self) -> None:
+        """Load the completed sessions from storage."""
+        if (data := await self.store.async_load()) is None:
+            return
+        self.sessions = {
+            evse_id: deque(
+                map(ChargeSession.from_dict, sessions), maxlen=self.max_sessions
+            )
+            for evse_id, sessions in data.items()
+        }
+
+    @callback
+    def _data_to_save(self) -> dict[str, list[dict[str, Any]]]:
+        """Return the completed sessions as JSON."""
+        return {
+            evse_id: [session.as_dict() for session in sessions]
+            for evse_id, sessions in self.sessions.items()
+        }
+
+    @callback
+    def update(
+        self,
+        evse_id: str,
+        charge_point: ChargePointState,
+        changed_keys: Collection[str],
+    ) -> ChargeSession | None:
+        """Update the session of a charge point, return a completed session."""
+        if SESSION_KEYS.isdisjoint(changed_keys):
+            return None
+
+        active = self.active.get(evse_id)
+        if active is None:
+            if charge_point.activity == CHARGING:
+                active = self.active[evse_id] = ActiveSession(
+                    charge_point.start_datetime or dt_util.utcnow()
+                )
+                active.update(charge_point)
+            return None
+
+        active.update(charge_point)
+        stop = charge_point.stop_datetime
+        stopped = (
+            STOP_DATETIME in changed_keys and stop is not None and stop > active.start
+        )
+        if not stopped and charge_point.activity != AVAILABLE:
+            return None
+
+        del self.active[evse_id]
+        session = ChargeSession(
+            active.start,
+            stop if stopped else dt_util.utcnow(),
+            active.energy,
+            active.cost,
+            active.peak_kw,
+        )
+        self.sessions.setdefault(evse_id, deque(maxlen=self.max_sessions)).append(
+            session
+        )
+        self.store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return session
+
+    @callback
+    def remove(self, evse_id: str) -> None:
+        """Remove the sessions of a removed charge point."""
+        self.active.pop(evse_id, None)
+        if self.sessions.pop(evse_id, None) is not None:
+            self.store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def last(self, evse_id: str) -> ChargeSession | None:
+        """Return the last completed session of a charge point."""
+        if sessions := self.sessions.get(evse_id):
+            return sessions[-1]
+        return None
+
+    def get_sessions(
+        self, evse_id: str, limit: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Return the completed sessions of a charge point, the newest first."""
+        sessions = reversed(self.sessions.get(evse_id, ()))
+        return [
+            session.as_dict()
+            for _, session in zip(range(limit or self.max_sessions), sessions)
+        ]
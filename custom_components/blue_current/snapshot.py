@@ -0,0 +1,71 @@
+"""Snapshot of the latest data of the Blue Current charge points."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .charge_point import ChargePointState
+
+STORAGE_VERSION = 1
+CHARGE_POINTS = "charge_points"
+GRID = "grid"
+# these values are stored as ISO strings and parsed when the snapshot is loaded
+TIMESTAMP_KEYS = ("start_datetime", "stop_datetime", "offline_since")
+
+
+def parse_timestamps(data: dict[str, Any]) -> dict[str, Any]:
+    """Parse the timestamps of stored charge point data."""
+    for key in TIMESTAMP_KEYS:
+        if isinstance(value := data.get(key), str):
+            data[key] = dt_util.parse_datetime(value)
+    return data
+
+
+class Snapshot:
+    """Define a store with the latest data of the charge points and the grid.
+
+    Only the keys with a value are stored, so the snapshot of a charge point
+    is about as large as its CH_STATUS and CH_SETTINGS data.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the snapshot."""
+        self.store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, key)
+
+    async def async_load(
+        self,
+    ) -> tuple[dict[str, ChargePointState], dict[str, Any]] | None:
+        """Load the charge points and the grid, return None if there is no snapshot."""
+        if (data := await self.store.async_load()) is None:
+            return None
+        charge_points = {
+            evse_id: ChargePointState.from_dict(parse_timestamps(values))
+            for evse_id, values in data[CHARGE_POINTS].items()
+        }
+        return charge_points, data[GRID]
+
+    @callback
+    def async_schedule_save(self, data_func: Callable[[], dict[str, Any]]) -> None:
+        """Write the data of data_func in the background."""
+        self.store.async_delay_save(data_func)
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        """Write the data."""
+        await self.store.async_save(data)
+
+
+def create_snapshot_data(
+    charge_points: dict[str, ChargePointState], grid: dict[str, Any]
+) -> dict[str, Any]:
+    """Return the stored data of the charge points and the grid."""
+    return {
+        CHARGE_POINTS: {
+            evse_id: charge_point.as_dict()
+            for evse_id, charge_point in charge_points.items()
+        },
+        GRID: grid,
+    }
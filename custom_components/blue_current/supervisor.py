@@ -0,0 +1,256 @@
+"""Supervisor of the Blue Current connectors of all config entries."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry,
+    entity_registry,
+)
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+
+from .const import (
+    DOMAIN,
+    EVSE_ID,
+    GRID_PREFIX,
+    LOGGER,
+    REBOOT,
+    RESET,
+    START_SESSION,
+    STOP_SESSION,
+)
+from .pending import ERROR, SUCCESS
+
+if TYPE_CHECKING:
+    from . import Connector
+
+SUPERVISOR = f"{DOMAIN}_supervisor"
+SERVICES = (RESET, REBOOT, START_SESSION, STOP_SESSION)
+SEND_COMMAND = "send_command"
+COMMAND = "command"
+EVSE_IDS = "evse_ids"
+RESULTS = "results"
+# the max number of commands of a send_command call that wait for their result
+BULK_CONCURRENCY = 10
+
+SERVICE_SCHEMA = vol.Schema({vol.Required(EVSE_ID): cv.string})
+SEND_COMMAND_SCHEMA = vol.Schema(
+    {
+        vol.Required(COMMAND): vol.In(SERVICES),
+        vol.Optional(EVSE_IDS): vol.All(cv.ensure_list, [cv.string]),
+        **cv.ENTITY_SERVICE_FIELDS,
+    }
+)
+GET_SESSIONS = "get_sessions"
+LIMIT = "limit"
+SESSIONS = "sessions"
+
+GET_SESSIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(EVSE_ID): cv.string,
+        vol.Optional(LIMIT): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+# the max number of requests that the connectors of all accounts send in parallel
+MAX_PARALLEL_REQUESTS = 50
+# the min number of seconds between the reconnects of different accounts
+RECONNECT_SPACING = 2
+
+
+@callback
+def async_get_supervisor(hass: HomeAssistant) -> Supervisor:
+    """Return the supervisor, create it if it doesn't exist."""
+    if (supervisor := hass.data.get(SUPERVISOR)) is None:
+        supervisor = hass.data[SUPERVISOR] = Supervisor(hass)
+    return supervisor
+
+
+class Supervisor:
+    """Define a class that owns the connectors of all Blue Current accounts.
+
+    The connectors are stored in hass.data[DOMAIN] by config entry id.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.connectors: dict[str, Connector] = hass.data.setdefault(DOMAIN, {})
+        self.evse_index: dict[str, Connector] = {}
+        self.loop_tasks: dict[str, asyncio.Task] = {}
+        self.reconnect_slots: dict[str, float] = {}
+        self.request_semaphore = asyncio.Semaphore(MAX_PARALLEL_REQUESTS)
+
+    @callback
+    def async_add_connector(self, connector: Connector) -> None:
+        """Add the connector of a config entry."""
+        self.connectors[connector.config.entry_id] = connector
+
+    @callback
+    def async_remove_connector(self, entry_id: str) -> Connector:
+        """Remove the connector of a config entry and stop its receive loop."""
+        connector = self.connectors.pop(entry_id)
+        self.reconnect_slots.pop(entry_id, None)
+        if (task := self.loop_tasks.pop(entry_id, None)) is not None:
+            task.cancel()
+        self.evse_index = {
+            evse_id: owner
+            for evse_id, owner in self.evse_index.items()
+            if owner is not connector
+        }
+        return connector
+
+    @callback
+    def async_start_loop(self, connector: Connector) -> None:
+        """Start the receive loop of a connector in the background."""
+        entry_id = connector.config.entry_id
+        self.loop_tasks[entry_id] = self.hass.async_create_background_task(
+            connector.start_loop(), f"{DOMAIN} receive loop {entry_id}"
+        )
+
+    def get_connector(self, evse_id: str) -> Connector:
+        """Return the connector of the account that owns a charge point.
+
+        The index is rebuilt when a charge point is not found in it, so
+        charge points that moved between accounts are found as well.
+        """
+        connector = self.evse_index.get(evse_id)
+        if connector is None or evse_id not in connector.charge_points:
+            self.evse_index = {
+                charge_point_id: owner
+                for owner in self.connectors.values()
+                for charge_point_id in owner.charge_points
+            }
+            connector = self.evse_index.get(evse_id)
+
+        if connector is None:
+            raise HomeAssistantError(f"Charge point {evse_id} was not found")
+        return connector
+
+    @callback
+    def schedule_reconnect(
+        self,
+        entry_id: str,
+        action: Callable[[datetime], Awaitable[None] | None],
+        delay: float,
+    ) -> CALLBACK_TYPE:
+        """Schedule the reconnect of an account.
+
+        The reconnect is moved back when it is within RECONNECT_SPACING
+        seconds of the reconnect of another account.
+        """
+        now = self.hass.loop.time()
+        reconnect_at = now + delay
+        for slot in sorted(
+            slot
+            for other_entry_id, slot in self.reconnect_slots.items()
+            if other_entry_id != entry_id and slot > now
+        ):
+            if abs(slot - reconnect_at) < RECONNECT_SPACING:
+                reconnect_at = slot + RECONNECT_SPACING
+
+        self.reconnect_slots[entry_id] = reconnect_at
+        return async_call_later(self.hass, reconnect_at - now, action)
+
+    def async_get_evse_ids(self, call: ServiceCall) -> list[str]:
+        """Return the charge points of the evse_ids, devices, areas and entities of a call."""
+        evse_ids = list(call.data.get(EVSE_IDS, []))
+
+        selected = async_extract_referenced_entity_ids(self.hass, call)
+        devices = device_registry.async_get(self.hass)
+        entities = entity_registry.async_get(self.hass)
+        device_ids = set(selected.referenced_devices)
+        for entity_id in selected.referenced:
+            if (entry := entities.async_get(entity_id)) and entry.device_id:
+                device_ids.add(entry.device_id)
+
+        for device_id in device_ids:
+            device = devices.async_get(device_id)
+            if device is None or device.entry_type is not None:
+                continue
+            # the grid device is not a charge point
+            evse_ids.extend(
+                identifier
+                for domain, identifier in device.identifiers
+                if domain == DOMAIN and not identifier.startswith(GRID_PREFIX)
+            )
+
+        return list(dict.fromkeys(evse_ids))
+
+    async def async_send_command(self, call: ServiceCall) -> ServiceResponse:
+        """Send a command to a list of charge points and return the results.
+
+        At most BULK_CONCURRENCY commands are waiting for their result at the
+        same time.
+        """
+        command: str = call.data[COMMAND]
+        semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+
+        async def send(evse_id: str) -> dict[str, Any]:
+            async with semaphore:
+                try:
+                    connector = self.get_connector(evse_id)
+                except HomeAssistantError as err:
+                    return {SUCCESS: False, ERROR: str(err)}
+                return await connector.async_call_service(command, evse_id)
+
+        evse_ids = self.async_get_evse_ids(call)
+        results = await asyncio.gather(*(send(evse_id) for evse_id in evse_ids))
+        return {RESULTS: dict(zip(evse_ids, results))}
+
+    @callback
+    def async_get_sessions(self, call: ServiceCall) -> ServiceResponse:
+        """Return the completed charge sessions of a charge point."""
+        evse_id: str = call.data[EVSE_ID]
+        connector = self.get_connector(evse_id)
+        return {
+            SESSIONS: connector.sessions.get_sessions(evse_id, call.data.get(LIMIT))
+        }
+
+    @callback
+    def async_register_services(self) -> None:
+        """Register the services that are routed to the owning connector."""
+
+        async def handle_service(call: ServiceCall) -> None:
+            evse_id = call.data[EVSE_ID]
+            connector = self.get_connector(evse_id)
+            result = await connector.async_call_service(call.service, evse_id)
+            if not result[SUCCESS]:
+                raise HomeAssistantError(
+                    f"{call.service} of {evse_id} failed: {result[ERROR]}"
+                )
+
+        for service in SERVICES:
+            self.hass.services.async_register(
+                DOMAIN, service, handle_service, schema=SERVICE_SCHEMA
+            )
+
+        self.hass.services.async_register(
+            DOMAIN,
+            SEND_COMMAND,
+            self.async_send_command,
+            schema=SEND_COMMAND_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+        self.hass.services.async_register(
+            DOMAIN,
+            GET_SESSIONS,
+            self.async_get_sessions,
+            schema=GET_SESSIONS_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+        LOGGER.debug("Registered the %s services", DOMAIN)
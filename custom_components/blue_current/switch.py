@@ -1,26 +1,43 @@
 """Support for Blue Current switches."""
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
 from typing import Any
 
 from bluecurrent_api import Client
+from bluecurrent_api.exceptions import BlueCurrentException
 from homeassistant.components.switch import (
     SwitchDeviceClass,
     SwitchEntity,
     SwitchEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import Platform
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 
 from . import Connector
+from .charge_point import ChargePointState
 from .const import ACTIVITY, DOMAIN, LOGGER
-from .entity import BlueCurrentEntity
+from .entity import (
+    BlueCurrentEntity,
+    ChargePointEntityFactory,
+    async_create_charge_point_entities,
+)
+from .pending import ERROR, SUCCESS
 
 AVAILABLE = "available"
 BLOCK = "block"
+# seconds in which toggles are merged into one command
+COALESCE_DELAY = 1
+# seconds a new value is shown before it is rolled back when it isn't confirmed
+PENDING_TIMEOUT = 15
 
 
 @dataclass
@@ -36,6 +53,9 @@ class BlueCurrentSwitchEntityDescription(
 ):
     """Describes Blue Current switch entity."""
 
+    # the websocket acknowledges the change with the new value
+    acknowledged: bool = True
+
 
 SWITCHES: tuple[BlueCurrentSwitchEntityDescription, ...] = (
     BlueCurrentSwitchEntityDescription(
@@ -65,6 +85,7 @@ SWITCHES: tuple[BlueCurrentSwitchEntityDescription, ...] = (
         icon="mdi:lock",
         function=lambda client, evse_id, value: client.block(evse_id, value),
         has_entity_name=True,
+        acknowledged=False,
     ),
 )
 
@@ -75,18 +96,26 @@ async def async_setup_entry(
     """Set up Blue Current switches."""
     connector: Connector = hass.data[DOMAIN][entry.entry_id]
 
-    switch_list = []
-    for evse_id in connector.charge_points:
-        for switch in SWITCHES:
-            switch_list.append(
-                ChargePointSwitch(
-                    connector,
-                    evse_id,
-                    switch,
-                )
+    @callback
+    def add_charge_points(evse_ids: list[str]) -> None:
+        """Add the switches of new charge points."""
+        async_add_entities(
+            async_create_charge_point_entities(
+                connector, Platform.SWITCH, evse_ids, CHARGE_POINT_SWITCHES
             )
+        )
 
-    async_add_entities(switch_list)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{DOMAIN}_evse_added_{entry.entry_id}", add_charge_points
+        )
+    )
+
+    async_add_entities(
+        async_create_charge_point_entities(
+            connector, Platform.SWITCH, connector.charge_points, CHARGE_POINT_SWITCHES
+        )
+    )
 
 
 class ChargePointSwitch(BlueCurrentEntity, SwitchEntity):
@@ -106,39 +135,165 @@ class ChargePointSwitch(BlueCurrentEntity, SwitchEntity):
         super().__init__(connector, evse_id)
 
         self.key = switch.key
+        self.update_keys = (switch.key, ACTIVITY)
+        self.get_value = ChargePointState.getter(switch.key)
         self.entity_description = switch
         self._attr_unique_id = f"{switch.key}_{evse_id}"
+        self._pending: bool | None = None
+        self._cancel_deadline: CALLBACK_TYPE | None = None
+        self._command: asyncio.Task | None = None
+
+    async def call_function(self, value: bool) -> bool:
+        """Call the function to set setting, return if it succeeded.
+
+        An acknowledged setting succeeds when the websocket sends the new
+        value, other settings succeed when the request is sent.
+        """
+        send = partial(
+            self.entity_description.function, self.connector.client, self.evse_id, value
+        )
+        if not self.entity_description.acknowledged:
+            try:
+                await send()
+            except BlueCurrentException as err:
+                LOGGER.warning(
+                    "Changing %s of %s failed: %s", self.key, self.evse_id, err
+                )
+                return False
+            return True
 
-    async def call_function(self, value: bool) -> None:
-        """Call the function to set setting."""
-        try:
-            await self.entity_description.function(
-                self.connector.client, self.evse_id, value
+        result = await self.connector.async_change_setting(
+            self.key, self.evse_id, value, send
+        )
+        if not result[SUCCESS]:
+            LOGGER.warning(
+                "Changing %s of %s failed: %s", self.key, self.evse_id, result[ERROR]
             )
-        except ConnectionError:
-            LOGGER.error("No connection")
+        return result[SUCCESS]
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
-        await self.call_function(True)
-        self._attr_is_on = True
-        self.async_write_ha_state()
+        self.async_set_pending(True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
-        """Turn the entity on."""
-        await self.call_function(False)
-        self._attr_is_on = False
-        self.async_write_ha_state()
+        """Turn the entity off."""
+        self.async_set_pending(False)
+
+    @callback
+    def async_set_pending(self, value: bool) -> None:
+        """Show a new value until it is confirmed, rolled back or expired.
+
+        The command is sent after COALESCE_DELAY, so toggles within that time
+        are merged into one command with the last value.
+        """
+        self._pending = value
+        self._attr_is_on = value
+        self.async_write_ha_state_if_changed()
+
+        if self._cancel_deadline is not None:
+            self._cancel_deadline()
+        self._cancel_deadline = async_call_later(
+            self.hass, PENDING_TIMEOUT, self._async_pending_expired
+        )
+
+        if self._command is None or self._command.done():
+            self._command = self.hass.async_create_task(self._async_send_pending())
+
+    async def _async_send_pending(self) -> None:
+        """Send the pending value until it doesn't change while it is sent."""
+        await asyncio.sleep(COALESCE_DELAY)
+
+        sent: bool | None = None
+        while self._pending is not None and self._pending != sent:
+            value = self._pending
+            charge_point = self.connector.charge_points.get(self.evse_id)
+            if charge_point is None or (
+                # toggled back to the current value
+                sent is None and self.get_value(charge_point) == value
+            ):
+                self._async_end_pending()
+                return
+
+            sent = value
+            success = await self.call_function(value)
+            if self._pending != value:
+                continue
+            charge_point = self.connector.charge_points.get(self.evse_id)
+            if (
+                charge_point is None
+                or not success
+                or self.entity_description.acknowledged
+                or self.get_value(charge_point) == value
+            ):
+                self._async_end_pending()
+            # other settings are confirmed by the charge point data
+
+    @callback
+    def _async_pending_expired(self, _now: datetime) -> None:
+        """Roll back a value that wasn't confirmed in time."""
+        self._cancel_deadline = None
+        if self._pending is not None:
+            LOGGER.warning(
+                "Changing %s of %s was not confirmed in time", self.key, self.evse_id
+            )
+            self._async_end_pending()
+
+    @callback
+    def _async_end_pending(self) -> None:
+        """Stop showing the pending value and show the charge point data.
+
+        The pending value is abandoned if the charge point was removed.
+        """
+        self._pending = None
+        if self._cancel_deadline is not None:
+            self._cancel_deadline()
+            self._cancel_deadline = None
+        if self.evse_id not in self.connector.charge_points:
+            return
+        self.update_from_latest_data()
+        self.async_write_ha_state_if_changed()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the pending value."""
+        if self._cancel_deadline is not None:
+            self._cancel_deadline()
+        if self._command is not None:
+            self._command.cancel()
 
     @callback
     def update_from_latest_data(self) -> None:
-        """Fetch new state data for the switch."""
-        new_value = self.connector.charge_points[self.evse_id].get(self.key)
-        activity = self.connector.charge_points[self.evse_id].get(ACTIVITY)
+        """Fetch new state data for the switch.
+
+        A pending value is shown until the data confirms it.
+        """
+        if (charge_point := self.connector.charge_points.get(self.evse_id)) is None:
+            return
+        new_value = self.get_value(charge_point)
+        activity = charge_point.activity
 
         if new_value is not None and (activity == AVAILABLE or self.key == BLOCK):
-            self._attr_is_on = new_value = new_value
             self._attr_available = True
+            if self._pending is None:
+                self._attr_is_on = new_value
+            elif new_value == self._pending and (
+                self._command is None or self._command.done()
+            ):
+                self._pending = None
+                if self._cancel_deadline is not None:
+                    self._cancel_deadline()
+                    self._cancel_deadline = None
+                self._attr_is_on = new_value
 
         else:
             self._attr_available = False
+
+    @property
+    def published_value(self) -> Any:
+        """Return the value that is compared to detect a state change."""
+        return self._attr_is_on
+
+
+# the classes and descriptions of the switches of a charge point
+CHARGE_POINT_SWITCHES: tuple[
+    tuple[ChargePointEntityFactory, BlueCurrentSwitchEntityDescription], ...
+] = tuple((ChargePointSwitch, description) for description in SWITCHES)
@@ -10,6 +10,7 @@ from homeassistant.helpers.dispatcher import async_dispatcher_send
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.blue_current import DOMAIN, Connector
+from custom_components.blue_current.charge_point import ChargePointState
 
 
 async def init_integration(
@@ -20,16 +21,20 @@ async def init_integration(
     if grid is None:
         grid = {}
 
+    connector_init = Connector.__init__
+
     def init(
         self: Connector, hass: HomeAssistant, config: ConfigEntry, client: Client
     ) -> None:
         """Mock grid and charge_points."""
 
-        self.config = config
-        self.hass = hass
-        self.client = client
-        self.charge_points = data
+        connector_init(self, hass, config, client)
+        self.charge_points = {
+            evse_id: ChargePointState.from_dict(values)
+            for evse_id, values in data.items()
+        }
         self.grid = grid
+        self.async_set_ready()
 
     with patch("custom_components.blue_current.PLATFORMS", [platform]), patch.object(
         Connector, "__init__", init
@@ -46,3 +51,20 @@ async def init_integration(
         await hass.async_block_till_done()
         async_dispatcher_send(hass, "blue_current_value_update_101")
     return config_entry
+
+
+def acknowledge_services(hass: HomeAssistant, connector: Connector) -> None:
+    """Let the mocked client of a connector acknowledge the services."""
+    objects = {
+        "reset": "SOFT_RESET",
+        "reboot": "REBOOT",
+        "start_session": "START_SESSION",
+        "stop_session": "STOP_SESSION",
+    }
+    for service, object_name in objects.items():
+
+        async def acknowledge(evse_id: str, *args, object_name=object_name) -> None:
+            message = {"object": object_name, "evse_id": evse_id, "success": True}
+            await connector.on_data(message)
+
+        getattr(connector.client, service).side_effect = acknowledge
@@ -0,0 +1,261 @@
+"""A local websocket server that behaves like the Blue Current websocket API."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import json
+from typing import Any
+
+from websockets.asyncio.server import Server, ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
+
+RATE_LIMIT_CLOSE_CODE = 4001
+RATE_LIMIT_ERROR = 42
+SETTINGS = {
+    "SET_PLUG_AND_CHARGE": "plug_and_charge",
+    "SET_PUBLIC_CHARGING": "public_charging",
+}
+SERVICES = ("SOFT_RESET", "REBOOT", "START_SESSION", "STOP_SESSION")
+
+
+def create_status(
+    evse_id: str, activity: str = "available", current: float = 8
+) -> dict[str, Any]:
+    """Return a CH_STATUS message like the API sends it."""
+    return {
+        "object": "CH_STATUS",
+        "evse_id": evse_id,
+        "data": {
+            "evse_id": evse_id,
+            "actual_v1": 230,
+            "actual_v2": 231,
+            "actual_v3": 229,
+            "actual_p1": current,
+            "actual_p2": current,
+            "actual_p3": current,
+            "actual_kwh": 10,
+            "max_usage": 16,
+            "smartcharging_max_usage": 16,
+            "max_offline": 6,
+            "total_cost": 1.5,
+            "vehicle_status": "A",
+            "activity": activity,
+            "start_datetime": "",
+            "stop_datetime": "",
+            "offline_since": "",
+        },
+    }
+
+
+def create_settings(
+    evse_id: str, plug_and_charge: bool = False, public_charging: bool = True
+) -> dict[str, Any]:
+    """Return a CH_SETTINGS message like the API sends it."""
+    return {
+        "object": "CH_SETTINGS",
+        "data": {
+            "evse_id": evse_id,
+            "plug_and_charge": {"value": plug_and_charge, "permission": "write"},
+            "public_charging": {"value": public_charging, "permission": "write"},
+            "smart_charging": False,
+        },
+    }
+
+
+@dataclass
+class Scenario:
+    """Define how the fake server behaves.
+
+    A message_rate of 0 pushes the status frames as fast as possible.
+    """
+
+    # status frames that are pushed to every connection after HELLO
+    message_count: int = 0
+    message_rate: float = 0
+    # close a connection after it pushed this many status frames
+    disconnect_after: int | None = None
+    disconnect_code: int = 1011
+    # reply to requests with a request limit error after this many requests
+    request_limit: int | None = None
+    # answer setting changes with the old value
+    reject_settings: bool = False
+    # don't answer setting changes and services at all
+    silent: bool = False
+    # the error of failed services, services succeed when it is None
+    service_error: str | None = None
+
+
+class FakeServer:
+    """Define a websocket server on localhost with a fleet of charge points.
+
+    The server answers the requests of the integration, pushes status frames
+    and drops connections or limits requests as the scenario describes.
+    """
+
+    def __init__(self, evse_ids: list[str], scenario: Scenario | None = None) -> None:
+        """Initialize the server."""
+        self.evse_ids = evse_ids
+        self.scenario = scenario or Scenario()
+        self.connections: set[ServerConnection] = set()
+        self.requests: list[str] = []
+        self.frames_pushed = 0
+        self.server: Server | None = None
+        self.activities = dict.fromkeys(evse_ids, "available")
+        self.settings = {
+            evse_id: {"plug_and_charge": False, "public_charging": True}
+            for evse_id in evse_ids
+        }
+
+    @property
+    def url(self) -> str:
+        """Return the url of the server."""
+        assert self.server is not None
+        host, port = next(iter(self.server.sockets)).getsockname()[:2]
+        return f"ws://{host}:{port}"
+
+    async def start(self) -> None:
+        """Start the server on a free port."""
+        self.server = await serve(self.handler, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        """Close all connections and stop the server."""
+        assert self.server is not None
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def drop_connections(self, code: int = 1011) -> None:
+        """Close the open connections with a code."""
+        await asyncio.gather(
+            *(connection.close(code) for connection in list(self.connections))
+        )
+
+    async def push(self, message: dict[str, Any]) -> None:
+        """Send a message to all open connections."""
+        raw = json.dumps(message)
+        await asyncio.gather(
+            *(connection.send(raw) for connection in list(self.connections)),
+            return_exceptions=True,
+        )
+
+    async def handler(self, connection: ServerConnection) -> None:
+        """Answer the requests of a connection."""
+        self.connections.add(connection)
+        stream: asyncio.Task | None = None
+        requests = 0
+        try:
+            async for raw in connection:
+                request: dict[str, Any] = json.loads(raw)
+                command: str = request["command"]
+                self.requests.append(command)
+                requests += 1
+                if (
+                    self.scenario.request_limit is not None
+                    and requests > self.scenario.request_limit
+                ):
+                    responses = [
+                        {
+                            "object": "ERROR",
+                            "error": RATE_LIMIT_ERROR,
+                            "message": "Request limit reached",
+                        }
+                    ]
+                else:
+                    responses = self.get_responses(command, request)
+                for response in responses:
+                    await connection.send(json.dumps(response))
+                if command == "HELLO" and self.scenario.message_count:
+                    stream = asyncio.create_task(self.stream(connection))
+        except ConnectionClosed:
+            pass
+        finally:
+            if stream is not None:
+                stream.cancel()
+            self.connections.discard(connection)
+
+    async def stream(self, connection: ServerConnection) -> None:
+        """Push status frames that change the current of the fleet."""
+        scenario = self.scenario
+        interval = 1 / scenario.message_rate if scenario.message_rate else 0
+        fleet_size = len(self.evse_ids)
+        for number in range(scenario.message_count):
+            if number == scenario.disconnect_after:
+                await connection.close(scenario.disconnect_code)
+                return
+            evse_id = self.evse_ids[number % fleet_size]
+            current = 8 + (number // fleet_size) % 8
+            await connection.send(
+                json.dumps(create_status(evse_id, self.activities[evse_id], current))
+            )
+            self.frames_pushed += 1
+            # yield to the event loop even without a message rate
+            await asyncio.sleep(interval)
+
+    def get_responses(self, command: str, request: dict[str, Any]) -> list[dict]:
+        """Return the messages the API sends for a command."""
+        evse_id: str | None = request.get("evse_id")
+        if command == "VALIDATE_API_TOKEN":
+            return [{"object": "STATUS_API_TOKEN", "success": True, "token": "abc"}]
+        if command == "HELLO":
+            return [{"object": "HELLO", "success": True}]
+        if command == "GET_CHARGE_POINTS":
+            data = [
+                {
+                    "evse_id": evse_id,
+                    "model_type": "hidden",
+                    "name": "",
+                    "smart_charging": False,
+                }
+                for evse_id in self.evse_ids
+            ]
+            return [{"object": "CHARGE_POINTS", "data": data}]
+        if evse_id not in self.activities:
+            return []
+        if command == "GET_CH_STATUS":
+            return [create_status(evse_id, self.activities[evse_id])]
+        if command == "GET_CH_SETTINGS":
+            return [create_settings(evse_id, **self.settings[evse_id])]
+        if command == "GET_GRID_STATUS":
+            return [
+                {
+                    "object": "GRID_STATUS",
+                    "data": {
+                        "grid_actual_p1": 12,
+                        "grid_actual_p2": 14,
+                        "grid_actual_p3": 15,
+                    },
+                }
+            ]
+        if command in ("SET_OPERATIVE", "SET_INOPERATIVE"):
+            self.activities[evse_id] = (
+                "available" if command == "SET_OPERATIVE" else "unavailable"
+            )
+            return [
+                {"object": f"STATUS_{command}", "evse_id": evse_id, "success": True},
+                create_status(evse_id, self.activities[evse_id]),
+            ]
+        if self.scenario.silent:
+            return []
+        if command in SETTINGS:
+            setting = SETTINGS[command]
+            if not self.scenario.reject_settings:
+                self.settings[evse_id][setting] = request["value"]
+            value = str(self.settings[evse_id][setting]).lower()
+            return [
+                {
+                    "object": f"STATUS_{command}",
+                    "evse_id": evse_id,
+                    "result": {"setting": f"{setting}={value}"},
+                }
+            ]
+        if command in SERVICES:
+            error = self.scenario.service_error
+            return [
+                {"object": f"RECEIVED_{command}", "evse_id": evse_id, "error": None},
+                {
+                    "object": f"STATUS_{command}",
+                    "evse_id": evse_id,
+                    "success": error is None,
+                    "error": error,
+                },
+            ]
+        return []
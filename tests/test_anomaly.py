@@ -0,0 +1,198 @@
+"""Test the Blue Current anomaly detection."""
+from math import exp
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import Event, HomeAssistant, callback
+
+from custom_components.blue_current import Connector
+from custom_components.blue_current.anomaly import (
+    EVENT_ANOMALY,
+    MIN_VOLTAGE_SAMPLES,
+    Ewma,
+    get_imbalance,
+)
+
+from . import init_integration
+
+data = {"101": {"model_type": "hidden", "name": ""}}
+
+
+def test_ewma():
+    """Test if the weight of a sample depends on the time since the last one."""
+    ewma = Ewma(10)
+    assert ewma.update(100, 0) == 100
+    assert ewma.update(0, 10) == pytest.approx(100 * exp(-1))
+    # a sample at the same time has no weight
+    assert ewma.update(0, 10) == pytest.approx(100 * exp(-1))
+    assert ewma.samples == 3
+
+
+def test_get_imbalance():
+    """Test the imbalance of the phase currents."""
+    assert get_imbalance((10, 10, 10)) == 0
+    assert get_imbalance((20, 10, 0)) == 1
+    assert get_imbalance((12, 9, 9)) == 0.2
+    # a low load is not imbalanced
+    assert get_imbalance((3, 0, 0)) == 0
+
+
+def record_events(hass: HomeAssistant) -> list[Event]:
+    """Return a list with the anomaly events fired from now on."""
+    events: list[Event] = []
+
+    @callback
+    def record(event: Event) -> None:
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_ANOMALY, record)
+    return events
+
+
+def grid_status(p1: float, p2: float, p3: float) -> dict[str, Any]:
+    """Return a GRID_STATUS message."""
+    return {
+        "object": "GRID_STATUS",
+        "data": {
+            "grid_actual_p1": p1,
+            "grid_actual_p2": p2,
+            "grid_actual_p3": p3,
+            "grid_max_current": max(p1, p2, p3),
+        },
+    }
+
+
+async def test_grid_anomalies(hass: HomeAssistant):
+    """Test the phase imbalance and overcurrent binary sensors and events."""
+    config_entry = await init_integration(hass, "binary_sensor", data)
+    hass.config_entries.async_update_entry(config_entry, options={"grid_capacity": 25})
+    connector: Connector = hass.data["blue_current"]["uuid"]
+    events = record_events(hass)
+
+    async def send(now: float, *currents: float) -> None:
+        with patch(
+            "custom_components.blue_current.anomaly.monotonic", return_value=now
+        ):
+            await connector.on_data(grid_status(*currents))
+        await hass.async_block_till_done()
+
+    await send(0, 10, 10, 10)
+    # a short peak is ignored
+    await send(5, 24, 10, 10)
+    await send(10, 10, 10, 10)
+    assert (
+        hass.states.get(
+            "binary_sensor.blue_current_grid_mock_title_phase_imbalance"
+        ).state
+        == "off"
+    )
+
+    for now in range(20, 200, 10):
+        await send(now, 24, 10, 10)
+    assert (
+        hass.states.get(
+            "binary_sensor.blue_current_grid_mock_title_phase_imbalance"
+        ).state
+        == "on"
+    )
+    assert (
+        hass.states.get("binary_sensor.blue_current_grid_mock_title_overcurrent").state
+        == "off"
+    )
+    assert [event.data["type"] for event in events] == ["phase_imbalance"]
+    assert events[0].data["active"]
+
+    for now in range(200, 400, 10):
+        await send(now, 30, 30, 30)
+    assert (
+        hass.states.get(
+            "binary_sensor.blue_current_grid_mock_title_phase_imbalance"
+        ).state
+        == "off"
+    )
+    assert (
+        hass.states.get("binary_sensor.blue_current_grid_mock_title_overcurrent").state
+        == "on"
+    )
+    assert [(event.data["type"], event.data["active"]) for event in events[1:]] == [
+        ("grid_overcurrent", True),
+        ("phase_imbalance", False),
+    ]
+
+
+async def test_voltage_sag(hass: HomeAssistant):
+    """Test the voltage sag binary sensor and events."""
+    await init_integration(hass, "binary_sensor", data)
+    connector: Connector = hass.data["blue_current"]["uuid"]
+    events = record_events(hass)
+
+    def send(now: float, voltage: float) -> None:
+        with patch(
+            "custom_components.blue_current.anomaly.monotonic", return_value=now
+        ):
+            # the charge point has one phase
+            connector.update_charge_point(
+                "101", {"actual_v1": voltage, "actual_v2": 0, "actual_v3": 0}
+            )
+
+    for now in range(MIN_VOLTAGE_SAMPLES):
+        send(now, 230)
+    assert hass.states.get("binary_sensor.101_voltage_sag").state == "off"
+
+    send(20, 200)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.101_voltage_sag").state == "on"
+    assert events[0].data == {
+        "type": "voltage_sag",
+        "active": True,
+        "value": pytest.approx(
+            200 / connector.anomalies.voltages["101"][0].value, 1e-3
+        ),
+        "evse_id": "101",
+    }
+
+    # the sag is cleared above 95 % of the average
+    send(21, 215)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.101_voltage_sag").state == "on"
+    send(22, 229)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.101_voltage_sag").state == "off"
+    assert len(events) == 2
+
+
+async def test_imbalance_clears_at_low_load(hass: HomeAssistant):
+    """Test if a phase imbalance clears when the load drops."""
+    await init_integration(hass, "binary_sensor", data)
+    connector: Connector = hass.data["blue_current"]["uuid"]
+    events = record_events(hass)
+
+    async def send(now: float, *currents: float) -> None:
+        with patch(
+            "custom_components.blue_current.anomaly.monotonic", return_value=now
+        ):
+            await connector.on_data(grid_status(*currents))
+        await hass.async_block_till_done()
+
+    for now in range(0, 200, 10):
+        await send(now, 24, 10, 10)
+    assert (
+        hass.states.get(
+            "binary_sensor.blue_current_grid_mock_title_phase_imbalance"
+        ).state
+        == "on"
+    )
+
+    for now in range(200, 400, 10):
+        await send(now, 2, 0, 0)
+    assert (
+        hass.states.get(
+            "binary_sensor.blue_current_grid_mock_title_phase_imbalance"
+        ).state
+        == "off"
+    )
+    assert [(event.data["type"], event.data["active"]) for event in events] == [
+        ("phase_imbalance", True),
+        ("phase_imbalance", False),
+    ]
@@ -0,0 +1,118 @@
+"""Test the Blue Current load balancer."""
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.blue_current import Connector
+from custom_components.blue_current.balancer import (
+    EVENT_ALLOCATION,
+    MIN_INTERVAL,
+    allocate_currents,
+)
+
+from . import init_integration
+
+
+def test_allocate_currents():
+    """Test if the budget is shared fairly within the limits."""
+    assert allocate_currents(48, [("101", 32), ("102", 32), ("103", 10)]) == {
+        "101": 19,
+        "102": 19,
+        "103": 10,
+    }
+    # enough for everyone
+    assert allocate_currents(100, [("101", 16), ("102", 16)]) == {
+        "101": 16,
+        "102": 16,
+    }
+    # the budget is rounded down
+    assert allocate_currents(20, [("101", 32), ("102", 32), ("103", 32)]) == {
+        "101": 6.6,
+        "102": 6.6,
+        "103": 6.6,
+    }
+    # not enough for everyone, charge points below the minimum get nothing
+    assert allocate_currents(13, [("101", 32), ("102", 16), ("103", 10)]) == {
+        "101": 0,
+        "102": 6.5,
+        "103": 6.5,
+    }
+    assert allocate_currents(-5, [("101", 32)]) == {"101": 0}
+    assert allocate_currents(20, [("101", 4)]) == {"101": 0}
+
+
+def create_status(current: float, activity: str = "charging") -> dict[str, Any]:
+    """Return the status of a charge point that uses a current on every phase."""
+    return {
+        "activity": activity,
+        "actual_p1": current,
+        "actual_p2": current,
+        "actual_p3": current,
+        "max_usage": 32,
+    }
+
+
+async def test_balancer(hass: HomeAssistant):
+    """Test the allocations with hysteresis on increases and a rate limit."""
+    data = {
+        evse_id: {"model_type": "hidden", "name": "", **create_status(10)}
+        for evse_id in ("101", "102")
+    }
+    config_entry = await init_integration(hass, "sensor", data)
+    hass.config_entries.async_update_entry(config_entry, options={"grid_capacity": 40})
+    connector: Connector = hass.data["blue_current"]["uuid"]
+
+    events: list[Event] = []
+
+    @callback
+    def record(event: Event) -> None:
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_ALLOCATION, record)
+
+    def grid(base_load: float) -> dict[str, Any]:
+        return {
+            "object": "GRID_STATUS",
+            "data": {f"grid_actual_p{phase}": base_load + 20 for phase in (1, 2, 3)},
+        }
+
+    # 40 A - 10 A of other devices
+    await connector.on_data(grid(10))
+    await hass.async_block_till_done()
+    assert connector.balancer.allocations == {"101": 15, "102": 15}
+    assert {
+        event.data["evse_id"]: event.data["allocated_current"] for event in events
+    } == {"101": 15, "102": 15}
+
+    # runs are spaced and small increases are not published
+    events.clear()
+    await connector.on_data(grid(9.4))
+    await hass.async_block_till_done()
+    assert not events
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=MIN_INTERVAL))
+    await hass.async_block_till_done()
+    assert not events
+    assert connector.balancer.allocations == {"101": 15, "102": 15}
+
+    # decreases are always published
+    await connector.on_data(grid(10.6))
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=2 * MIN_INTERVAL)
+    )
+    await hass.async_block_till_done()
+    assert connector.balancer.allocations == {"101": 14.7, "102": 14.7}
+    assert len(events) == 2
+
+    # a charge point stops charging, the grid still measures its current
+    connector.update_charge_point("102", create_status(0, "available"))
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=3 * MIN_INTERVAL)
+    )
+    await hass.async_block_till_done()
+    assert connector.balancer.allocations == {"101": 19.4, "102": 0}
+    assert len(events) == 4
+
+    connector.balancer.async_cancel()
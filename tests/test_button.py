@@ -7,7 +7,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 from homeassistant.util import dt as dt_util
 
-from . import init_integration
+from . import acknowledge_services, init_integration
 
 data = {"101": {"model_type": "hidden", "evse_id": "101", "name": ""}}
 
@@ -17,6 +17,7 @@ buttons = ("start_session", "stop_session", "reset", "reboot")
 async def test_buttons(hass: HomeAssistant):
     """Test the underlying buttons."""
     await init_integration(hass, "button", data)
+    acknowledge_services(hass, hass.data["blue_current"]["uuid"])
 
     entity_registry = er.async_get(hass)
 
@@ -0,0 +1,29 @@
+"""The tests for the Blue Current charge point state."""
+from custom_components.blue_current.charge_point import ChargePointState
+
+
+def test_charge_point_state():
+    """Test if known and unknown keys are stored and read."""
+    state = ChargePointState("hidden", "")
+    assert state.as_dict() == {"model_type": "hidden", "name": ""}
+    assert state.extra is None
+
+    state.update({"actual_kwh": 10, "block": False, "smart_charging": True})
+    assert state.actual_kwh == 10
+    assert state.get("block") is False
+    assert state.get("smart_charging") is True
+    assert state.get("unknown", 1) == 1
+    assert state.extra == {"smart_charging": True}
+
+    assert ChargePointState.getter("actual_kwh")(state) == 10
+    assert ChargePointState.getter("smart_charging")(state) is True
+    assert ChargePointState.getter("unknown")(ChargePointState()) is None
+
+    assert state.as_dict() == {
+        "model_type": "hidden",
+        "name": "",
+        "actual_kwh": 10,
+        "block": False,
+        "smart_charging": True,
+    }
+    assert ChargePointState.from_dict(state.as_dict()).as_dict() == state.as_dict()
@@ -288,3 +288,37 @@ async def test_flow_reauth(hass: HomeAssistant) -> None:
 
         assert await entry.async_unload(hass)
         await hass.async_block_till_done()
+
+
+async def test_options_flow(hass: HomeAssistant) -> None:
+    """Test if the options can be changed."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": "BCU_APP"},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("custom_components.blue_current.async_setup_entry", return_value=True):
+        result = await hass.config_entries.options.async_init(config_entry.entry_id)
+        assert result["type"] == FlowResultType.FORM
+        assert result["step_id"] == "init"
+
+        result2 = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {
+                "bootstrap_concurrency": 5,
+                "coalesce_window": 500,
+                "ready_timeout": 0,
+                "grid_capacity": 25,
+            },
+        )
+
+    assert result2["type"] == FlowResultType.CREATE_ENTRY
+    assert config_entry.options == {
+        "bootstrap_concurrency": 5,
+        "coalesce_window": 500,
+        "ready_timeout": 0,
+        "grid_capacity": 25,
+    }
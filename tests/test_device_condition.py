@@ -142,6 +142,22 @@ async def test_get_conditions(
     unordered(conditions, expected_conditions)
 
 
+async def test_get_conditions_grid_device(
+    hass: HomeAssistant, device_reg: device_registry.DeviceRegistry
+):
+    """Test if the grid device has no charge point conditions."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    device_entry = device_reg.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={(DOMAIN, f"grid_{config_entry.entry_id}")},
+    )
+    conditions = await async_get_device_automations(
+        hass, DeviceAutomationType.CONDITION, device_entry.id
+    )
+    assert conditions == []
+
+
 async def test_if_actvivity_state(
     hass: HomeAssistant, calls: list[ServiceCall]
 ) -> None:
@@ -140,6 +140,22 @@ async def test_get_triggers(
     unordered(triggers, expected_triggers)
 
 
+async def test_get_triggers_grid_device(
+    hass: HomeAssistant, device_reg: device_registry.DeviceRegistry
+):
+    """Test if the grid device has no charge point triggers."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    device_entry = device_reg.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={(DOMAIN, f"grid_{config_entry.entry_id}")},
+    )
+    triggers = await async_get_device_automations(
+        hass, DeviceAutomationType.TRIGGER, device_entry.id
+    )
+    assert triggers == []
+
+
 async def test_if_activity_fires_on_state_change(hass: HomeAssistant, calls):
     """Test for blue current activity trigger firing."""
     hass.states.async_set("sensor.activity_101", "unavailable")
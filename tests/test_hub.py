@@ -0,0 +1,49 @@
+"""Test the Blue Current charge point hub."""
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from custom_components.blue_current.hub import ChargePointHub
+
+
+def create_entity(*update_keys: str) -> MagicMock:
+    """Return a mock entity of the given keys."""
+    entity = MagicMock()
+    entity.update_keys = update_keys
+    return entity
+
+
+async def test_hub(hass: HomeAssistant):
+    """Test if the hub updates the entities of the changed keys once."""
+    hub = ChargePointHub(hass, "101")
+    power = create_entity("actual_p1", "actual_p2")
+    energy = create_entity("actual_kwh")
+    remove_power = hub.async_add_entity(power)
+    hub.async_add_entity(energy)
+
+    hub.async_update(("actual_p1", "actual_p2", "avg_voltage"))
+    assert power.async_handle_value_update.call_count == 1
+    assert energy.async_handle_value_update.call_count == 0
+
+    # a dispatched signal updates all entities
+    async_dispatcher_send(hass, "blue_current_value_update_101")
+    assert power.async_handle_value_update.call_count == 2
+    assert energy.async_handle_value_update.call_count == 1
+
+    # an error of an entity does not stop the update of the others
+    power.async_handle_value_update.side_effect = ValueError
+    hub.async_update()
+    assert energy.async_handle_value_update.call_count == 2
+
+    remove_power()
+    assert hub.entities_by_key == {"actual_kwh": [energy]}
+
+    hub.async_remove_charge_point()
+    energy.async_remove_charge_point.assert_called_once()
+    assert not power.async_remove_charge_point.called
+
+    # the subscription is removed with the last entity
+    hub.async_remove_entity(energy)
+    async_dispatcher_send(hass, "blue_current_value_update_101")
+    assert energy.async_handle_value_update.call_count == 2
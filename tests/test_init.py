@@ -1,8 +1,13 @@
 """Test Blue Current Init Component."""
 
+import asyncio
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from datetime import timedelta
+from functools import partial
+from time import monotonic
 from typing import Any
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from bluecurrent_api.client import Client
@@ -10,16 +15,27 @@ from bluecurrent_api.exceptions import RequestLimitReached, WebsocketError
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
 from custom_components.blue_current import (
     DOMAIN,
     Connector,
+    async_migrate_grid_unique_ids,
     async_setup_entry,
-    set_entities_unavalible,
+    get_backoff_delay,
 )
+from custom_components.blue_current.charge_point import ChargePointState
+from custom_components.blue_current.const import ConnectionState
+from custom_components.blue_current.hub import ChargePointHub
 
 from . import init_integration
+from .fake_server import RATE_LIMIT_CLOSE_CODE, FakeServer, Scenario
 
 
 async def test_load_unload_entry(hass: HomeAssistant):
@@ -51,37 +67,138 @@ async def test_config_not_ready(hass: HomeAssistant):
         await async_setup_entry(hass, config_entry)
 
 
-async def test_set_entities_unavalible(hass: HomeAssistant):
-    """Tests set_entities_unavailable."""
-
-    data = {"101": {"model_type": "hidden", "evse_id": "101", "name": ""}}
+async def test_set_available(hass: HomeAssistant):
+    """Tests if the availability of the connection is written in chunks."""
 
-    charge_point = {
-        "actual_v1": 14,
-        "actual_v2": 18,
-        "actual_v3": 15,
-        "actual_p1": 19,
-        "actual_p2": 14,
-        "actual_p3": 15,
+    data = {
+        "101": {
+            "model_type": "hidden",
+            "name": "",
+            "avg_voltage": 15.7,
+            "avg_current": 16,
+            "total_kw": 0.4,
+        }
     }
 
     entity_ids = [
-        "voltage_phase_1",
-        "voltage_phase_2",
-        "voltage_phase_3",
-        "current_phase_1",
-        "current_phase_2",
-        "current_phase_3",
+        "sensor.101_average_voltage",
+        "sensor.101_average_current",
+        "sensor.101_total_kw",
     ]
 
-    await init_integration(hass, "sensor", data, charge_point)
+    await init_integration(hass, "sensor", data)
+    connector: Connector = hass.data[DOMAIN]["uuid"]
+
+    # only the available sensors are written
+    available = [entity for entity in connector.entities if entity.available]
+    assert len(available) < len(connector.entities)
+    state_writes = connector.metrics.state_writes
+    with patch("custom_components.blue_current.AVAILABILITY_CHUNK_SIZE", 2), patch(
+        "custom_components.blue_current.asyncio.sleep", wraps=asyncio.sleep
+    ) as mock_sleep:
+        await connector.async_set_available(False)
+    assert connector.metrics.state_writes - state_writes == len(available)
+    assert mock_sleep.call_count == -(-len(connector.entities) // 2)
+
+    for entity_id in entity_ids:
+        state = hass.states.get(entity_id)
+        assert state and state.state == "unavailable"
+
+    # the diagnostic sensors stay available
+    state = hass.states.get("sensor.blue_current_mock_title_connection_state")
+    assert state and state.state != "unavailable"
 
-    set_entities_unavalible(hass, "uuid")
+    # unchanged availability is not written again
+    state_writes = connector.metrics.state_writes
+    await connector.async_set_available(False)
+    assert connector.metrics.state_writes == state_writes
 
+    await connector.async_set_available(True)
     for entity_id in entity_ids:
-        state = hass.states.get(f"sensor.101_{entity_id}")
-        assert state
-        assert state.state == "unavailable"
+        state = hass.states.get(entity_id)
+        assert state and state.state != "unavailable"
+
+
+@pytest.mark.parametrize("platform", ["sensor", "switch", "button"])
+async def test_charge_points_added_and_removed(hass: HomeAssistant, platform: str):
+    """Test if entities are added and removed with the charge points."""
+    await init_integration(
+        hass, platform, {"101": {"model_type": "hidden", "name": ""}}
+    )
+    connector: Connector = hass.data[DOMAIN]["uuid"]
+    connector.set_state(ConnectionState.LIVE)
+
+    devices = dr.async_get(hass)
+    entities = er.async_get(hass)
+
+    def get_entity_count(evse_id: str) -> int:
+        device = devices.async_get_device(identifiers={(DOMAIN, evse_id)})
+        if device is None:
+            return 0
+        return len(er.async_entries_for_device(entities, device.id, True))
+
+    entity_count = get_entity_count("101")
+    assert entity_count > 0
+
+    await connector.on_data(
+        {
+            "object": "CHARGE_POINTS",
+            "data": [
+                {"evse_id": "101", "model_type": "hidden", "name": ""},
+                {"evse_id": "102", "model_type": "hidden", "name": ""},
+            ],
+        }
+    )
+    await hass.async_block_till_done()
+    assert get_entity_count("102") == entity_count
+
+    # only the new charge point is requested
+    connector.client.get_status.assert_called_once_with("102")
+
+    await connector.on_data(
+        {
+            "object": "CHARGE_POINTS",
+            "data": [{"evse_id": "102", "model_type": "hidden", "name": ""}],
+        }
+    )
+    await hass.async_block_till_done()
+    assert list(connector.charge_points) == ["102"]
+    assert devices.async_get_device(identifiers={(DOMAIN, "101")}) is None
+    assert get_entity_count("101") == 0
+    assert get_entity_count("102") == entity_count
+    assert all(
+        state.entity_id.split(".")[1].split("_")[0] != "101"
+        for state in hass.states.async_all(platform)
+    )
+
+
+@contextmanager
+def record_dispatches() -> Iterator[list[str]]:
+    """Record the dispatcher signals and the updates of the charge point hubs.
+
+    An update of the hub of a charge point is recorded as the signal of the
+    charge point, followed by the key if the update is for a key.
+    """
+    signals: list[str] = []
+
+    def update(hub: ChargePointHub, keys: Iterable[str] | None = None) -> None:
+        if keys is None:
+            signals.append(hub.signal)
+        else:
+            signals.extend(f"{hub.signal}_{key}" for key in keys)
+
+    with patch(
+        "custom_components.blue_current.async_dispatcher_send",
+        side_effect=lambda hass, signal, *args: signals.append(signal),
+    ), patch.object(ChargePointHub, "async_update", autospec=True, side_effect=update):
+        yield signals
+
+
+def dispatched_signals(signals: list[str]) -> set[str]:
+    """Return and reset the signals that were dispatched."""
+    dispatched = set(signals)
+    signals.clear()
+    return dispatched
 
 
 async def test_on_data(hass: HomeAssistant):
@@ -89,9 +206,7 @@ async def test_on_data(hass: HomeAssistant):
 
     await init_integration(hass, "sensor", {})
 
-    with patch(
-        "custom_components.blue_current.async_dispatcher_send"
-    ) as test_async_dispatcher_send:
+    with record_dispatches() as signals:
         connector: Connector = hass.data[DOMAIN]["uuid"]
 
         # test CHARGE_POINTS
@@ -100,10 +215,14 @@ async def test_on_data(hass: HomeAssistant):
             "data": [{"evse_id": "101", "model_type": "hidden", "name": ""}],
         }
         await connector.on_data(data)
-        assert connector.charge_points == {"101": {"model_type": "hidden", "name": ""}}
+        assert connector.charge_points["101"].as_dict() == {
+            "model_type": "hidden",
+            "name": "",
+        }
+        assert dispatched_signals(signals) == {"blue_current_evse_added_uuid"}
 
         # test CH_STATUS
-        data2 = {
+        data2: dict[str, Any] = {
             "object": "CH_STATUS",
             "data": {
                 "actual_v1": 12,
@@ -123,30 +242,38 @@ async def test_on_data(hass: HomeAssistant):
             },
         }
         await connector.on_data(data2)
-        assert connector.charge_points == {
-            "101": {
-                "model_type": "hidden",
-                "name": "",
-                "actual_v1": 12,
-                "actual_v2": 14,
-                "actual_v3": 15,
-                "actual_p1": 12,
-                "actual_p2": 14,
-                "actual_p3": 15,
-                "block": False,
-                "activity": "charging",
-                "start_datetime": "2021-11-18T14:12:23",
-                "stop_datetime": "2021-11-18T14:32:23",
-                "offline_since": "2021-11-18T14:32:23",
-                "total_cost": 10.52,
-                "vehicle_status": "standby",
-                "actual_kwh": 10,
-            }
+        assert connector.charge_points["101"].as_dict() == {
+            "model_type": "hidden",
+            "name": "",
+            "actual_v1": 12,
+            "actual_v2": 14,
+            "actual_v3": 15,
+            "actual_p1": 12,
+            "actual_p2": 14,
+            "actual_p3": 15,
+            "block": False,
+            "activity": "charging",
+            "start_datetime": "2021-11-18T14:12:23",
+            "stop_datetime": "2021-11-18T14:32:23",
+            "offline_since": "2021-11-18T14:32:23",
+            "total_cost": 10.52,
+            "vehicle_status": "standby",
+            "actual_kwh": 10,
         }
 
-        test_async_dispatcher_send.assert_called_with(
-            hass, "blue_current_value_update_101"
-        )
+        assert dispatched_signals(signals) == {
+            f"blue_current_value_update_101_{key}"
+            for key in connector.charge_points["101"].as_dict()
+            if key not in ("model_type", "name")
+        }
+
+        # test if unchanged values are not dispatched
+        data2["data"]["evse_id"] = "101"
+        data2["data"]["actual_kwh"] = 11
+        await connector.on_data(data2)
+        assert dispatched_signals(signals) == {
+            "blue_current_value_update_101_actual_kwh"
+        }
 
         # test GRID_STATUS
         data3 = {
@@ -163,10 +290,14 @@ async def test_on_data(hass: HomeAssistant):
             "grid_actual_p2": 14,
             "grid_actual_p3": 15,
         }
-        test_async_dispatcher_send.assert_called_with(hass, "blue_current_grid_update")
+        assert dispatched_signals(signals) == {
+            "blue_current_grid_update_uuid_grid_actual_p1",
+            "blue_current_grid_update_uuid_grid_actual_p2",
+            "blue_current_grid_update_uuid_grid_actual_p3",
+        }
 
         # reset charge_point
-        connector.charge_points["101"] = {}
+        connector.charge_points["101"] = ChargePointState()
 
         # test CH_SETTINGS
         data4: dict[str, Any] = {
@@ -178,15 +309,14 @@ async def test_on_data(hass: HomeAssistant):
             },
         }
         await connector.on_data(data4)
-        assert connector.charge_points == {
-            "101": {
-                "plug_and_charge": False,
-                "linked_charge_cards_only": False,
-            }
+        assert connector.charge_points["101"].as_dict() == {
+            "plug_and_charge": False,
+            "linked_charge_cards_only": False,
+        }
+        assert dispatched_signals(signals) == {
+            "blue_current_value_update_101_plug_and_charge",
+            "blue_current_value_update_101_linked_charge_cards_only",
         }
-        test_async_dispatcher_send.assert_called_with(
-            hass, "blue_current_value_update_101"
-        )
 
         # test LINKED_CHARGE_CARDS_ONLY
         data5: dict[str, Any] = {
@@ -195,15 +325,13 @@ async def test_on_data(hass: HomeAssistant):
             "evse_id": "101",
         }
         await connector.on_data(data5)
-        assert connector.charge_points == {
-            "101": {
-                "plug_and_charge": False,
-                "linked_charge_cards_only": True,
-            }
+        assert connector.charge_points["101"].as_dict() == {
+            "plug_and_charge": False,
+            "linked_charge_cards_only": True,
+        }
+        assert dispatched_signals(signals) == {
+            "blue_current_value_update_101_linked_charge_cards_only"
         }
-        test_async_dispatcher_send.assert_called_with(
-            hass, "blue_current_value_update_101"
-        )
 
         # test PLUG_AND_CHARGE
         data7: dict[str, Any] = {
@@ -212,15 +340,13 @@ async def test_on_data(hass: HomeAssistant):
             "evse_id": "101",
         }
         await connector.on_data(data7)
-        assert connector.charge_points == {
-            "101": {
-                "plug_and_charge": True,
-                "linked_charge_cards_only": True,
-            }
+        assert connector.charge_points["101"].as_dict() == {
+            "plug_and_charge": True,
+            "linked_charge_cards_only": True,
+        }
+        assert dispatched_signals(signals) == {
+            "blue_current_value_update_101_plug_and_charge"
         }
-        test_async_dispatcher_send.assert_called_with(
-            hass, "blue_current_value_update_101"
-        )
 
         # test SOFT_RESET
         data7 = {"object": "STATUS_SOFT_RESET", "success": True}
@@ -230,13 +356,305 @@ async def test_on_data(hass: HomeAssistant):
         data8 = {"object": "STATUS_REBOOT", "success": False}
         await connector.on_data(data8)
 
+        # test service results
+        await connector.on_data({"object": "SOFT_RESET", "success": True})
+
+        # test unknown charge point
+        await connector.on_data(
+            {"object": "CH_STATUS", "data": {"evse_id": "102", "actual_kwh": 1}}
+        )
+
+        assert connector.frames_handled == {
+            "CHARGE_POINTS": 1,
+            "CH_STATUS": 2,
+            "GRID_STATUS": 1,
+            "CH_SETTINGS": 1,
+            "LINKED_CHARGE_CARDS_ONLY": 1,
+            "PLUG_AND_CHARGE": 1,
+            "SOFT_RESET": 1,
+        }
+        assert connector.frames_dropped == {"CH_STATUS": 1}
+        assert connector.frames_unknown == {"STATUS_SOFT_RESET": 1, "STATUS_REBOOT": 1}
+
+
+async def test_register_handler(hass: HomeAssistant):
+    """Test if handlers can be registered for new object types."""
+    await init_integration(hass, "sensor", {})
+    connector: Connector = hass.data[DOMAIN]["uuid"]
+
+    handler = AsyncMock(return_value=True)
+    connector.register_handler("NEW_OBJECT", handler)
+
+    message = {"object": "NEW_OBJECT", "data": {}}
+    await connector.on_data(message)
+    handler.assert_awaited_once_with(message)
+    assert connector.frames_handled == {"NEW_OBJECT": 1}
+
+
+async def test_bootstrap_charge_points(hass: HomeAssistant):
+    """Test if the charge point data is requested with bounded concurrency."""
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": {"123"}},
+        options={"bootstrap_concurrency": 3},
+    )
+
+    connector = Connector(hass, config_entry, AsyncMock(spec=Client))
+
+    running = 0
+    max_running = 0
+
+    async def get_charge_point_data(evse_id: str) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0)
+        running -= 1
+
+    evse_ids = [str(evse_id) for evse_id in range(10)]
+    with patch.object(connector, "get_charge_point_data", get_charge_point_data):
+        await connector.on_data(
+            {
+                "object": "CHARGE_POINTS",
+                "data": [
+                    {"evse_id": evse_id, "model_type": "hidden", "name": ""}
+                    for evse_id in evse_ids
+                ],
+            }
+        )
+        assert list(connector.charge_points) == evse_ids
+        await hass.async_block_till_done()
+
+    assert max_running == 3
+    connector.client.get_grid_status.assert_called_once_with("0")
+    assert len(connector.bootstrap_pending) == 10
+
+    for evse_id in evse_ids:
+        for object_name in ("CH_STATUS", "CH_SETTINGS"):
+            await connector.on_data(
+                {"object": object_name, "data": {"evse_id": evse_id}}
+            )
+    assert connector.bootstrap_pending == {}
+
+
+async def test_grid(hass: HomeAssistant):
+    """Test if partial grid messages are merged and grid requests are not repeated."""
+    await init_integration(hass, "sensor", {"101": {"model_type": "hidden"}})
+    connector: Connector = hass.data[DOMAIN]["uuid"]
+
+    await connector.request_grid_status()
+    await connector.request_grid_status()
+    connector.client.get_grid_status.assert_called_once_with("101")
+
+    await connector.on_data(
+        {
+            "object": "GRID_STATUS",
+            "data": {"grid_actual_p1": 12, "grid_avg_current": 12},
+        }
+    )
+    await connector.on_data({"object": "GRID_CURRENT", "data": {"grid_actual_p1": 14}})
+    assert connector.grid == {"grid_actual_p1": 14, "grid_avg_current": 12}
+
+    # the answer was received, so the grid can be requested again
+    await connector.request_grid_status()
+    assert connector.client.get_grid_status.call_count == 2
+
+
+async def test_migrate_grid_unique_ids(hass: HomeAssistant):
+    """Test if the entry id is added to the unique ids of the grid sensors."""
+    config_entry = MockConfigEntry(domain=DOMAIN, entry_id="uuid", unique_id="uuid")
+    config_entry.add_to_hass(hass)
+    entity_registry = er.async_get(hass)
+    for unique_id in ("grid_avg_current", "grid_max_current_uuid", "actual_kwh_101"):
+        entity_registry.async_get_or_create(
+            "sensor", DOMAIN, unique_id, config_entry=config_entry
+        )
+
+    await async_migrate_grid_unique_ids(hass, config_entry)
+
+    assert {
+        entry.unique_id
+        for entry in er.async_entries_for_config_entry(entity_registry, "uuid")
+    } == {"grid_avg_current_uuid", "grid_max_current_uuid", "actual_kwh_101"}
+
+
+async def test_resync(hass: HomeAssistant):
+    """Test if the settings of only the stale charge points are refreshed."""
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": {"123"}},
+    )
+
+    connector = Connector(hass, config_entry, AsyncMock(spec=Client))
+    connector.charge_points = {
+        "101": ChargePointState.from_dict({"activity": "available"}),
+        "102": ChargePointState.from_dict({"activity": "charging"}),
+        "103": ChargePointState(),
+    }
+
+    with patch("custom_components.blue_current.monotonic", return_value=1000):
+        # short outage
+        connector.disconnected_at = 995
+        await connector.resync()
+        await hass.async_block_till_done()
+        assert [call.args for call in connector.client.get_status.call_args_list] == [
+            ("101",),
+            ("102",),
+            ("103",),
+        ]
+        assert [call.args for call in connector.client.get_settings.call_args_list] == [
+            ("102",),
+            ("103",),
+        ]
+        connector.client.get_charge_points.assert_not_called()
+        assert connector.disconnected_at is None
+
+        # long outage
+        connector.client.reset_mock()
+        connector.disconnected_at = 900
+        await connector.resync()
+        await hass.async_block_till_done()
+        assert connector.client.get_status.call_count == 3
+        assert connector.client.get_settings.call_count == 3
+        connector.client.get_charge_points.assert_not_called()
+
+        # the set of charge points may have changed
+        connector.client.reset_mock()
+        connector.disconnected_at = 0
+        await connector.resync()
+        await hass.async_block_till_done()
+        connector.client.get_status.assert_not_called()
+        connector.client.get_charge_points.assert_called_once()
+
+    # the status of an idle charge point is refreshed, it may have started charging
+    connector.charge_points = {
+        "101": ChargePointState.from_dict({"activity": "available"})
+    }
+    connector.bootstrap_pending.clear()
+    connector.disconnected_at = monotonic()
+    connector.client.reset_mock()
+    await connector.resync()
+    await hass.async_block_till_done()
+    connector.client.get_status.assert_called_once_with("101")
+    connector.client.get_settings.assert_not_called()
+    assert connector.state != ConnectionState.LIVE
+
+    await connector.on_data(
+        {"object": "CH_STATUS", "data": {"evse_id": "101", "activity": "charging"}}
+    )
+    assert connector.charge_points["101"].activity == "charging"
+    assert connector.state == ConnectionState.LIVE
+
+    # known charge points keep their data when they are enumerated again
+    await connector.on_data(
+        {
+            "object": "CHARGE_POINTS",
+            "data": [{"evse_id": "101", "model_type": "hidden", "name": "new"}],
+        }
+    )
+    assert connector.charge_points["101"].as_dict() == {
+        "model_type": "hidden",
+        "name": "new",
+        "activity": "charging",
+        "block": False,
+    }
+    await hass.async_block_till_done()
+
+
+async def test_discover_charge_points(hass: HomeAssistant):
+    """Test if a failed discovery of the charge points is ignored."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": {"123"}},
+    )
+    connector = Connector(hass, config_entry, AsyncMock(spec=Client))
+
+    await connector.discover_charge_points()
+    connector.client.get_charge_points.assert_not_called()
+
+    connector.set_state(ConnectionState.LIVE)
+    for error in (WebsocketError, RequestLimitReached):
+        connector.client.get_charge_points.side_effect = error
+        await connector.discover_charge_points()
+    assert connector.client.get_charge_points.call_count == 2
+
+
+async def test_coalesce_window(hass: HomeAssistant):
+    """Test if CH_STATUS updates are merged during the coalesce window."""
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": {"123"}},
+        options={"coalesce_window": 500},
+    )
+    connector = Connector(hass, config_entry, AsyncMock(spec=Client))
+    connector.add_charge_point("101", "hidden", "")
+
+    with record_dispatches() as signals:
+        for actual_kwh in (1, 2):
+            await connector.on_data(
+                {
+                    "object": "CH_STATUS",
+                    "data": {"evse_id": "101", "actual_kwh": actual_kwh},
+                }
+            )
+        await connector.on_data(
+            {"object": "CH_STATUS", "data": {"evse_id": "101", "total_cost": 1}}
+        )
+        assert dispatched_signals(signals) == set()
+        assert connector.charge_points["101"].actual_kwh == 2
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+        assert dispatched_signals(signals) == {
+            "blue_current_value_update_101_actual_kwh",
+            "blue_current_value_update_101_total_cost",
+        }
+
+        # activity changes bypass the window
+        await connector.on_data(
+            {"object": "CH_STATUS", "data": {"evse_id": "101", "actual_kwh": 3}}
+        )
+        await connector.on_data(
+            {"object": "CH_STATUS", "data": {"evse_id": "101", "activity": "charging"}}
+        )
+        assert dispatched_signals(signals) == {
+            "blue_current_value_update_101_actual_kwh",
+            "blue_current_value_update_101_activity",
+            "blue_current_value_update_101_block",
+        }
+        assert connector.pending_flushes == {}
+
+        # settings are not merged
+        await connector.on_data(
+            {
+                "object": "CH_SETTINGS",
+                "data": {"evse_id": "101", "plug_and_charge": True},
+            }
+        )
+        assert dispatched_signals(signals) == {
+            "blue_current_value_update_101_plug_and_charge"
+        }
+
 
 async def test_start_loop(hass: HomeAssistant):
     """Tests start_loop."""
 
     with patch(
-        "custom_components.blue_current.async_call_later"
-    ) as test_async_call_later:
+        "custom_components.blue_current.supervisor.async_call_later"
+    ) as test_async_call_later, patch(
+        "bluecurrent_api.Client.get_next_reset_delta", return_value=timedelta(hours=1)
+    ):
         config_entry = MockConfigEntry(
             domain=DOMAIN,
             entry_id="uuid",
@@ -251,13 +669,19 @@ async def test_start_loop(hass: HomeAssistant):
             side_effect=WebsocketError("unknown command"),
         ):
             await connector.start_loop()
-            test_async_call_later.assert_called_with(hass, 1, connector.reconnect)
+            assert connector.state == ConnectionState.BACKOFF
+            _, delay, action = test_async_call_later.call_args.args
+            assert 0.5 <= delay <= 1
+            assert action == connector.reconnect
 
         with patch(
             "bluecurrent_api.Client.start_loop", side_effect=RequestLimitReached
         ):
             await connector.start_loop()
-            test_async_call_later.assert_called_with(hass, 1, connector.reconnect)
+            assert connector.state == ConnectionState.RATE_LIMITED
+            _, delay, action = test_async_call_later.call_args.args
+            assert 3600 <= delay <= 3900
+            assert action == connector.reconnect
 
 
 async def test_reconnect(hass: HomeAssistant):
@@ -268,7 +692,7 @@ async def test_reconnect(hass: HomeAssistant):
     ), patch(
         "bluecurrent_api.Client.get_next_reset_delta", return_value=timedelta(hours=1)
     ), patch(
-        "custom_components.blue_current.async_call_later"
+        "custom_components.blue_current.supervisor.async_call_later"
     ) as test_async_call_later:
         config_entry = MockConfigEntry(
             domain=DOMAIN,
@@ -278,12 +702,331 @@ async def test_reconnect(hass: HomeAssistant):
         )
 
         connector = Connector(hass, config_entry, Client)
-        await connector.reconnect()
 
-        test_async_call_later.assert_called_with(hass, 20, connector.reconnect)
+        # the delay doubles with every attempt
+        for attempt in range(12):
+            await connector.reconnect()
+            assert connector.state == ConnectionState.BACKOFF
+            _, delay, action = test_async_call_later.call_args.args
+            max_delay = min(300, 2**attempt)
+            assert max_delay / 2 <= delay <= max_delay
+            assert action == connector.reconnect
 
         with patch("bluecurrent_api.Client.connect", side_effect=RequestLimitReached):
             await connector.reconnect()
-            test_async_call_later.assert_called_with(
-                hass, timedelta(hours=1), connector.reconnect
-            )
+            assert connector.state == ConnectionState.RATE_LIMITED
+            _, delay, action = test_async_call_later.call_args.args
+            assert 3600 <= delay <= 3900
+
+        # a successful reconnect resets the backoff
+        with patch("bluecurrent_api.Client.connect"), patch(
+            "bluecurrent_api.Client.start_loop"
+        ), patch("bluecurrent_api.Client.get_charge_points"):
+            await connector.reconnect()
+            assert connector.state == ConnectionState.SYNCING
+            assert connector.reconnect_attempts == 0
+            assert connector.metrics.reconnects == 1
+            await hass.async_block_till_done()
+
+
+async def test_get_backoff_delay():
+    """Test if the backoff delay is capped and jittered."""
+    delays = {get_backoff_delay(20) for _ in range(20)}
+    assert all(150 <= delay <= 300 for delay in delays)
+    assert len(delays) > 1
+
+
+async def wait_for_state(connector: Connector, state: ConnectionState) -> None:
+    """Wait until the connector reaches a state."""
+    async with asyncio.timeout(5):
+        while connector.state != state:
+            await asyncio.sleep(0.01)
+
+
+async def test_flapping_connection(hass: HomeAssistant, socket_enabled):
+    """Test the connection states against a server that drops the connection."""
+    server = FakeServer(["101", "102"])
+    await server.start()
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": "123"},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("bluecurrent_api.websocket.URL", server.url), patch(
+        "bluecurrent_api.Client.get_next_reset_delta", return_value=timedelta(hours=1)
+    ):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        connector: Connector = hass.data[DOMAIN][config_entry.entry_id]
+        await wait_for_state(connector, ConnectionState.LIVE)
+        assert connector.charge_points["102"].avg_voltage == 230
+
+        for attempt in range(3):
+            await server.drop_connections()
+            await wait_for_state(connector, ConnectionState.BACKOFF)
+            assert connector.reconnect_attempts == 1
+
+            async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+            await wait_for_state(connector, ConnectionState.LIVE)
+            assert connector.reconnect_attempts == 0
+            assert connector.metrics.reconnects == attempt + 1
+
+        # a short outage doesn't enumerate the charge points again
+        assert server.requests.count("GET_CHARGE_POINTS") == 1
+
+        await server.drop_connections(RATE_LIMIT_CLOSE_CODE)
+        await wait_for_state(connector, ConnectionState.RATE_LIMITED)
+        assert connector.cancel_reconnect is not None
+
+        await hass.config_entries.async_unload(config_entry.entry_id)
+        await hass.async_block_till_done()
+        assert connector.cancel_reconnect is None
+
+    await server.stop()
+
+
+async def test_fake_server_scenario(hass: HomeAssistant, socket_enabled):
+    """Test the receive loop against pushed frames, results and a request limit."""
+    server = FakeServer(
+        ["101", "102"], Scenario(message_count=20, service_error="timeout")
+    )
+    await server.start()
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": "123"},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("bluecurrent_api.websocket.URL", server.url), patch(
+        "bluecurrent_api.Client.get_next_reset_delta", return_value=timedelta(hours=1)
+    ):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        connector: Connector = hass.data[DOMAIN][config_entry.entry_id]
+        await wait_for_state(connector, ConnectionState.LIVE)
+        async with asyncio.timeout(5):
+            while server.frames_pushed < 20:
+                await asyncio.sleep(0.01)
+        assert connector.frames_received["CH_STATUS"] >= 20
+
+        result = await connector.async_change_setting(
+            "plug_and_charge",
+            "101",
+            True,
+            partial(connector.client.set_plug_and_charge, "101", True),
+        )
+        assert result == {"success": True, "error": None, "result": True}
+        assert connector.charge_points["101"].plug_and_charge is True
+
+        result = await connector.async_call_service("reboot", "102")
+        assert result == {
+            "success": False,
+            "error": "reboot timeout for chargepoint: 102",
+        }
+
+        server.scenario.reject_settings = True
+        result = await connector.async_change_setting(
+            "linked_charge_cards_only",
+            "101",
+            True,
+            partial(connector.client.set_linked_charge_cards_only, "101", True),
+        )
+        assert result["success"] is False
+
+        server.scenario.request_limit = 0
+        await server.drop_connections()
+        await wait_for_state(connector, ConnectionState.BACKOFF)
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+        await wait_for_state(connector, ConnectionState.RATE_LIMITED)
+
+        await hass.config_entries.async_unload(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    await server.stop()
+
+
+async def test_start_request_fails(hass: HomeAssistant):
+    """Test if a failed request for the charge points after connecting is retried."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": "123"},
+    )
+    connector = Connector(hass, config_entry, AsyncMock(spec=Client))
+
+    for error, schedule in (
+        (WebsocketError, "schedule_reconnect"),
+        (RequestLimitReached, "schedule_rate_limited_reconnect"),
+    ):
+        connector.client.get_charge_points.side_effect = error
+        connector.available = True
+        with patch.object(connector, schedule) as test_schedule, patch.object(
+            connector.supervisor, "async_start_loop"
+        ):
+            await connector.start("123")
+        test_schedule.assert_called_once()
+        assert not connector.available
+
+
+async def test_setup_from_snapshot(hass: HomeAssistant, hass_storage: dict[str, Any]):
+    """Test if the entities are set up from the snapshot before the data is received."""
+    hass_storage["blue_current.uuid.snapshot"] = {
+        "version": 1,
+        "key": "blue_current.uuid.snapshot",
+        "data": {
+            "charge_points": {
+                "101": {
+                    "model_type": "hidden",
+                    "name": "",
+                    "activity": "available",
+                    "actual_kwh": 10,
+                    "start_datetime": "2023-11-18T14:00:00+00:00",
+                }
+            },
+            "grid": {"grid_avg_current": 12},
+        },
+    }
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": "123"},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("custom_components.blue_current.PLATFORMS", ["sensor"]), patch(
+        "custom_components.blue_current.Client", autospec=True
+    ):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    connector: Connector = hass.data[DOMAIN]["uuid"]
+    connector.client.get_charge_points.assert_called_once()
+    connector.client.wait_for_response.assert_not_called()
+    assert connector.charge_points["101"].start_datetime == dt_util.parse_datetime(
+        "2023-11-18T14:00:00+00:00"
+    )
+
+    state = hass.states.get("sensor.101_energy_usage")
+    assert state and state.state == "10"
+    assert state.attributes["stale"] is True
+    state = hass.states.get("sensor.blue_current_grid_mock_title_average_current")
+    assert state and state.state == "12"
+
+    await connector.on_data(
+        {
+            "object": "CHARGE_POINTS",
+            "data": [{"evse_id": "101", "model_type": "hidden", "name": ""}],
+        }
+    )
+    await hass.async_block_till_done()
+    for object_name, values in (
+        ("CH_STATUS", {"actual_kwh": 11}),
+        ("CH_SETTINGS", {"plug_and_charge": True}),
+    ):
+        await connector.on_data(
+            {"object": object_name, "data": {"evse_id": "101", **values}}
+        )
+    await hass.async_block_till_done()
+
+    assert connector.state == ConnectionState.LIVE
+    state = hass.states.get("sensor.101_energy_usage")
+    assert state and state.state == "11"
+    assert "stale" not in state.attributes
+
+    # the snapshot is written while the connection is live and on unload
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=5))
+    await hass.async_block_till_done()
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    snapshot = hass_storage["blue_current.uuid.snapshot"]["data"]
+    assert snapshot["charge_points"]["101"]["actual_kwh"] == 11
+    assert snapshot["charge_points"]["101"]["plug_and_charge"] is True
+
+
+async def test_remove_entry(hass: HomeAssistant, hass_storage: dict[str, Any]):
+    """Test if the snapshot and the sessions are removed with the config entry."""
+    config_entry = await init_integration(hass, "sensor", {})
+    connector: Connector = hass.data[DOMAIN]["uuid"]
+    await connector.sessions.store.async_save({})
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert "blue_current.uuid.snapshot" in hass_storage
+    assert "blue_current.uuid.sessions" in hass_storage
+
+    await hass.config_entries.async_remove(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert "blue_current.uuid.snapshot" not in hass_storage
+    assert "blue_current.uuid.sessions" not in hass_storage
+
+
+async def test_setup_ready_timeout(
+    hass: HomeAssistant, hass_storage: dict[str, Any], caplog: pytest.LogCaptureFixture
+):
+    """Test if the setup doesn't wait longer than the ready timeout for the charge points."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="uuid",
+        unique_id="uuid",
+        data={"api_token": "123", "card": "123"},
+        options={"ready_timeout": 0},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("custom_components.blue_current.PLATFORMS", ["sensor"]), patch(
+        "custom_components.blue_current.Client", autospec=True
+    ):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert config_entry.state == ConfigEntryState.LOADED
+    connector: Connector = hass.data[DOMAIN]["uuid"]
+    connector.client.get_charge_points.assert_called_once()
+    assert connector.metrics.setup_duration is None
+    # a timeout of 0 means not waiting, which is not worth a warning
+    assert "were not received" not in caplog.text
+    assert hass.states.get("sensor.101_energy_usage") is None
+
+    # the entities are added when the charge points are received
+    await connector.on_data(
+        {
+            "object": "CHARGE_POINTS",
+            "data": [{"evse_id": "101", "model_type": "hidden", "name": ""}],
+        }
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.101_energy_usage") is not None
+    assert connector.metrics.setup_duration is not None
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # the setup waits for charge points that are received in time
+    del hass_storage["blue_current.uuid.snapshot"]
+    hass.config_entries.async_update_entry(config_entry, options={"ready_timeout": 5})
+
+    async def get_charge_points() -> None:
+        connector = hass.data[DOMAIN]["uuid"]
+        message = {"object": "CHARGE_POINTS", "data": []}
+        hass.async_create_task(connector.on_data(message))
+
+    with patch("custom_components.blue_current.PLATFORMS", ["sensor"]), patch(
+        "custom_components.blue_current.Client", autospec=True
+    ) as client:
+        client.return_value.get_charge_points.side_effect = get_charge_points
+        await hass.config_entries.async_setup(config_entry.entry_id)
+
+    connector = hass.data[DOMAIN]["uuid"]
+    assert not connector.stale
+    connector.client.get_charge_points.assert_called_once()
+    assert connector.ready.is_set()
+    assert connector.metrics.setup_duration < 5
@@ -0,0 +1,80 @@
+"""Test the table of pending requests."""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from bluecurrent_api.exceptions import WebsocketError
+
+from custom_components.blue_current.pending import PendingRequests
+
+
+async def test_request():
+    """Test if callers of the same key share a request."""
+    pending = PendingRequests(timeout=1)
+    send = AsyncMock()
+
+    first = asyncio.create_task(pending.async_request(("REBOOT", "101"), send))
+    second = asyncio.create_task(pending.async_request(("REBOOT", "101"), send))
+    await asyncio.sleep(0)
+    assert ("REBOOT", "101") in pending
+
+    assert pending.resolve(("REBOOT", "101"), {"success": True, "error": None})
+    assert await first == await second == {"success": True, "error": None}
+    send.assert_awaited_once()
+    assert len(pending) == 0
+
+    # nobody waits for it
+    assert not pending.resolve(("REBOOT", "101"), {"success": True, "error": None})
+
+
+async def test_replace():
+    """Test if a request replaces a pending request of the same key."""
+    pending = PendingRequests(timeout=1)
+    send = AsyncMock()
+
+    first = asyncio.create_task(pending.async_request(("BLOCK", "101"), send))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(
+        pending.async_request(("BLOCK", "101"), send, replace=True)
+    )
+    await asyncio.sleep(0)
+    assert await first == {"success": False, "error": "replaced"}
+
+    pending.resolve(("BLOCK", "101"), {"success": True, "error": None})
+    assert await second == {"success": True, "error": None}
+    assert send.await_count == 2
+
+
+async def test_errors():
+    """Test the results of failed, unanswered and evicted requests."""
+    pending = PendingRequests(timeout=0.01, max_size=2)
+
+    assert await pending.async_request(
+        ("REBOOT", "101"), AsyncMock(side_effect=WebsocketError("closed"))
+    ) == {"success": False, "error": "closed"}
+
+    assert await pending.async_request(("REBOOT", "101"), AsyncMock()) == {
+        "success": False,
+        "error": "timeout",
+    }
+    assert len(pending) == 0
+
+    # the oldest request is evicted when the table is full
+    pending.timeout = 10
+    tasks = [
+        asyncio.create_task(pending.async_request(("REBOOT", evse_id), AsyncMock()))
+        for evse_id in ("101", "102", "103")
+    ]
+    await asyncio.sleep(0)
+    assert await tasks[0] == {"success": False, "error": "evicted"}
+    assert len(pending) == 2
+
+    # requests whose timeout passed are evicted
+    with patch("custom_components.blue_current.pending.monotonic", return_value=10**9):
+        pending.evict()
+    assert len(pending) == 0
+    assert await tasks[1] == await tasks[2] == {"success": False, "error": "evicted"}
+
+    task = asyncio.create_task(pending.async_request(("REBOOT", "101"), AsyncMock()))
+    await asyncio.sleep(0)
+    pending.fail_all("disconnected")
+    assert await task == {"success": False, "error": "disconnected"}
@@ -0,0 +1,96 @@
+"""Test the Blue Current rolling statistics."""
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.blue_current import Connector
+from custom_components.blue_current.rolling import RollingStatistics, RollingWindow
+
+from . import init_integration
+
+
+def test_rolling_window():
+    """Test the min, max and mean of the samples in the window."""
+    window = RollingWindow(60, slot_count=6)
+    assert (window.min, window.max, window.mean) == (None, None, None)
+
+    for now, value in ((0, 230), (5, 228), (12, 233), (25, 231)):
+        window.add(value, now)
+    assert (window.min, window.max, window.mean, window.count) == (228, 233, 230.5, 4)
+
+    # the first slot with 230 and 228 expires
+    window.expire(60)
+    assert (window.min, window.max, window.mean, window.count) == (231, 233, 232, 2)
+
+    # the deques keep at most one entry per slot
+    for now in range(60, 70):
+        window.add(now, now)
+        window.add(100 - now, now)
+    assert len(window.minimums) <= 6
+    assert len(window.maximums) <= 6
+    assert (window.min, window.max) == (31, 233)
+
+    # everything expires after a gap longer than the window
+    window.expire(200)
+    assert (window.min, window.max, window.mean, window.count) == (None, None, None, 0)
+    window.add(229, 201)
+    assert (window.min, window.max, window.mean) == (229, 229, 229)
+
+
+def test_rolling_statistics():
+    """Test if the windows are created for the numeric measurements only."""
+    statistics = RollingStatistics(keys=("avg_voltage", "total_kw"), windows=(1, 5))
+    statistics.update("101", {"avg_voltage": 230, "total_kw": None, "activity": "x"})
+    statistics.update("101", {"avg_voltage": 232})
+
+    assert list(statistics.charge_points["101"]) == ["avg_voltage"]
+    for minutes in (1, 5):
+        window = statistics.get("101", "avg_voltage", minutes)
+        assert window is not None
+        assert window.mean == 231
+    assert statistics.get("101", "total_kw", 1) is None
+    assert statistics.get("102", "avg_voltage", 1) is None
+
+    statistics.remove("101")
+    assert statistics.get("101", "avg_voltage", 1) is None
+
+
+async def test_statistic_sensor(hass: HomeAssistant):
+    """Test if the sensor shows the mean of the window every 10 seconds."""
+    er.async_get(hass).async_get_or_create(
+        "sensor",
+        "blue_current",
+        "avg_voltage_1m_101",
+        suggested_object_id="101_average_voltage_1_min",
+    )
+    data = {"101": {"model_type": "hidden", "name": "", "avg_voltage": 230}}
+
+    with patch("custom_components.blue_current.rolling.monotonic") as monotonic:
+        monotonic.return_value = 0
+        await init_integration(hass, "sensor", data)
+        connector: Connector = hass.data["blue_current"]["uuid"]
+
+        state = hass.states.get("sensor.101_average_voltage_1_min")
+        assert state and state.state == "unknown"
+
+        for now, value in ((1, 230), (2, 232), (30, 228.5)):
+            monotonic.return_value = now
+            connector.update_charge_point("101", {"avg_voltage": value})
+        await hass.async_block_till_done()
+        state = hass.states.get("sensor.101_average_voltage_1_min")
+        assert state and state.state == "unknown"
+
+        connector.publish_statistics()
+        await hass.async_block_till_done()
+        state = hass.states.get("sensor.101_average_voltage_1_min")
+        assert state and state.state == "230.17"
+        assert state.attributes["min"] == 228.5
+        assert state.attributes["max"] == 232
+        assert state.attributes["samples"] == 3
+
+        monotonic.return_value = 90
+        connector.publish_statistics()
+        await hass.async_block_till_done()
+        state = hass.states.get("sensor.101_average_voltage_1_min")
+        assert state and state.state == "unknown"
@@ -2,11 +2,21 @@
 from datetime import datetime
 from typing import Any
 
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 
 from custom_components.blue_current import Connector
+from custom_components.blue_current.charge_point import ChargePointState
+from custom_components.blue_current.const import ConnectionState
+from custom_components.blue_current.entity import async_create_charge_point_entities
+from custom_components.blue_current.sensor import (
+    CHARGE_POINT_SENSORS,
+    METRIC_SENSORS,
+    SESSION_SENSORS,
+    STATISTIC_SENSORS,
+)
 
 from . import init_integration
 
@@ -78,11 +88,11 @@ grid = {
 }
 
 grid_entity_ids = {
-    "grid_current_phase_1": "grid_actual_p1",
-    "grid_current_phase_2": "grid_actual_p2",
-    "grid_current_phase_3": "grid_actual_p3",
-    "max_grid_current": "grid_max_current",
-    "average_grid_current": "grid_avg_current",
+    "blue_current_grid_mock_title_current_phase_1": "grid_actual_p1",
+    "blue_current_grid_mock_title_current_phase_2": "grid_actual_p2",
+    "blue_current_grid_mock_title_current_phase_3": "grid_actual_p3",
+    "blue_current_grid_mock_title_max_current": "grid_max_current",
+    "blue_current_grid_mock_title_average_current": "grid_avg_current",
 }
 
 
@@ -111,7 +121,7 @@ async def test_sensors(hass: HomeAssistant):
     for entity_id, key in grid_entity_ids.items():
         entry = entity_registry.async_get(f"sensor.{entity_id}")
         assert entry
-        assert entry.unique_id == key
+        assert entry.unique_id == f"{key}_uuid"
 
         # skip sensors that are disabled by default.
         if not entry.disabled:
@@ -120,7 +130,10 @@ async def test_sensors(hass: HomeAssistant):
             assert state.state == str(grid[key])
 
     sensors = er.async_entries_for_config_entry(entity_registry, "uuid")
-    assert len(charge_point.keys()) + len(grid.keys()) == len(sensors)
+    # the session sensors, the allocated current and the rolling statistics
+    assert len(charge_point.keys()) + len(grid.keys()) + len(METRIC_SENSORS) + len(
+        SESSION_SENSORS
+    ) + 1 + len(STATISTIC_SENSORS) == len(sensors)
 
 
 async def test_sensor_update(hass: HomeAssistant):
@@ -131,15 +144,17 @@ async def test_sensor_update(hass: HomeAssistant):
     timestamp_key = "start_datetime"
     timestamp_entity_id = "started_on"
     grid_key = "grid_avg_current"
-    grid_entity_id = "average_grid_current"
+    grid_entity_id = "blue_current_grid_mock_title_average_current"
 
     connector: Connector = hass.data["blue_current"]["uuid"]
 
-    connector.charge_points = {"101": {key: 20, timestamp_key: None}}
+    connector.charge_points = {
+        "101": ChargePointState.from_dict({key: 20, timestamp_key: None})
+    }
     connector.grid = {grid_key: 20}
     async_dispatcher_send(hass, "blue_current_value_update_101")
     await hass.async_block_till_done()
-    async_dispatcher_send(hass, "blue_current_grid_update")
+    async_dispatcher_send(hass, "blue_current_grid_update_uuid")
     await hass.async_block_till_done()
 
     # test data updated
@@ -167,11 +182,13 @@ async def test_sensor_update(hass: HomeAssistant):
 
     # test if older timestamp is ignored
     connector.charge_points = {
-        "101": {
-            timestamp_key: datetime.strptime(
-                "20211118 14:11:23+08:00", "%Y%m%d %H:%M:%S%z"
-            )
-        }
+        "101": ChargePointState.from_dict(
+            {
+                timestamp_key: datetime.strptime(
+                    "20211118 14:11:23+08:00", "%Y%m%d %H:%M:%S%z"
+                )
+            }
+        )
     }
     async_dispatcher_send(hass, "blue_current_value_update_101")
     state = hass.states.get(f"sensor.101_{timestamp_entity_id}")
@@ -180,3 +197,141 @@ async def test_sensor_update(hass: HomeAssistant):
         datetime.strptime(state.state, "%Y-%m-%dT%H:%M:%S%z")
         == charge_point[timestamp_key]
     )
+
+
+async def test_sensor_update_changed_keys(hass: HomeAssistant):
+    """Test if only the sensors of changed keys get updated."""
+    await init_integration(hass, "sensor", {"101": dict(data["101"])}, grid)
+
+    connector: Connector = hass.data["blue_current"]["uuid"]
+    energy_usage = hass.states.get("sensor.101_energy_usage")
+
+    connector.update_charge_point("101", {"avg_voltage": 30, "actual_kwh": 11})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.101_average_voltage")
+    assert state and state.state == "30"
+
+    state = hass.states.get("sensor.101_energy_usage")
+    assert state == energy_usage
+    assert state and state.last_updated == energy_usage.last_updated
+
+
+async def test_sensor_change_suppression(hass: HomeAssistant):
+    """Test if unchanged values and values within the deadband are not written."""
+    await init_integration(hass, "sensor", {"101": dict(data["101"])}, grid)
+
+    connector: Connector = hass.data["blue_current"]["uuid"]
+    average_voltage = hass.states.get("sensor.101_average_voltage")
+    assert average_voltage and average_voltage.state == "15.7"
+
+    # unchanged value
+    async_dispatcher_send(hass, "blue_current_value_update_101")
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.101_average_voltage")
+    assert state and state.last_updated == average_voltage.last_updated
+
+    # within deadband
+    connector.update_charge_point("101", {"avg_voltage": 16.1})
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.101_average_voltage")
+    assert state and state.last_updated == average_voltage.last_updated
+    assert state.state == "15.7"
+
+    # outside deadband
+    connector.update_charge_point("101", {"avg_voltage": 16.2})
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.101_average_voltage")
+    assert state and state.state == "16.2"
+
+    # unchanged data is written when the connection becomes available again
+    await connector.async_set_available(False)
+    state = hass.states.get("sensor.101_average_voltage")
+    assert state and state.state == "unavailable"
+
+    await connector.async_set_available(True)
+    state = hass.states.get("sensor.101_average_voltage")
+    assert state and state.state == "16.2"
+
+
+async def test_metric_sensors(hass: HomeAssistant):
+    """Test if the metric sensors are published."""
+    await init_integration(hass, "sensor", {"101": dict(data["101"])}, grid)
+
+    connector: Connector = hass.data["blue_current"]["uuid"]
+    await connector.on_data(
+        {"object": "CH_STATUS", "data": {"evse_id": "101", "avg_voltage": 30}}
+    )
+    await connector.on_data({"object": "UNKNOWN", "data": {}})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.blue_current_mock_title_messages_received")
+    assert state and state.state == "0"
+
+    connector.publish_metrics()
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.blue_current_mock_title_messages_received")
+    assert state and state.state == "2"
+    assert state.attributes["CH_STATUS"] == 1
+    assert state.attributes["UNKNOWN"] == 1
+
+    state = hass.states.get("sensor.blue_current_mock_title_dispatches")
+    assert state and state.state == "1"
+
+    state = hass.states.get("sensor.blue_current_mock_title_average_handling_time")
+    assert state and float(state.state) >= 0
+
+    state = hass.states.get("sensor.blue_current_mock_title_time_since_last_message")
+    assert state and float(state.state) >= 0
+
+    entry = er.async_get(hass).async_get("sensor.blue_current_mock_title_reconnects")
+    assert entry and entry.unique_id == "reconnects_uuid"
+
+
+async def test_connection_state_sensor(hass: HomeAssistant):
+    """Test if the connection state sensor follows the connector state."""
+    await init_integration(hass, "sensor", {"101": dict(data["101"])}, grid)
+
+    connector: Connector = hass.data["blue_current"]["uuid"]
+    connector.set_state(ConnectionState.LIVE)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.blue_current_mock_title_connection_state")
+    assert state and state.state == "live"
+
+    connector.set_state(ConnectionState.BACKOFF)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.blue_current_mock_title_connection_state")
+    assert state and state.state == "backoff"
+
+
+async def test_disabled_sensors_not_created(hass: HomeAssistant):
+    """Test if registered disabled sensors are not created."""
+    await init_integration(hass, "sensor", {"101": dict(data["101"])}, grid)
+    connector: Connector = hass.data["blue_current"]["uuid"]
+    enabled = [
+        description
+        for _, description in CHARGE_POINT_SENSORS
+        if description.entity_registry_enabled_default
+    ]
+
+    # the sensors that are disabled by default were registered at setup
+    entities = async_create_charge_point_entities(
+        connector, Platform.SENSOR, ["101"], CHARGE_POINT_SENSORS
+    )
+    assert [entity.entity_description for entity in entities] == enabled
+    # the entities of a charge point share their device info
+    assert all(
+        entity.device_info is connector.get_device_info("101") for entity in entities
+    )
+
+    entity_registry = er.async_get(hass)
+    entity_registry.async_update_entity(
+        "sensor.101_energy_usage", disabled_by=er.RegistryEntryDisabler.USER
+    )
+    entities = async_create_charge_point_entities(
+        connector, Platform.SENSOR, ["101"], CHARGE_POINT_SENSORS
+    )
+    assert len(entities) == len(enabled) - 1
@@ -0,0 +1,127 @@
+"""Test the Blue Current session tracker."""
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.blue_current import Connector
+from custom_components.blue_current.charge_point import ChargePointState
+from custom_components.blue_current.sessions import (
+    SAVE_DELAY,
+    ChargeSession,
+    SessionTracker,
+)
+
+from . import init_integration
+
+START = datetime(2023, 11, 18, 14, 0, tzinfo=timezone.utc)
+STOP = START + timedelta(hours=2)
+
+charge_point: dict[str, Any] = {
+    "activity": "available",
+    "start_datetime": START - timedelta(days=1),
+    "stop_datetime": START - timedelta(hours=20),
+    "actual_kwh": 3,
+    "total_cost": 1.2,
+    "total_kw": 0,
+}
+
+data: dict[str, Any] = {
+    "101": {"model_type": "hidden", "evse_id": "101", "name": "", **charge_point}
+}
+
+
+def update(tracker: SessionTracker, state: ChargePointState, **values: Any):
+    """Update a charge point state and the tracker with the changed values."""
+    changed_keys = [key for key, value in values.items() if state.get(key) != value]
+    state.update(values)
+    return tracker.update("101", state, changed_keys)
+
+
+async def test_session_boundaries(hass: HomeAssistant):
+    """Test if sessions start and end with the activity and timestamps."""
+    tracker = SessionTracker(hass, "uuid", max_sessions=2)
+    state = ChargePointState.from_dict(charge_point)
+
+    # the last session of the charge point is not tracked
+    assert update(tracker, state, **charge_point) is None
+    assert tracker.last("101") is None
+
+    assert update(tracker, state, activity="charging", start_datetime=START) is None
+    assert update(tracker, state, actual_kwh=0, total_cost=0, total_kw=7.4) is None
+    assert update(tracker, state, actual_kwh=12.5, total_cost=4.5, total_kw=11) is None
+    # the charge point resets the values when the session ends
+    session = update(
+        tracker, state, activity="available", stop_datetime=STOP, actual_kwh=0
+    )
+    assert session == ChargeSession(START, STOP, 12.5, 4.5, 11)
+    assert session.duration == 7200
+    assert tracker.last("101") is session
+
+    # sessions end when the stop_datetime changes while the car stays connected
+    for day in (1, 2):
+        start = START + timedelta(days=day)
+        update(tracker, state, activity="charging", start_datetime=start, total_kw=3)
+        update(tracker, state, stop_datetime=start + timedelta(hours=1))
+
+    # the oldest session is dropped
+    sessions = tracker.get_sessions("101")
+    assert [session["start"] for session in sessions] == [
+        (START + timedelta(days=2)).isoformat(),
+        (START + timedelta(days=1)).isoformat(),
+    ]
+    assert sessions[0]["duration"] == 3600
+    assert tracker.get_sessions("101", limit=1) == sessions[:1]
+    assert tracker.get_sessions("102") == []
+
+
+async def test_store(hass: HomeAssistant, hass_storage: dict[str, Any]):
+    """Test if the completed sessions are written to and loaded from storage."""
+    tracker = SessionTracker(hass, "uuid")
+    state = ChargePointState.from_dict(charge_point)
+    update(tracker, state, activity="charging", start_datetime=START, actual_kwh=5)
+    update(tracker, state, activity="available")
+
+    async_fire_time_changed(
+        hass, datetime.now(timezone.utc) + timedelta(seconds=SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    assert hass_storage["blue_current.uuid.sessions"]["data"] == {
+        "101": tracker.get_sessions("101")
+    }
+
+    loaded = SessionTracker(hass, "uuid")
+    await loaded.async_load()
+    assert loaded.sessions == tracker.sessions
+
+    tracker.remove("101")
+    assert tracker.last("101") is None
+
+
+async def test_last_session_sensors(hass: HomeAssistant):
+    """Test if the last session sensors show the last completed session."""
+    await init_integration(hass, "sensor", data)
+    connector: Connector = hass.data["blue_current"]["uuid"]
+
+    state = hass.states.get("sensor.101_last_session_energy")
+    assert state and state.state == "unknown"
+
+    connector.update_charge_point(
+        "101", {"activity": "charging", "start_datetime": START, "total_kw": 11}
+    )
+    connector.update_charge_point("101", {"actual_kwh": 20, "total_cost": 7.5})
+    connector.update_charge_point("101", {"activity": "available"})
+    await hass.async_block_till_done()
+
+    session = connector.sessions.last("101")
+    assert session is not None
+    for entity_id, value in (
+        ("energy", 20),
+        ("cost", 7.5),
+        ("peak_power", 11),
+        ("duration", session.duration),
+    ):
+        state = hass.states.get(f"sensor.101_last_session_{entity_id}")
+        assert state and float(state.state) == value
+        assert state.attributes["start"] == START
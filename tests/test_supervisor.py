@@ -0,0 +1,253 @@
+"""Test the Blue Current supervisor."""
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import voluptuous as vol
+from bluecurrent_api.client import Client
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.blue_current import DOMAIN, Connector
+from custom_components.blue_current.charge_point import ChargePointState
+from custom_components.blue_current.const import ConnectionState
+from custom_components.blue_current.sessions import ChargeSession
+from custom_components.blue_current.supervisor import (
+    RECONNECT_SPACING,
+    async_get_supervisor,
+)
+
+from . import acknowledge_services
+
+
+def create_connector(hass: HomeAssistant, entry_id: str, evse_ids: list[str]):
+    """Create a connector of an account with charge points."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id=entry_id,
+        unique_id=entry_id,
+        data={"api_token": "123", "card": f"card_{entry_id}"},
+    )
+    config_entry.add_to_hass(hass)
+    connector = Connector(hass, config_entry, AsyncMock(spec=Client))
+    connector.charge_points = {evse_id: ChargePointState() for evse_id in evse_ids}
+    return connector
+
+
+async def test_services(hass: HomeAssistant):
+    """Test if the services are routed to the connector that owns the charge point."""
+    supervisor = async_get_supervisor(hass)
+    supervisor.async_register_services()
+
+    connector_a = create_connector(hass, "a", ["101", "102"])
+    connector_b = create_connector(hass, "b", ["201"])
+    supervisor.async_add_connector(connector_a)
+    supervisor.async_add_connector(connector_b)
+    assert hass.data[DOMAIN] == {"a": connector_a, "b": connector_b}
+    acknowledge_services(hass, connector_a)
+    acknowledge_services(hass, connector_b)
+    connector_a.set_state(ConnectionState.LIVE)
+    connector_b.set_state(ConnectionState.LIVE)
+
+    await hass.services.async_call(
+        DOMAIN, "start_session", {"evse_id": "201"}, blocking=True
+    )
+    connector_b.client.start_session.assert_called_once_with("201", "card_b")
+
+    for service in ("reset", "reboot", "stop_session"):
+        await hass.services.async_call(
+            DOMAIN, service, {"evse_id": "102"}, blocking=True
+        )
+        getattr(connector_a.client, service).assert_called_once_with("102")
+        getattr(connector_b.client, service).assert_not_called()
+
+    # a charge point that moved to another account
+    del connector_a.charge_points["101"]
+    connector_b.charge_points["101"] = ChargePointState()
+    assert supervisor.get_connector("101") is connector_b
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN, "reset", {"evse_id": "301"}, blocking=True
+        )
+
+    # the evse_id is required
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(DOMAIN, "reset", {}, blocking=True)
+
+    # a service that isn't acknowledged raises an error, the short timeout
+    # only applies to this request because the others are answered at once
+    connector_b.client.reset.side_effect = None
+    connector_b.pending_requests.timeout = 0.01
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN, "reset", {"evse_id": "201"}, blocking=True
+        )
+
+    assert supervisor.async_remove_connector("b") is connector_b
+    assert hass.data[DOMAIN] == {"a": connector_a}
+    with pytest.raises(HomeAssistantError):
+        supervisor.get_connector("201")
+
+
+async def test_schedule_reconnect(hass: HomeAssistant):
+    """Test if the reconnects of different accounts are spaced."""
+    supervisor = async_get_supervisor(hass)
+    action = MagicMock()
+
+    with patch(
+        "custom_components.blue_current.supervisor.async_call_later"
+    ) as test_async_call_later, patch.object(hass.loop, "time", return_value=100):
+        supervisor.schedule_reconnect("a", action, 10)
+        supervisor.schedule_reconnect("b", action, 10)
+        supervisor.schedule_reconnect("c", action, 11)
+        # the slot of an account doesn't delay its own reconnect
+        supervisor.schedule_reconnect("a", action, 10)
+        supervisor.schedule_reconnect("d", action, 30)
+
+    delays = [call.args[1] for call in test_async_call_later.call_args_list]
+    assert delays == [
+        10,
+        10 + RECONNECT_SPACING,
+        10 + 2 * RECONNECT_SPACING,
+        10,
+        30,
+    ]
+
+
+async def test_send_command(hass: HomeAssistant):
+    """Test if send_command returns the result of every charge point."""
+    supervisor = async_get_supervisor(hass)
+    supervisor.async_register_services()
+
+    connector_a = create_connector(hass, "a", ["101", "102", "103"])
+    connector_b = create_connector(hass, "b", ["201"])
+    connector_c = create_connector(hass, "c", ["301"])
+    for connector in (connector_a, connector_b, connector_c):
+        supervisor.async_add_connector(connector)
+    connector_a.set_state(ConnectionState.LIVE)
+    connector_b.set_state(ConnectionState.LIVE)
+    connector_c.set_state(ConnectionState.RATE_LIMITED)
+
+    async def reboot(evse_id: str) -> None:
+        # 103 doesn't answer
+        if evse_id == "103":
+            return
+        success = evse_id != "102"
+        message = {
+            "object": "REBOOT",
+            "evse_id": evse_id,
+            "success": success,
+            "error": None if success else "reboot failed",
+        }
+        # answered before the request waits, so only 103 can time out
+        await supervisor.get_connector(evse_id).on_data(message)
+
+    connector_a.client.reboot.side_effect = reboot
+    connector_b.client.reboot.side_effect = reboot
+
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id="b", identifiers={(DOMAIN, "201")}
+    )
+
+    connector_a.pending_requests.timeout = 0.01
+    response = await hass.services.async_call(
+        DOMAIN,
+        "send_command",
+        {
+            "command": "reboot",
+            "evse_ids": ["101", "102", "103", "301", "401"],
+            "device_id": device.id,
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        "results": {
+            "101": {"success": True, "error": None},
+            "102": {"success": False, "error": "reboot failed"},
+            "103": {"success": False, "error": "timeout"},
+            "301": {"success": False, "error": "request limit reached"},
+            "401": {"success": False, "error": "Charge point 401 was not found"},
+            "201": {"success": True, "error": None},
+        }
+    }
+    assert len(connector_a.pending_requests) == 0
+    connector_c.client.reboot.assert_not_called()
+
+
+async def test_send_command_grid_device(hass: HomeAssistant):
+    """Test if the grid device is not targeted as a charge point."""
+    supervisor = async_get_supervisor(hass)
+    supervisor.async_register_services()
+
+    connector = create_connector(hass, "a", ["101"])
+    supervisor.async_add_connector(connector)
+    connector.set_state(ConnectionState.LIVE)
+    acknowledge_services(hass, connector)
+
+    area = ar.async_get(hass).async_create("garage")
+    devices = dr.async_get(hass)
+    for identifier in ("101", "grid_a"):
+        device = devices.async_get_or_create(
+            config_entry_id="a", identifiers={(DOMAIN, identifier)}
+        )
+        devices.async_update_device(device.id, area_id=area.id)
+
+    for target, results in (
+        ({"area_id": area.id}, {"101": {"success": True, "error": None}}),
+        ({"device_id": device.id}, {}),
+    ):
+        response = await hass.services.async_call(
+            DOMAIN,
+            "send_command",
+            {"command": "reboot", **target},
+            blocking=True,
+            return_response=True,
+        )
+        assert response == {"results": results}
+
+
+async def test_get_sessions(hass: HomeAssistant):
+    """Test if get_sessions returns the sessions of the owning connector."""
+    supervisor = async_get_supervisor(hass)
+    supervisor.async_register_services()
+
+    connector = create_connector(hass, "a", ["101"])
+    supervisor.async_add_connector(connector)
+    start = datetime(2023, 11, 18, 14, 0, tzinfo=timezone.utc)
+    for hour in range(3):
+        session = ChargeSession(
+            start + timedelta(hours=hour),
+            start + timedelta(hours=hour, minutes=30),
+            5,
+            None,
+            11,
+        )
+        connector.sessions.sessions.setdefault("101", deque()).append(session)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "get_sessions",
+        {"evse_id": "101", "limit": 2},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {
+        "sessions": [
+            {
+                "start": (start + timedelta(hours=hour)).isoformat(),
+                "stop": (start + timedelta(hours=hour, minutes=30)).isoformat(),
+                "duration": 1800,
+                "energy": 5,
+                "cost": None,
+                "peak_kw": 11,
+            }
+            for hour in (2, 1)
+        ]
+    }
@@ -1,12 +1,18 @@
 """The tests for Bluecurrent switches."""
 import asyncio
+from datetime import timedelta
 from typing import Any
+from unittest.mock import patch
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 from custom_components.blue_current import Connector
+from custom_components.blue_current.charge_point import ChargePointState
+from custom_components.blue_current.switch import PENDING_TIMEOUT
 
 from . import init_integration
 
@@ -57,61 +63,166 @@ async def test_toggle(hass: HomeAssistant):
     """Test the on / off methods and if the switch gets updated."""
 
     await init_integration(hass, "switch", data)
+    connector: Connector = hass.data["blue_current"]["uuid"]
 
-    state = hass.states.get("switch.101_linked_charge_cards_only")
+    async def set_linked_charge_cards_only(evse_id: str, value: bool) -> None:
+        message = {
+            "object": "LINKED_CHARGE_CARDS_ONLY",
+            "evse_id": evse_id,
+            "result": value,
+        }
+        hass.async_create_task(connector.on_data(message))
 
-    assert state and state.state == "off"
-    await hass.services.async_call(
-        "switch",
-        "turn_on",
-        {"entity_id": "switch.101_linked_charge_cards_only"},
-        blocking=True,
+    connector.client.set_linked_charge_cards_only.side_effect = (
+        set_linked_charge_cards_only
     )
 
-    connector: Connector = hass.data["blue_current"]["uuid"]
-    connector.charge_points = {
-        "101": {"activity": "available", "linked_charge_cards_only": True}
-    }
-    async_dispatcher_send(hass, "blue_current_value_update_101")
+    state = hass.states.get("switch.101_linked_charge_cards_only")
 
-    # wait
-    await asyncio.sleep(1)
+    assert state and state.state == "off"
+    await turn(hass, "turn_on", "switch.101_linked_charge_cards_only")
 
     state = hass.states.get("switch.101_linked_charge_cards_only")
     assert state and state.state == "on"
 
-    await hass.services.async_call(
-        "switch",
-        "turn_off",
-        {"entity_id": "switch.101_linked_charge_cards_only"},
-        blocking=True,
-    )
+    await turn(hass, "turn_off", "switch.101_linked_charge_cards_only")
 
-    connector.charge_points = {
-        "101": {"activity": "available", "linked_charge_cards_only": False}
-    }
-    async_dispatcher_send(hass, "blue_current_value_update_101")
+    state = hass.states.get("switch.101_linked_charge_cards_only")
+    assert state and state.state == "off"
+    assert len(connector.pending_requests) == 0
 
-    # wait
-    await asyncio.sleep(1)
+    # the change is rejected
+    async def reject(evse_id: str, value: bool) -> None:
+        await set_linked_charge_cards_only(evse_id, not value)
+
+    connector.client.set_linked_charge_cards_only.side_effect = reject
+    await turn(hass, "turn_on", "switch.101_linked_charge_cards_only")
 
     state = hass.states.get("switch.101_linked_charge_cards_only")
     assert state and state.state == "off"
 
+    # block is confirmed by the charge point data
+    connector.update_charge_point("101", {"block": False})
+    await hass.async_block_till_done()
+    await turn(hass, "turn_on", "switch.101_block")
+    connector.client.block.assert_called_once_with("101", True)
+    state = hass.states.get("switch.101_block")
+    assert state and state.state == "on"
+
     connector.charge_points = {
-        "101": {
-            "activity": "charging",
-            "linked_charge_cards_only": False,
-            "block": False,
-        }
+        "101": ChargePointState.from_dict(
+            {
+                "activity": "charging",
+                "linked_charge_cards_only": False,
+                "block": False,
+            }
+        )
     }
     async_dispatcher_send(hass, "blue_current_value_update_101")
-
-    # wait
-    await asyncio.sleep(1)
+    await hass.async_block_till_done()
 
     state = hass.states.get("switch.101_linked_charge_cards_only")
     assert state and state.state == "unavailable"
 
+    # the pending value is shown until it is confirmed
+    state = hass.states.get("switch.101_block")
+    assert state and state.state == "on"
+
+    connector.update_charge_point("101", {"block": True})
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=PENDING_TIMEOUT))
+    await hass.async_block_till_done()
+
+    state = hass.states.get("switch.101_block")
+    assert state and state.state == "on"
+
+
+async def test_pending(hass: HomeAssistant):
+    """Test if toggles are coalesced and unconfirmed values are rolled back."""
+
+    await init_integration(hass, "switch", data)
+    connector: Connector = hass.data["blue_current"]["uuid"]
+    connector.update_charge_point("101", {"block": False})
+    await hass.async_block_till_done()
+
+    with patch("custom_components.blue_current.switch.COALESCE_DELAY", 0.05):
+        for service in ("turn_on", "turn_off", "turn_on"):
+            await hass.services.async_call(
+                "switch", service, {"entity_id": "switch.101_block"}, blocking=True
+            )
+        await asyncio.sleep(0.1)
+        await hass.async_block_till_done()
+
+    connector.client.block.assert_called_once_with("101", True)
+    state = hass.states.get("switch.101_block")
+    assert state and state.state == "on"
+
+    # not confirmed in time
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=PENDING_TIMEOUT))
+    await hass.async_block_till_done()
+
     state = hass.states.get("switch.101_block")
     assert state and state.state == "off"
+
+    # toggled back to the current value
+    connector.client.block.reset_mock()
+    with patch("custom_components.blue_current.switch.COALESCE_DELAY", 0.05):
+        for service in ("turn_on", "turn_off"):
+            await hass.services.async_call(
+                "switch", service, {"entity_id": "switch.101_block"}, blocking=True
+            )
+        await asyncio.sleep(0.1)
+        await hass.async_block_till_done()
+
+    connector.client.block.assert_not_called()
+    state = hass.states.get("switch.101_block")
+    assert state and state.state == "off"
+
+
+
+async def test_pending_charge_point_removed(hass: HomeAssistant):
+    """Test if a pending value is abandoned when the charge point is removed."""
+
+    await init_integration(hass, "switch", data)
+    connector: Connector = hass.data["blue_current"]["uuid"]
+    connector.update_charge_point("101", {"block": False})
+    await hass.async_block_till_done()
+
+    # removed before the command is sent
+    with patch("custom_components.blue_current.switch.COALESCE_DELAY", 0.05):
+        await hass.services.async_call(
+            "switch", "turn_on", {"entity_id": "switch.101_block"}, blocking=True
+        )
+        charge_point = connector.charge_points.pop("101")
+        await asyncio.sleep(0.1)
+        await hass.async_block_till_done()
+    connector.client.block.assert_not_called()
+
+    # removed while the command is sent
+    connector.charge_points["101"] = charge_point
+
+    async def block(evse_id: str, value: bool) -> None:
+        del connector.charge_points[evse_id]
+
+    connector.client.block.side_effect = block
+    await turn(hass, "turn_on", "switch.101_block")
+    connector.client.block.assert_called_once_with("101", True)
+    switch = next(
+        entity
+        for entity in connector.entities
+        if entity.entity_id == "switch.101_block"
+    )
+    assert switch._pending is None
+
+    # the rollback doesn't need the charge point either
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=PENDING_TIMEOUT))
+    await hass.async_block_till_done()
+
+
+async def turn(hass: HomeAssistant, service: str, entity_id: str) -> None:
+    """Call a switch service and wait until the value is sent."""
+    with patch("custom_components.blue_current.switch.COALESCE_DELAY", 0):
+        await hass.services.async_call(
+            "switch", service, {"entity_id": entity_id}, blocking=True
+        )
+        await hass.async_block_till_done()